@@ -0,0 +1,111 @@
+"""
+Copyright (c) Microsoft Corporation. All rights reserved.
+Licensed under the MIT License.
+"""
+
+# Measures how long the event loop stalls while many conversations are moderated at once,
+# using stub Content Safety clients that simulate the service latency.
+#
+# Usage: poetry run python benchmarks/azure_content_safety_moderator.py
+
+import asyncio
+import time
+from dataclasses import replace
+from typing import Any, List, Tuple, cast
+from unittest import mock
+
+from teams.ai.moderators import (
+    AzureContentSafetyModerator,
+    AzureContentSafetyModeratorOptions,
+)
+from teams.state import TurnState
+
+LATENCY = 0.05
+CONVERSATIONS = 50
+TICK = 0.001
+
+RESULT = {"categoriesAnalysis": [{"category": "Hate", "severity": 0}]}
+
+
+class SyncClient:
+    def analyze_text(self, *_args, **_kwargs: Any):
+        time.sleep(LATENCY)
+        return RESULT
+
+    def close(self):
+        pass
+
+
+class AsyncClient:
+    async def analyze_text(self, *_args, **_kwargs: Any):
+        await asyncio.sleep(LATENCY)
+        return RESULT
+
+    async def close(self):
+        pass
+
+
+class BlockingClient(AsyncClient):
+    "Calls the sync client on the event loop, like the moderator used to."
+
+    async def analyze_text(self, *args, **kwargs: Any):
+        return SyncClient().analyze_text(*args, **kwargs)
+
+
+async def measure(moderator: AzureContentSafetyModerator[TurnState]) -> List[float]:
+    stalls: List[float] = []
+    done = False
+
+    async def ticker():
+        while not done:
+            start = time.perf_counter()
+            await asyncio.sleep(TICK)
+            stalls.append(time.perf_counter() - start - TICK)
+
+    context = mock.MagicMock()
+    state = cast(TurnState, mock.MagicMock())
+    state.temp.input = "hello"
+
+    async def conversation():
+        await moderator.review_input(context=context, state=state)
+
+    task = asyncio.create_task(ticker())
+    await asyncio.sleep(0)
+    start = time.perf_counter()
+    await asyncio.gather(*(conversation() for _ in range(CONVERSATIONS)))
+    elapsed = time.perf_counter() - start
+    done = True
+    await task
+    await moderator.close()
+
+    stalls.sort()
+    return [elapsed, stalls[len(stalls) // 2], stalls[int(len(stalls) * 0.99)], stalls[-1]]
+
+
+async def main():
+    options = AzureContentSafetyModeratorOptions(api_key="", endpoint="", moderate="input")
+    moderators: List[Tuple[str, AzureContentSafetyModerator[TurnState]]] = []
+
+    with mock.patch(
+        "azure.ai.contentsafety.aio.ContentSafetyClient", return_value=BlockingClient()
+    ):
+        moderators.append(("blocking", AzureContentSafetyModerator(options)))
+    with mock.patch("azure.ai.contentsafety.ContentSafetyClient", return_value=SyncClient()):
+        moderators.append(
+            ("thread pool", AzureContentSafetyModerator(replace(options, use_thread_pool=True)))
+        )
+    with mock.patch("azure.ai.contentsafety.aio.ContentSafetyClient", return_value=AsyncClient()):
+        moderators.append(("async", AzureContentSafetyModerator(options)))
+
+    print(f"{CONVERSATIONS} concurrent conversations, {LATENCY * 1000:.0f}ms service latency")
+    print(f"{'client':<12} {'total':>9} {'p50 stall':>10} {'p99 stall':>10} {'max stall':>10}")
+    for name, moderator in moderators:
+        total, p50, p99, worst = await measure(moderator)
+        print(
+            f"{name:<12} {total * 1000:>7.1f}ms {p50 * 1000:>8.2f}ms {p99 * 1000:>8.2f}ms"
+            f" {worst * 1000:>8.2f}ms"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,103 @@
+"""
+Copyright (c) Microsoft Corporation. All rights reserved.
+Licensed under the MIT License.
+"""
+
+# Measures the cost of validating a sequence plan, and how much of it is spent checking the
+# plan and action parameters against their JSON schemas.
+#
+# Usage: poetry run python benchmarks/validators.py
+
+import asyncio
+import json
+import time
+from typing import Any, Callable, Dict, List, Tuple, cast
+
+import jsonschema
+from botbuilder.core import TurnContext
+from jsonschema.exceptions import best_match
+from jsonschema.validators import validator_for
+
+from teams.ai.augmentations import SequenceAugmentation
+from teams.ai.models import ChatCompletionAction, PromptResponse
+from teams.ai.prompts import Message
+from teams.ai.tokenizers import GPTTokenizer
+from teams.state import TurnState
+
+ACTIONS = 10
+ITERATIONS = 500
+
+PARAMETERS = {
+    "type": "object",
+    "properties": {
+        "name": {"type": "string"},
+        "count": {"type": "integer", "minimum": 0},
+        "tags": {"type": "array", "items": {"type": "string"}},
+    },
+    "required": ["name", "count"],
+}
+
+
+def measure(func: Callable[[], Any]) -> float:
+    start = time.perf_counter()
+    for _ in range(ITERATIONS):
+        func()
+    return (time.perf_counter() - start) / ITERATIONS
+
+
+async def main():
+    actions = [
+        ChatCompletionAction(name=f"action{i}", parameters=PARAMETERS) for i in range(ACTIONS)
+    ]
+    augmentation = SequenceAugmentation(actions)
+    plan: Dict[str, Any] = {
+        "type": "plan",
+        "commands": [
+            *(
+                {
+                    "type": "DO",
+                    "action": f"action{i}",
+                    "parameters": {"name": "test", "count": i, "tags": ["a", "b"]},
+                }
+                for i in range(ACTIONS)
+            ),
+            {"type": "SAY", "response": "done"},
+        ],
+    }
+    content = json.dumps(plan)
+
+    # Schema checks made for each plan: the plan itself and the parameters of each action
+    checks: List[Tuple[Dict[str, Any], Any]] = [
+        (augmentation._plan_validator.schema, plan),  # pylint: disable=protected-access
+        *((PARAMETERS, cmd["parameters"]) for cmd in plan["commands"] if cmd["type"] == "DO"),
+    ]
+    compiled = {id(schema): validator_for(schema)(schema) for schema, _ in checks}
+
+    def validate_per_call():
+        for schema, instance in checks:
+            jsonschema.validate(instance, schema)
+
+    def validate_compiled():
+        for schema, instance in checks:
+            assert best_match(compiled[id(schema)].iter_errors(instance)) is None
+
+    start = time.perf_counter()
+    for _ in range(ITERATIONS):
+        res = await augmentation.validate_response(
+            context=cast(TurnContext, {}),
+            memory=TurnState(),
+            tokenizer=GPTTokenizer(),
+            response=PromptResponse(message=Message(role="assistant", content=content)),
+            remaining_attempts=3,
+        )
+        assert res.valid
+    per_plan = (time.perf_counter() - start) / ITERATIONS
+
+    print(f"Sequence plan with {ACTIONS} DO commands, {len(checks)} schema checks per plan")
+    print(f"{'jsonschema.validate() per check':<40} {measure(validate_per_call) * 1e6:>9.1f}us")
+    print(f"{'compiled validators':<40} {measure(validate_compiled) * 1e6:>9.1f}us")
+    print(f"{'SequenceAugmentation.validate_response':<40} {per_plan * 1e6:>9.1f}us")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,120 @@
+"""
+Copyright (c) Microsoft Corporation. All rights reserved.
+Licensed under the MIT License.
+"""
+
+# Measures the recall@10 and query time of quantized and trained (IVF) `VectorIndex`es against
+# a brute force search of the float32 vectors. The vectors are drawn around random topic
+# centers, like the embeddings of a large corpus, since clusters are what IVF relies on. The
+# larger the SPREAD of the vectors around their centers, the more probes IVF needs.
+# Quantized indexes are queried with their float32 vectors memory mapped from a saved copy,
+# so the reported memory is what stays resident: the codes, scales and list assignments.
+#
+# Usage: poetry run python benchmarks/vector_index_ann.py
+
+import statistics
+import tempfile
+import time
+from typing import List, Optional, Set
+
+import numpy as np
+
+from teams.ai.data_sources import (
+    VectorIndex,
+    VectorIndexItem,
+    VectorQuantization,
+)
+
+SIZE = 1_000_000
+DIMENSIONS = 256
+TOPICS = 2_000
+SPREAD = 1.25
+BATCH_SIZE = 50_000
+QUERIES = 50
+TOP_K = 10
+PROBES = [4, 16, 64]
+
+
+def build(
+    centers: np.ndarray, quantization: Optional[VectorQuantization], seed: int
+) -> VectorIndex:
+    rng = np.random.default_rng(seed)
+    index = VectorIndex(DIMENSIONS, quantization=quantization)
+
+    for start in range(0, SIZE, BATCH_SIZE):
+        topics = rng.integers(0, TOPICS, BATCH_SIZE)
+        noise = rng.standard_normal((BATCH_SIZE, DIMENSIONS), np.float32) * SPREAD
+        vectors = centers[topics] + noise
+        index.upsert([VectorIndexItem(str(start + i), "", v) for i, v in enumerate(vectors)])
+
+    return index
+
+
+def resident_mb(index: VectorIndex) -> float:
+    arrays = [index._codes, index._scales, index._assignments]
+    if index.quantization is None:
+        arrays.append(index._vectors)
+    return sum(array[: len(index)].nbytes for array in arrays if array is not None) / 2**20
+
+
+def measure(index: VectorIndex, queries: np.ndarray, truth: List[Set[str]], **kwargs) -> str:
+    times: List[float] = []
+    found = 0
+
+    for query, expected in zip(queries, truth):
+        start = time.perf_counter()
+        results = index.query(query, top_k=TOP_K, **kwargs)
+        times.append(time.perf_counter() - start)
+        found += len(expected & {result.id for result in results})
+
+    recall = found / (TOP_K * len(queries))
+    return f"recall@{TOP_K} {recall:5.3f}  {statistics.median(times) * 1000:8.2f}ms"
+
+
+def main():
+    rng = np.random.default_rng(0)
+    centers = rng.standard_normal((TOPICS, DIMENSIONS), np.float32)
+    noise = rng.standard_normal((QUERIES, DIMENSIONS), np.float32) * SPREAD
+    queries = centers[rng.integers(0, TOPICS, QUERIES)] + noise
+
+    start = time.perf_counter()
+    exact = build(centers, None, 1)
+    print(
+        f"{SIZE:,} vectors x {DIMENSIONS} dimensions (built in {time.perf_counter() - start:.0f}s)"
+    )
+
+    truth = [{result.id for result in exact.query(query, top_k=TOP_K)} for query in queries]
+    print(
+        f"  float32 brute force:      {measure(exact, queries, truth)}  {resident_mb(exact):6.0f}MB"
+    )
+
+    start = time.perf_counter()
+    exact.train()
+    print(f"  trained {exact.lists} lists in {time.perf_counter() - start:.0f}s")
+    for probes in PROBES:
+        label = f"float32 ivf {probes:2d} probes:"
+        print(f"  {label:25s} {measure(exact, queries, truth, probes=probes)}")
+    del exact
+
+    quantizations: List[VectorQuantization] = ["float16", "int8"]
+    for quantization in quantizations:
+        index = build(centers, quantization, 1)
+
+        with tempfile.TemporaryDirectory() as folder:
+            index.save(folder)
+            del index
+            loaded = VectorIndex.load(folder)
+
+            label = f"{quantization} flat:"
+            print(f"  {label:25s} {measure(loaded, queries, truth)}  {resident_mb(loaded):6.0f}MB")
+
+            loaded.train()
+            for probes in PROBES:
+                label = f"{quantization} ivf {probes:2d} probes:"
+                result = measure(loaded, queries, truth, probes=probes)
+                print(f"  {label:25s} {result}  {resident_mb(loaded):6.0f}MB")
+            del loaded
+
+
+if __name__ == "__main__":
+    main()
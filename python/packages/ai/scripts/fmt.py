@@ -7,5 +7,9 @@ import subprocess
 
 
 def fmt():
-    subprocess.run(["poetry", "run", "black", "teams", "scripts", "tests"], check=True)
-    subprocess.run(["poetry", "run", "isort", "teams", "scripts", "tests"], check=True)
+    subprocess.run(
+        ["poetry", "run", "black", "teams", "scripts", "tests", "benchmarks"], check=True
+    )
+    subprocess.run(
+        ["poetry", "run", "isort", "teams", "scripts", "tests", "benchmarks"], check=True
+    )
@@ -6,5 +6,12 @@ Licensed under the MIT License.
 from .action_entry import ActionEntry, ActionHandler
 from .action_turn_context import ActionTurnContext
 from .action_types import ActionTypes
+from .too_many_steps_parameters import TooManyStepsParameters
 
-__all__ = ["ActionEntry", "ActionHandler", "ActionTurnContext", "ActionTypes"]
+__all__ = [
+    "ActionEntry",
+    "ActionHandler",
+    "ActionTurnContext",
+    "ActionTypes",
+    "TooManyStepsParameters",
+]
@@ -0,0 +1,30 @@
+"""
+Copyright (c) Microsoft Corporation. All rights reserved.
+Licensed under the MIT License.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Optional
+
+
+@dataclass
+class TooManyStepsParameters:
+    """
+    Data passed to the `ActionTypes.TOO_MANY_STEPS` action when `AI.run` exceeds the step or
+    time budget of the turn.
+    """
+
+    max_steps: Optional[int]
+    "The configured maximum number of steps, if any."
+
+    max_time: Optional[float]
+    "The configured maximum time in seconds, if any."
+
+    started_at: datetime
+    "When the turn started running."
+
+    step: int
+    "The step that exceeded the budget."
@@ -5,27 +5,164 @@ Licensed under the MIT License.
 
 from __future__ import annotations
 
+import asyncio
+import time
+from contextvars import ContextVar
+from copy import copy
 from datetime import datetime
 from logging import Logger
-from typing import Any, Callable, Dict, Generic, Optional, TypeVar
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    Generic,
+    List,
+    Optional,
+    Tuple,
+    TypeVar,
+    cast,
+)
 
 from botbuilder.core import TurnContext
-from botbuilder.schema import Activity, ActivityTypes
+from botbuilder.schema import Activity, ActivityTypes, ResourceResponse
 from botframework.connector import Channels
 
 from ..app_error import ApplicationError
 from ..state import TurnState
 from ..utils import snippet
 from ..utils.citations import format_citations_response, get_used_citations
-from .actions import ActionEntry, ActionHandler, ActionTurnContext, ActionTypes
+from .actions import (
+    ActionEntry,
+    ActionHandler,
+    ActionTurnContext,
+    ActionTypes,
+    TooManyStepsParameters,
+)
 from .ai_options import AIOptions
 from .citations.citations import AIEntity, Appearance, ClientCitation
 from .moderators.moderator import Moderator
-from .planners.plan import Plan, PredictedDoCommand, PredictedSayCommand
+from .planners.plan import (
+    Plan,
+    PredictedCommand,
+    PredictedDoCommand,
+    PredictedSayCommand,
+)
 from .planners.planner import Planner
+from .planners.streaming_plan import StreamingPlan
 from .prompts import MessageContext
 
 StateT = TypeVar("StateT", bound=TurnState)
+T = TypeVar("T")
+
+# private
+# Moderation verdict awaited by sends made from inside a speculative planning task.
+_speculative_verdict: ContextVar[Optional[asyncio.Future[bool]]] = ContextVar(
+    "_speculative_verdict", default=None
+)
+
+
+# private
+class _BudgetExceeded(Exception):
+    """
+    Raised when the time budget of a turn runs out.
+    """
+
+
+# private
+async def _wait_for_deadline(awaitable: Awaitable[T], deadline: Optional[float]) -> T:
+    """
+    Awaits an awaitable, cancelling it and raising `_BudgetExceeded` if it's still running at
+    the `time.monotonic()` deadline. Errors raised by the awaitable itself, including its own
+    timeouts, are raised as is.
+    """
+    if deadline is None:
+        return await awaitable
+
+    task = asyncio.ensure_future(awaitable)
+    try:
+        done, _ = await asyncio.wait({task}, timeout=max(deadline - time.monotonic(), 0))
+    except asyncio.CancelledError:
+        task.cancel()
+        raise
+
+    if not done:
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+        raise _BudgetExceeded()
+
+    return task.result()
+
+
+# private
+class _SpeculativePlan:
+    """
+    A plan created while the users input is still being moderated.
+    """
+
+    task: asyncio.Task[Plan]
+    verdict: asyncio.Future[bool]
+    snapshot: Dict[str, Tuple[Any, Dict[str, Any]]]
+
+    def __init__(self, context: TurnContext, state: TurnState, plan: Awaitable[Plan]) -> None:
+        self.verdict = asyncio.get_running_loop().create_future()
+
+        # Copy each state scope one level deep so that the planners changes can be rolled back
+        self.snapshot = {
+            name: (scope, {key: copy(value) for key, value in scope.items()})
+            for name, scope in state.items()
+            if isinstance(scope, dict)
+        }
+
+        context.on_send_activities(self._hold_sends)
+
+        async def create_plan() -> Plan:
+            _speculative_verdict.set(self.verdict)
+            return await plan
+
+        self.task = asyncio.ensure_future(create_plan())
+
+    def accept(self) -> asyncio.Task[Plan]:
+        self.verdict.set_result(False)
+        return self.task
+
+    async def discard(self, state: TurnState) -> None:
+        if not self.verdict.done():
+            self.verdict.set_result(True)
+
+        self.task.cancel()
+        try:
+            plan = await self.task
+        except (asyncio.CancelledError, Exception):  # pylint: disable=broad-except
+            plan = None
+
+        # Streaming plans keep generating in the background, so stop them before rolling back
+        if isinstance(plan, StreamingPlan):
+            await plan.close()
+
+        for name, (scope, values) in self.snapshot.items():
+            dict.clear(scope)
+            dict.update(scope, values)
+            dict.__setitem__(state, name, scope)
+
+    async def _hold_sends(
+        self,
+        _context: TurnContext,
+        activities: List[Activity],
+        next_send: Callable[[], Awaitable[List[ResourceResponse]]],
+    ) -> None:
+        if _speculative_verdict.get() is self.verdict:
+            try:
+                flagged = await asyncio.shield(self.verdict)
+            except asyncio.CancelledError:
+                # The turn context always sends once the handlers return, so drop the
+                # activities instead of propagating the cancellation
+                flagged = True
+
+            if flagged:
+                activities.clear()
+
+        await next_send()
 
 
 class AI(Generic[StateT]):
@@ -129,25 +266,74 @@ class AI(Generic[StateT]):
         self,
         context: TurnContext,
         state: StateT,
-        started_at: datetime = datetime.now(),
+        started_at: Optional[datetime] = None,
         step: int = 0,
     ) -> bool:
         """
         Calls the configured planner to generate a plan and executes the plan that is returned.
+
+        When set, the run is limited to `AIOptions.max_steps` commands and `AIOptions.max_time`
+        seconds. When either budget is exhausted the `ActionTypes.TOO_MANY_STEPS` action is
+        invoked.
+
+        Args:
+            context (TurnContext): Current turn context.
+            state (StateT): Current turn state.
+            started_at (Optional[datetime]): Optional. When the turn started. Defaults to now.
+            step (int): Optional. Number of steps already executed this turn. Defaults to `0`.
+
+        Returns:
+            bool: False if the run was stopped, otherwise True.
         """
 
+        started_at = started_at or datetime.now()
+        deadline: Optional[float] = None
+
+        # The deadline is tracked on the monotonic clock so that wall clock changes don't move it
+        if self._options.max_time is not None:
+            elapsed = (datetime.now() - started_at).total_seconds()
+            deadline = time.monotonic() + self._options.max_time - elapsed
+
+        return await self._run(context, state, started_at, deadline, step)
+
+    async def _run(
+        self,
+        context: TurnContext,
+        state: StateT,
+        started_at: datetime,
+        deadline: Optional[float],
+        step: int,
+    ) -> bool:
         plan: Optional[Plan] = None
+        speculative: Optional[_SpeculativePlan] = None
 
         if step == 0:
-            plan = await self.moderator.review_input(context, state)
+            if self._options.speculative_planning:
+                speculative = _SpeculativePlan(
+                    context, state, self._create_plan(context, state, step)
+                )
+
+            try:
+                plan = await self.moderator.review_input(context, state)
+            except BaseException:
+                if speculative is not None:
+                    await speculative.discard(state)
+                raise
+
+            if plan is not None and speculative is not None:
+                await speculative.discard(state)
 
         if plan is None:
-            if step == 0:
-                plan = await self.planner.begin_task(context, state)
-            else:
-                plan = await self.planner.continue_task(context, state)
+            planning = speculative.accept() if speculative is not None else None
 
-            plan = await self.moderator.review_output(context, state, plan)
+            # Cancel planning that runs past the deadline
+            try:
+                plan = await _wait_for_deadline(
+                    planning or self._create_plan(context, state, step), deadline
+                )
+            except _BudgetExceeded:
+                await self._invoke_too_many_steps(context, state, started_at, step)
+                return False
 
         res = await self._actions[ActionTypes.PLAN_READY].invoke(
             context, state, plan, ActionTypes.PLAN_READY
@@ -157,53 +343,179 @@ class AI(Generic[StateT]):
             return False
 
         loop = False
-
-        for command in plan.commands:
-            step += 1
-            output = ""
-
-            if isinstance(command, PredictedDoCommand):
-                if command.action in self._actions:
-                    output = await self._actions[ActionTypes.DO_COMMAND].invoke(
-                        context, state, command, command.action
-                    )
-
-                    # Set output for action call
-                    if command.action_id:
-                        loop = True
-                        state.temp.action_outputs[command.action_id] = output or ""
+        pending: Dict[int, asyncio.Task[str]] = {}
+
+        try:
+            i = 0
+            while True:
+                # Commands of streaming plans may still be on their way
+                try:
+                    if not await self._wait_for_command(plan, i, deadline):
+                        break
+                except _BudgetExceeded:
+                    await self._invoke_too_many_steps(context, state, started_at, step + 1)
+                    return False
+
+                command = plan.commands[i]
+                step += 1
+                output = ""
+
+                max_steps = self._options.max_steps
+                is_past_deadline = deadline is not None and time.monotonic() >= deadline
+                if (max_steps is not None and step > max_steps) or is_past_deadline:
+                    await self._invoke_too_many_steps(context, state, started_at, step)
+                    return False
+
+                if isinstance(command, PredictedDoCommand):
+                    if command.action in self._actions:
+                        if i not in pending:
+                            max_count = (
+                                len(plan.commands) - i
+                                if max_steps is None
+                                else max_steps - step + 1
+                            )
+                            pending = self._start_parallel_actions(
+                                context, state, plan.commands, i, max_count
+                            )
+
+                        task = pending.pop(i, None)
+                        if task is not None:
+                            output = await task
+                        else:
+                            output = await self._actions[ActionTypes.DO_COMMAND].invoke(
+                                context, state, command, command.action
+                            )
+
+                        # Set output for action call
+                        if command.action_id:
+                            loop = True
+                            state.temp.action_outputs[command.action_id] = output or ""
+                        else:
+                            loop = len(output) > 0
+                            state.temp.action_outputs[command.action] = output
                     else:
-                        loop = len(output) > 0
-                        state.temp.action_outputs[command.action] = output
-                else:
-                    output = await self._actions[ActionTypes.UNKNOWN_ACTION].invoke(
-                        context, state, plan, command.action
+                        output = await self._actions[ActionTypes.UNKNOWN_ACTION].invoke(
+                            context, state, plan, command.action
+                        )
+                elif isinstance(command, PredictedSayCommand):
+                    loop = False
+                    output = await self._actions[ActionTypes.SAY_COMMAND].invoke(
+                        context, state, command, ActionTypes.SAY_COMMAND
                     )
-            elif isinstance(command, PredictedSayCommand):
-                loop = False
-                output = await self._actions[ActionTypes.SAY_COMMAND].invoke(
-                    context, state, command, ActionTypes.SAY_COMMAND
-                )
-            else:
-                raise ApplicationError(f"unknown command of type {command.type} predicted")
+                else:
+                    raise ApplicationError(f"unknown command of type {command.type} predicted")
 
-            if output == ActionTypes.STOP:
-                return False
+                if output == ActionTypes.STOP:
+                    return False
 
-            state.temp.last_output = output
+                state.temp.last_output = output
 
-            if isinstance(command, PredictedDoCommand) and command.action_id:
-                state.delete("temp.input")
-            else:
-                state.temp.input = output
+                if isinstance(command, PredictedDoCommand) and command.action_id:
+                    state.delete("temp.input")
+                else:
+                    state.temp.input = output
 
-            state.temp.input_files = []
+                state.temp.input_files = []
+                i += 1
+        finally:
+            # Cancel parallel actions that are still running after a STOP or an error, and wait
+            # for them so that none outlive the run or leave their exceptions unretrieved
+            for task in pending.values():
+                task.cancel()
+            await asyncio.gather(*pending.values(), return_exceptions=True)
+
+            if isinstance(plan, StreamingPlan):
+                await plan.close()
 
         if loop and self._options.allow_looping:
-            return await self.run(context, state, started_at, step)
+            return await self._run(context, state, started_at, deadline, step)
 
         return True
 
+    async def _create_plan(self, context: TurnContext, state: StateT, step: int) -> Plan:
+        if step == 0:
+            plan = await self.planner.begin_task(context, state)
+        else:
+            plan = await self.planner.continue_task(context, state)
+
+        if isinstance(plan, StreamingPlan):
+            reviewed = plan.review(lambda p: self.moderator.review_output(context, state, p))
+
+            # Return once the first command has been reviewed, like planners return streaming
+            # plans once their first command is ready
+            try:
+                await reviewed.wait_for_command(0)
+            except BaseException:
+                await reviewed.close()
+                raise
+
+            return reviewed
+
+        return await self.moderator.review_output(context, state, plan)
+
+    async def _wait_for_command(self, plan: Plan, index: int, deadline: Optional[float]) -> bool:
+        if index < len(plan.commands):
+            return True
+
+        if not isinstance(plan, StreamingPlan):
+            return False
+
+        return await _wait_for_deadline(plan.wait_for_command(index), deadline)
+
+    async def _invoke_too_many_steps(
+        self, context: TurnContext, state: StateT, started_at: datetime, step: int
+    ) -> None:
+        await self._actions[ActionTypes.TOO_MANY_STEPS].invoke(
+            context,
+            state,
+            TooManyStepsParameters(
+                max_steps=self._options.max_steps,
+                max_time=self._options.max_time,
+                started_at=started_at,
+                step=step,
+            ),
+            ActionTypes.TOO_MANY_STEPS,
+        )
+
+    def _start_parallel_actions(
+        self,
+        context: TurnContext,
+        state: StateT,
+        commands: List[PredictedCommand],
+        start: int,
+        max_count: int,
+    ) -> Dict[int, asyncio.Task[str]]:
+        if self._options.max_concurrent_actions <= 1:
+            return {}
+
+        # Find the run of parallel tool calls starting at this command that fits the step budget
+        end = start
+        while end < len(commands) and end - start < max_count:
+            command = commands[end]
+            if not (
+                isinstance(command, PredictedDoCommand)
+                and command.action_id
+                and command.action in self._actions
+            ):
+                break
+            end += 1
+
+        if end - start < 2:
+            return {}
+
+        semaphore = asyncio.Semaphore(self._options.max_concurrent_actions)
+
+        async def invoke(command: PredictedDoCommand) -> str:
+            async with semaphore:
+                return await self._actions[ActionTypes.DO_COMMAND].invoke(
+                    context, state, command, command.action
+                )
+
+        return {
+            i: asyncio.ensure_future(invoke(cast(PredictedDoCommand, commands[i])))
+            for i in range(start, end)
+        }
+
     async def _on_unknown_action(
         self,
         context: ActionTurnContext,
@@ -341,7 +653,14 @@ class AI(Generic[StateT]):
         _context: ActionTurnContext,
         _state: StateT,
     ) -> str:
-        self._logger.error("The run retrieval for the Assistants Planner has expired.")
+        if isinstance(_context.data, TooManyStepsParameters):
+            self._logger.error(
+                "The AI system exceeded its budget of %s steps or %s seconds for this turn.",
+                _context.data.max_steps,
+                _context.data.max_time,
+            )
+        else:
+            self._logger.error("The run retrieval for the Assistants Planner has expired.")
         return ActionTypes.STOP
 
     async def do_action(
@@ -6,7 +6,7 @@ Licensed under the MIT License.
 from __future__ import annotations
 
 from dataclasses import dataclass, field
-from typing import Generic, TypeVar
+from typing import Generic, Optional, TypeVar
 
 from ..state import TurnState
 from .moderators.default_moderator import DefaultModerator
@@ -40,3 +40,38 @@ class AIOptions(Generic[StateT]):
     Optional. If true, the AI system will enable the feedback loop in Teams that
     allows a user to give thumbs up or down to a response.
     """
+
+    max_steps: Optional[int] = None
+    """
+    Optional. Maximum number of commands `AI.run` may execute in a single turn, across all
+    loops. When exceeded the `ActionTypes.TOO_MANY_STEPS` action is invoked and the run stops.
+    Default `None` (unlimited)
+    """
+
+    max_time: Optional[float] = None
+    """
+    Optional. Maximum number of seconds `AI.run` may take for a single turn. Planner calls
+    still in flight at the deadline are cancelled. When exceeded the
+    `ActionTypes.TOO_MANY_STEPS` action is invoked and the run stops.
+    Default `None` (unlimited)
+    """
+
+    speculative_planning: bool = False
+    """
+    Optional. If true, the planner starts on a new turn while the users input is still being
+    reviewed by the moderator. When the input is flagged the plan is discarded, changes the
+    planner made to the turn state are rolled back, and activities it tried to send (like a
+    streamed response) are dropped. Sends made by the planner are held back until the input
+    has passed moderation.
+    Default `False`
+    """
+
+    max_concurrent_actions: int = 1
+    """
+    Optional. Maximum number of actions to run concurrently when a plan contains consecutive
+    `DO` commands for parallel tool calls (commands with an `action_id`). Their handlers share
+    the turn state so only raise this if they can safely run at the same time. Outputs are
+    still recorded in `temp.action_outputs` in plan order, and when an action returns
+    `ActionTypes.STOP` any actions of the batch that haven't finished are cancelled.
+    Default `1` (actions are run one at a time)
+    """
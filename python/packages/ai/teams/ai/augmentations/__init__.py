@@ -4,6 +4,7 @@ Licensed under the MIT License.
 """
 
 from .augmentation import Augmentation
+from .command_stream import CommandFactory, CommandStream
 from .default_augmentation import DefaultAugmentation
 from .monologue_augmentation import MonologueAugmentation
 from .sequence_augmentation import SequenceAugmentation
@@ -11,6 +12,8 @@ from .tools_augmentation import ToolsAugmentation
 
 __all__ = [
     "Augmentation",
+    "CommandFactory",
+    "CommandStream",
     "DefaultAugmentation",
     "MonologueAugmentation",
     "SequenceAugmentation",
@@ -15,6 +15,7 @@ from ..models.prompt_response import PromptResponse
 from ..planners.plan import Plan
 from ..prompts.sections.prompt_section import PromptSection
 from ..validators.prompt_response_validator import PromptResponseValidator
+from .command_stream import CommandStream
 
 ValueT = TypeVar("ValueT")
 "Type of message content returned for a 'success' response."
@@ -50,3 +51,14 @@ class Augmentation(PromptResponseValidator, ABC, Generic[ValueT]):
         Returns:
             Plan: The created plan.
         """
+
+    def create_command_stream(self) -> Optional[CommandStream]:
+        """
+        Creates an optional stream that creates plan commands from a streamed response as soon
+        as each command is complete.
+
+        Returns:
+            Optional[CommandStream]: The command stream, or `None` when the augmentation's plans
+                can't be created from a partial response.
+        """
+        return None
@@ -0,0 +1,103 @@
+"""
+Copyright (c) Microsoft Corporation. All rights reserved.
+Licensed under the MIT License.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence, cast
+
+from botbuilder.core import TurnContext
+
+from ...state import MemoryBase
+from ...utils.json import JSONStreamParser
+from ..planners.plan import PredictedCommand
+from ..tokenizers import Tokenizer
+from ..validators.validation import Validation
+
+CommandFactory = Callable[
+    [TurnContext, MemoryBase, Tokenizer, Dict[str, Any], int], Awaitable[Validation]
+]
+"""
+Validates a command object parsed from a streamed response and returns a `Validation` whose
+value is the `PredictedCommand` to perform.
+"""
+
+
+class CommandStream:
+    """
+    Creates plan commands from a streamed response as soon as each command object is complete.
+
+    The stream stops creating commands once a command is invalid. The complete response is
+    still validated, and repaired if needed, once it has been received.
+    """
+
+    _parser: JSONStreamParser
+    _create_command: CommandFactory
+    _count: int
+    _feedback: Optional[str]
+    _valid: bool
+
+    def __init__(self, path: Sequence[Optional[str]], create_command: CommandFactory) -> None:
+        """
+        Creates a new `CommandStream` instance.
+
+        Args:
+            path (Sequence[Optional[str]]): Path of the command objects in the response.
+                See `JSONStreamParser`.
+            create_command (CommandFactory): Function used to validate each command object.
+        """
+        self._parser = JSONStreamParser(path)
+        self._create_command = create_command
+        self._count = 0
+        self._feedback = None
+        self._valid = True
+
+    @property
+    def valid(self) -> bool:
+        """bool: False once an invalid command was received."""
+        return self._valid
+
+    @property
+    def feedback(self) -> Optional[str]:
+        """Optional[str]: Feedback for the invalid command, if any."""
+        return self._feedback
+
+    async def write(
+        self, context: TurnContext, memory: MemoryBase, tokenizer: Tokenizer, text: str
+    ) -> List[PredictedCommand]:
+        """
+        Adds the next chunk of the response.
+
+        Args:
+            context (TurnContext): Context for the current turn of conversation.
+            memory (MemoryBase): Interface for accessing state variables.
+            tokenizer (Tokenizer): Tokenizer to use for encoding/decoding text.
+            text (str): The chunk of text.
+
+        Returns:
+            List[PredictedCommand]: The commands completed by the chunk.
+        """
+        if not self._valid:
+            return []
+
+        commands: List[PredictedCommand] = []
+
+        try:
+            objects = self._parser.feed(text)
+        except ValueError:
+            self._valid = False
+            return commands
+
+        for obj in objects:
+            validation = await self._create_command(context, memory, tokenizer, obj, self._count)
+
+            if not validation.valid:
+                self._valid = False
+                self._feedback = validation.feedback
+                break
+
+            commands.append(cast(PredictedCommand, validation.value))
+            self._count += 1
+
+        return commands
@@ -11,6 +11,7 @@ from typing import Any, Dict, List, Optional, Union, cast
 
 from botbuilder.core import TurnContext
 from dataclasses_json import DataClassJsonMixin, dataclass_json
+from jsonschema import Draft7Validator
 
 from ...state import MemoryBase
 from ..models.chat_completion_action import ChatCompletionAction
@@ -22,7 +23,7 @@ from ..planners.plan import (
     PredictedSayCommand,
 )
 from ..prompts.function_call import FunctionCall
-from ..prompts.message import Message
+from ..prompts.message import Message, MessageContext
 from ..prompts.sections.action_augmentation_section import ActionAugmentationSection
 from ..prompts.sections.prompt_section import PromptSection
 from ..tokenizers import Tokenizer
@@ -30,6 +31,7 @@ from ..validators.action_response_validator import ActionResponseValidator
 from ..validators.json_response_validator import JSONResponseValidator
 from ..validators.validation import Validation
 from .augmentation import Augmentation
+from .command_stream import CommandStream
 
 _MISSING_ACTION_FEEDBACK = (
     'The JSON returned had errors. Apply these fixes:\nadd the "action" property to "instance"'
@@ -111,6 +113,9 @@ InnerMonologueSchema: Dict[str, Any] = {
 }
 "Json schema for validating an 'InnerMonologue'"
 
+# private
+_action_schema_validator = Draft7Validator(InnerMonologueSchema["properties"]["action"])
+
 
 class MonologueAugmentation(Augmentation[InnerMonologue]):
     """
@@ -212,26 +217,86 @@ class MonologueAugmentation(Augmentation[InnerMonologue]):
         if validation_result.value:
             monologue = InnerMonologue.from_dict(validation_result.value)
             validation_result.value = monologue
-            parameters = (
-                json.dumps(monologue.action.parameters) if monologue.action.parameters else ""
-            )
-            message = Message[str](
-                role="assistant",
-                content=None,
-                function_call=FunctionCall(name=monologue.action.name, arguments=parameters),
+            action_validation = await self._validate_action(
+                context, memory, tokenizer, monologue.action, remaining_attempts
             )
-            action_validation = await self._action_validator.validate_response(
+
+            if not action_validation.valid:
+                return action_validation
+
+        return validation_result
+
+    def create_command_stream(self) -> Optional[CommandStream]:
+        """
+        Creates a stream that creates the command for the monologue's action as soon as the
+        action is complete, before the rest of the monologue is received.
+
+        Returns:
+            Optional[CommandStream]: The command stream.
+        """
+        return CommandStream(["action"], self._create_streamed_command)
+
+    async def _create_streamed_command(
+        self,
+        context: TurnContext,
+        memory: MemoryBase,
+        tokenizer: Tokenizer,
+        obj: Dict[str, Any],
+        _index: int,
+    ) -> Validation:
+        if not _action_schema_validator.is_valid(obj):
+            return Validation(valid=False, feedback=_MISSING_ACTION_FEEDBACK)
+
+        action = Action.from_dict(obj)
+        validation = await self._validate_action(context, memory, tokenizer, action, 0)
+
+        if not validation.valid:
+            return validation
+
+        return Validation(value=self._create_command(action))
+
+    async def _validate_action(
+        self,
+        context: TurnContext,
+        memory: MemoryBase,
+        tokenizer: Tokenizer,
+        action: Action,
+        remaining_attempts: int,
+    ) -> Validation:
+        parameters = json.dumps(action.parameters) if action.parameters else ""
+        message = Message[str](
+            role="assistant",
+            content=None,
+            function_call=FunctionCall(name=action.name, arguments=parameters),
+        )
+        return cast(
+            Validation,
+            await self._action_validator.validate_response(
                 context,
                 memory,
                 tokenizer,
                 PromptResponse(status="success", message=message),
                 remaining_attempts,
-            )
+            ),
+        )
 
-            if not action_validation.valid:
-                return cast(Any, action_validation)
+    def _create_command(
+        self, action: Action, context: Optional[MessageContext] = None
+    ) -> PredictedCommand:
+        if action.name == "SAY":
+            params = action.parameters
+            return PredictedSayCommand(
+                response=(
+                    Message(role="assistant", context=context, content=params.get("text"))
+                    if params
+                    else None
+                )
+            )
 
-        return validation_result
+        return PredictedDoCommand(
+            action=action.name,
+            parameters=action.parameters if action.parameters else {},
+        )
 
     async def create_plan_from_response(
         self,
@@ -252,29 +317,10 @@ class MonologueAugmentation(Augmentation[InnerMonologue]):
         """
         # Identify the action to perform
         if response.message and response.message.content:
-            command: PredictedCommand
             # Double encoding/decoding required for class
             monologue = InnerMonologue.from_dict(InnerMonologue.to_dict(response.message.content))
 
-            if monologue.action.name == "SAY":
-                params = monologue.action.parameters
-                response_val = PredictedSayCommand(
-                    response=(
-                        Message(
-                            role="assistant",
-                            context=response.message.context,
-                            content=params.get("text"),
-                        )
-                        if params
-                        else None
-                    )
-                )
-                command = response_val
-            else:
-                command = PredictedDoCommand(
-                    action=monologue.action.name,
-                    parameters=monologue.action.parameters if monologue.action.parameters else {},
-                )
+            command = self._create_command(monologue.action, response.message.context)
             return Plan(commands=[command])
         return Plan()
 
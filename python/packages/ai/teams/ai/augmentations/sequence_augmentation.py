@@ -9,6 +9,7 @@ import json
 from typing import Any, Dict, List, Optional, Union, cast
 
 from botbuilder.core import TurnContext
+from jsonschema import Draft7Validator
 
 from ...state import MemoryBase
 from ..models.chat_completion_action import ChatCompletionAction
@@ -28,6 +29,7 @@ from ..validators.action_response_validator import ActionResponseValidator
 from ..validators.json_response_validator import JSONResponseValidator
 from ..validators.validation import Validation
 from .augmentation import Augmentation
+from .command_stream import CommandStream
 
 PlanSchema: Optional[Dict[str, Any]] = {
     "type": "object",
@@ -52,6 +54,11 @@ PlanSchema: Optional[Dict[str, Any]] = {
 }
 "JSON schema for a 'Plan'"
 
+# private
+_command_schema_validator = Draft7Validator(
+    cast(Dict[str, Any], PlanSchema)["properties"]["commands"]["items"]
+)
+
 
 class SequenceAugmentation(Augmentation[Plan]):
     """
@@ -132,59 +139,115 @@ class SequenceAugmentation(Augmentation[Plan]):
             validation_result.value = plan
 
             for index, command in enumerate(plan.commands):
-                if isinstance(command, PredictedDoCommand):
-                    # Ensure that the model specified an action
-                    if not command.action:
-                        return Validation(
-                            valid=False,
-                            feedback='The plan JSON is missing the DO "action" for '
-                            + f"command[{index}]. Return the name of the action to DO.",
-                        )
+                command_validation = await self._validate_command(
+                    context,
+                    memory,
+                    tokenizer,
+                    command,
+                    index=index,
+                    remaining_attempts=remaining_attempts,
+                )
 
-                    # Ensure that the action is valid
-                    parameters: str = ""
-                    if command.parameters:
-                        parameters = json.dumps(command.parameters)
-                    message = Message[str](
-                        role="assistant",
-                        content=None,
-                        function_call=FunctionCall(name=command.action, arguments=parameters),
-                    )
-                    action_validation = await self._action_validator.validate_response(
-                        context,
-                        memory,
-                        tokenizer,
-                        PromptResponse(message=message),
-                        remaining_attempts,
-                    )
-
-                    if not action_validation.valid:
-                        return cast(Any, action_validation)
-                elif isinstance(command, PredictedSayCommand):
-                    # Ensure that the model specified a response
-                    if (
-                        not command.response
-                        or command.response.content == ""
-                        or command.response.content is None
-                    ):
-                        return Validation(
-                            valid=False,
-                            feedback='The plan JSON is missing the SAY "response" '
-                            + f"for command[{index}]. Return the response to SAY.",
-                        )
-
-                    if isinstance(command.response, dict):
-                        command.response = Message[str].from_dict(command.response)
-                else:
-                    return Validation(
-                        valid=False,
-                        feedback="The plan JSON contains an unknown command"
-                        + f"type of ${command.type}. Only use DO or SAY commands.",
-                    )
+                if not command_validation.valid:
+                    return command_validation
 
         # Return the validated monologue
         return validation_result
 
+    def create_command_stream(self) -> Optional[CommandStream]:
+        """
+        Creates a stream that creates the plan's commands as soon as each of them is complete.
+
+        Returns:
+            Optional[CommandStream]: The command stream.
+        """
+        return CommandStream(["commands", None], self._create_streamed_command)
+
+    async def _create_streamed_command(
+        self,
+        context: TurnContext,
+        memory: MemoryBase,
+        tokenizer: Tokenizer,
+        obj: Dict[str, Any],
+        index: int,
+    ) -> Validation:
+        if _command_schema_validator.is_valid(obj):
+            cmd = dict(obj)
+            if cmd["type"] == "SAY":
+                cmd["response"] = Message[str](role="assistant", content=cmd.get("response"))
+
+            command = Plan.from_dict({"commands": [cmd]}).commands[0]
+            return await self._validate_command(
+                context, memory, tokenizer, command, index=index, remaining_attempts=0
+            )
+
+        return Validation(
+            valid=False,
+            feedback=f"The plan JSON contains an invalid command[{index}].",
+        )
+
+    async def _validate_command(
+        self,
+        context: TurnContext,
+        memory: MemoryBase,
+        tokenizer: Tokenizer,
+        command: PredictedCommand,
+        *,
+        index: int,
+        remaining_attempts: int,
+    ) -> Validation:
+        if isinstance(command, PredictedDoCommand):
+            # Ensure that the model specified an action
+            if not command.action:
+                return Validation(
+                    valid=False,
+                    feedback='The plan JSON is missing the DO "action" for '
+                    + f"command[{index}]. Return the name of the action to DO.",
+                )
+
+            # Ensure that the action is valid
+            parameters: str = ""
+            if command.parameters:
+                parameters = json.dumps(command.parameters)
+            message = Message[str](
+                role="assistant",
+                content=None,
+                function_call=FunctionCall(name=command.action, arguments=parameters),
+            )
+            action_validation = await self._action_validator.validate_response(
+                context,
+                memory,
+                tokenizer,
+                PromptResponse(message=message),
+                remaining_attempts,
+            )
+
+            if not action_validation.valid:
+                return cast(Any, action_validation)
+        elif isinstance(command, PredictedSayCommand):
+            # Ensure that the model specified a response
+            if (
+                not command.response
+                or command.response.content == ""
+                or command.response.content is None
+            ):
+                return Validation(
+                    valid=False,
+                    feedback='The plan JSON is missing the SAY "response" '
+                    + f"for command[{index}]. Return the response to SAY.",
+                )
+
+            if isinstance(command.response, dict):
+                command.response = Message[str].from_dict(command.response)
+        else:
+            return Validation(
+                valid=False,
+                feedback="The plan JSON contains an unknown command"
+                + f"type of ${command.type}. Only use DO or SAY commands.",
+            )
+
+        return Validation(value=command)
+
     async def create_plan_from_response(
         self, turn_context: TurnContext, memory: MemoryBase, response: PromptResponse[Plan]
     ) -> Plan:
@@ -26,7 +26,9 @@ from ..prompts import (
     Prompt,
     PromptFunctions,
     PromptTemplate,
+    RenderedPromptSection,
 )
+from ..prompts.sections import PromptSection
 from ..tokenizers import Tokenizer
 from ..validators import DefaultResponseValidator, PromptResponseValidator
 
@@ -88,10 +90,132 @@ class LLMClientOptions:
     enable_feedback_loop: Optional[bool] = False
     "Optional. Enables the Teams thumbs up or down buttons."
 
+    stream_text: bool = True
+    """
+    Optional. When False, the text of streamed responses isn't sent to the user as it's
+    received and the response message is returned once it's complete.
+    Defaults to `True`
+    """
+
+
+# private
+class _RecordedPrompt(PromptSection):
+    """
+    Renders a prompt and keeps its last message render so that repairs can reuse it.
+    """
+
+    prompt: PromptSection
+    rendered: Optional[RenderedPromptSection[List[Message]]]
+    max_tokens: int
+
+    def __init__(self, prompt: PromptSection) -> None:
+        self.prompt = prompt
+        self.rendered = None
+        self.max_tokens = -1
+
+    @property
+    def required(self) -> bool:
+        return self.prompt.required
+
+    @property
+    def tokens(self) -> float:
+        return self.prompt.tokens
+
+    async def render_as_text(
+        self,
+        context: TurnContext,
+        memory: MemoryBase,
+        functions: PromptFunctions,
+        tokenizer: Tokenizer,
+        max_tokens: int,
+    ) -> RenderedPromptSection[str]:
+        return await self.prompt.render_as_text(context, memory, functions, tokenizer, max_tokens)
+
+    async def render_as_messages(
+        self,
+        context: TurnContext,
+        memory: MemoryBase,
+        functions: PromptFunctions,
+        tokenizer: Tokenizer,
+        max_tokens: int,
+    ) -> RenderedPromptSection[List[Message]]:
+        rendered = await self.prompt.render_as_messages(
+            context, memory, functions, tokenizer, max_tokens
+        )
+        self.rendered = rendered
+        self.max_tokens = max_tokens
+        return rendered
+
+
+# private
+class _RepairPrompt(PromptSection):
+    """
+    Appends the repair conversation to the messages rendered for the first attempt.
+
+    Falls back to laying out the original prompt again when it is rendered as text or with
+    a different budget.
+    """
+
+    prompt: _RecordedPrompt
+    history: ConversationHistorySection
+
+    def __init__(self, prompt: _RecordedPrompt, variable: str) -> None:
+        self.prompt = prompt
+        self.history = ConversationHistorySection(variable=variable)
+
+    @property
+    def required(self) -> bool:
+        return self.prompt.required
+
+    @property
+    def tokens(self) -> float:
+        return self.prompt.tokens
+
+    async def render_as_text(
+        self,
+        context: TurnContext,
+        memory: MemoryBase,
+        functions: PromptFunctions,
+        tokenizer: Tokenizer,
+        max_tokens: int,
+    ) -> RenderedPromptSection[str]:
+        return await Prompt([self.prompt.prompt, self.history]).render_as_text(
+            context, memory, functions, tokenizer, max_tokens
+        )
+
+    async def render_as_messages(
+        self,
+        context: TurnContext,
+        memory: MemoryBase,
+        functions: PromptFunctions,
+        tokenizer: Tokenizer,
+        max_tokens: int,
+    ) -> RenderedPromptSection[List[Message]]:
+        rendered = self.prompt.rendered
+        if rendered is None or self.prompt.max_tokens != max_tokens:
+            return await Prompt([self.prompt.prompt, self.history]).render_as_messages(
+                context, memory, functions, tokenizer, max_tokens
+            )
+
+        # Give the repair conversation whatever budget the first attempt left over
+        repair = await self.history.render_as_messages(
+            context, memory, functions, tokenizer, max(max_tokens - rendered.length, 0)
+        )
+        length = rendered.length + repair.length
+        return RenderedPromptSection(
+            output=rendered.output + repair.output,
+            length=length,
+            too_long=length > max_tokens,
+            prefix_hash=rendered.prefix_hash,
+        )
+
 
 class LLMClient:
     """
     LLMClient class that's used to complete prompts.
+
+    When a response fails validation the client asks the model to repair it. Repairs reuse
+    the messages rendered for the first attempt and only render the repair conversation.
     """
 
     _options: LLMClientOptions
@@ -152,7 +276,7 @@ class LLMClient:
         ) -> None:
             # pylint: disable=unused-argument
             # Ignore events for other contexts
-            if context != ctx:
+            if context != ctx or not self._options.stream_text:
                 return
 
             # Check for a streaming response
@@ -211,6 +335,10 @@ class LLMClient:
                     status="invalid_response", error="Reached max model response repair attempts."
                 )
 
+            # Keep the first render around in case the response needs repairing
+            if not isinstance(template.prompt, (_RecordedPrompt, _RepairPrompt)):
+                template = self._copy_template(template, _RecordedPrompt(template.prompt))
+
             res = await self._options.model.complete_prompt(
                 context=context,
                 memory=memory,
@@ -256,25 +384,19 @@ class LLMClient:
                     ),
                 )
 
+                # Later attempts keep appending to the same repair conversation
+                if isinstance(template.prompt, _RecordedPrompt):
+                    template = self._copy_template(
+                        template,
+                        _RepairPrompt(template.prompt, f"{self._options.history_variable}-repair"),
+                    )
+
                 return await self.complete_prompt(
                     context=context,
                     memory=fork,
                     functions=functions,
                     tokenizer=tokenizer,
-                    template=PromptTemplate(
-                        name=template.name,
-                        actions=template.actions,
-                        augmentation=template.augmentation,
-                        config=template.config,
-                        prompt=Prompt(
-                            sections=[
-                                template.prompt,
-                                ConversationHistorySection(
-                                    variable=f"{self._options.history_variable}-repair"
-                                ),
-                            ]
-                        ),
-                    ),
+                    template=template,
                     remaining_attempts=remaining_attempts - 1,
                 )
 
@@ -305,6 +427,15 @@ class LLMClient:
                         StreamHandlerTypes.RESPONSE_RECEIVED, self._end_stream_handler
                     )
 
+    def _copy_template(self, template: PromptTemplate, prompt: PromptSection) -> PromptTemplate:
+        return PromptTemplate(
+            name=template.name,
+            actions=template.actions,
+            augmentation=template.augmentation,
+            config=template.config,
+            prompt=prompt,
+        )
+
     def _add_message_to_history(
         self, memory: MemoryBase, variable: str, messages: Union[Message[Any], List[Message[Any]]]
     ) -> None:
@@ -4,6 +4,39 @@ Licensed under the MIT License.
 """
 
 from .data_source import DataSource
+from .hybrid_data_source import HybridDataSource, HybridDataSourceOptions
+from .keyword_index import KeywordIndex, KeywordQueryResult
+from .text_chunker import TextChunk, TextChunker
 from .text_data_source import TextDataSource
+from .vector_data_source import VectorDataSource, VectorDataSourceOptions
+from .vector_index import (
+    VectorIndex,
+    VectorIndexItem,
+    VectorQuantization,
+    VectorQueryResult,
+)
+from .vector_ingestion import (
+    IngestionMetrics,
+    VectorIngestion,
+    VectorIngestionOptions,
+)
 
-__all__ = ["DataSource", "TextDataSource"]
+__all__ = [
+    "DataSource",
+    "HybridDataSource",
+    "HybridDataSourceOptions",
+    "IngestionMetrics",
+    "KeywordIndex",
+    "KeywordQueryResult",
+    "TextChunk",
+    "TextChunker",
+    "TextDataSource",
+    "VectorDataSource",
+    "VectorDataSourceOptions",
+    "VectorIndex",
+    "VectorIndexItem",
+    "VectorIngestion",
+    "VectorIngestionOptions",
+    "VectorQuantization",
+    "VectorQueryResult",
+]
@@ -6,6 +6,7 @@ Licensed under the MIT License.
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
+from typing import List
 
 from botbuilder.core import TurnContext
 
@@ -24,6 +25,13 @@ class DataSource(ABC):
     def name(self) -> str:
         "Name of the data source."
 
+    @property
+    def is_static(self) -> bool:
+        """
+        If true the data source renders the same text every turn for a given tokenizer and budget.
+        """
+        return False
+
     @abstractmethod
     async def render_data(
         self,
@@ -45,3 +53,55 @@ class DataSource(ABC):
             RenderedPromptSection: The text to inject into the prompt as a
             `RenderedPromptSection` object.
         """
+
+
+def render_documents(
+    texts: List[str], tokenizer: Tokenizer, max_tokens: int
+) -> RenderedPromptSection[str]:
+    """
+    Renders documents in order, separated by blank lines, until the token budget is used.
+
+    Args:
+        texts (List[str]): Texts of the documents.
+        tokenizer (Tokenizer): Tokenizer to use when rendering the documents.
+        max_tokens (int): Maximum number of tokens allowed to be rendered.
+
+    Returns:
+        RenderedPromptSection: The rendered documents. `too_long` is set when a document was
+        truncated or left out.
+    """
+    separator = "\n\n"
+    separator_length = tokenizer.count_tokens(separator)
+    output: List[str] = []
+    length = 0
+    too_long = False
+
+    for text, tokens in zip(texts, tokenizer.encode_batch(texts)):
+        budget = max_tokens - length - (separator_length if output else 0)
+
+        if budget <= 0:
+            too_long = True
+            break
+
+        if output:
+            length += separator_length
+
+        if len(tokens) > budget:
+            output.append(tokenizer.decode(tokens[:budget]))
+            length += budget
+            too_long = True
+            break
+
+        output.append(text)
+        length += len(tokens)
+
+    # Tokens can merge across the separators, so count the joined text
+    text = separator.join(output)
+    length = tokenizer.count_tokens(text)
+
+    if length > max_tokens:
+        text = tokenizer.truncate(text, max_tokens)
+        length = min(tokenizer.count_tokens(text), max_tokens)
+        too_long = True
+
+    return RenderedPromptSection[str](output=text, length=length, too_long=too_long)
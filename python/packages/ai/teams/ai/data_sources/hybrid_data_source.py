@@ -0,0 +1,198 @@
+"""
+Copyright (c) Microsoft Corporation. All rights reserved.
+Licensed under the MIT License.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence
+
+from botbuilder.core import TurnContext
+
+from teams.ai.data_sources.data_source import DataSource, render_documents
+from teams.ai.data_sources.keyword_index import KeywordIndex
+from teams.ai.data_sources.vector_index import VectorIndex, VectorIndexItem
+from teams.ai.embeddings.embeddings_model import EmbeddingsModel
+from teams.ai.prompts.rendered_prompt_section import RenderedPromptSection
+from teams.ai.tokenizers import Tokenizer
+from teams.app_error import ApplicationError
+from teams.state.memory import MemoryBase
+
+
+@dataclass
+class HybridDataSourceOptions:
+    """
+    Options for configuring a `HybridDataSource`.
+    """
+
+    name: str
+    "Name of the data source."
+
+    index: VectorIndex
+    "Index of the documents to render."
+
+    embeddings: Optional[EmbeddingsModel] = None
+    """
+    Optional. Model used to create the embedding of the users input. Documents are only ranked
+    by keywords when not set.
+    """
+
+    max_documents: int = 5
+    "Optional. Maximum number of documents to render. Defaults to `5`."
+
+    candidates: int = 20
+    "Optional. Number of documents each retriever contributes to the fusion. Defaults to `20`."
+
+    rrf_k: int = 60
+    "Optional. Constant added to the ranks by reciprocal rank fusion. Defaults to `60`."
+
+    keyword_threshold: Optional[float] = None
+    """
+    Optional. BM25 score at which the best keyword match is trusted on its own. Queries with
+    a match that scores this high aren't embedded. Defaults to always embedding the query.
+    """
+
+    input_variable: str = "temp.input"
+    "Optional. Memory variable with the text to search for. Defaults to `temp.input`."
+
+
+class HybridDataSource(DataSource):
+    """
+    A data source that renders the documents of a `VectorIndex` that best match the users input
+    by keywords and by meaning.
+
+    .. remarks::
+    The documents are ranked by BM25 over an inverted index of their texts and by the cosine
+    similarity of their embeddings, and the two rankings are fused with reciprocal rank fusion,
+    so exact identifiers like ticket numbers are found even when their embedding isn't close.
+    Documents should be added and deleted with `upsert()` and `delete()`, which keep the
+    inverted index in sync with the vector index. Documents written to the vector index
+    directly, like those of a `VectorIngestion` without a `data_source`, aren't found by
+    keywords until a new `HybridDataSource` is created. Rendering works like `VectorDataSource`.
+    """
+
+    _options: HybridDataSourceOptions
+    _keywords: KeywordIndex
+
+    def __init__(self, options: HybridDataSourceOptions) -> None:
+        """
+        Creates a new `HybridDataSource` instance, indexing the keywords of the documents
+        already in the vector index.
+
+        Args:
+            options (HybridDataSourceOptions): Options for configuring the data source.
+        """
+        self._options = options
+        self._keywords = KeywordIndex()
+        self._keywords.upsert(dict(options.index.texts()))
+
+    @property
+    def name(self) -> str:
+        """
+        Name of the data source.
+        """
+        return self._options.name
+
+    @property
+    def options(self) -> HybridDataSourceOptions:
+        """
+        Options the data source was configured with.
+        """
+        return self._options
+
+    def upsert(self, items: Sequence[VectorIndexItem]) -> None:
+        """
+        Adds documents to the vector and keyword indexes, replacing existing documents with the
+        same IDs.
+
+        Args:
+            items (Sequence[VectorIndexItem]): The documents to add.
+        """
+        self._options.index.upsert(items)
+        self._keywords.upsert({item.id: item.text for item in items})
+
+    def delete(self, ids: Sequence[str]) -> None:
+        """
+        Deletes documents from the vector and keyword indexes. Unknown IDs are ignored.
+
+        Args:
+            ids (Sequence[str]): IDs of the documents to delete.
+        """
+        self._options.index.delete(ids)
+        self._keywords.delete(ids)
+
+    async def render_data(
+        self,
+        turn_context: TurnContext,
+        memory: MemoryBase,
+        tokenizer: Tokenizer,
+        max_tokens: int,
+    ) -> RenderedPromptSection[str]:
+        """
+        Renders the documents that best match the users input.
+
+        Args:
+            turn_context (TurnContext): The turn context for current turn of conversation.
+            memory (MemoryBase): An interface for accessing state values.
+            tokenizer (Tokenizer): Tokenizer to use when rendering the data source.
+            max_tokens (int): Maximum number of tokens allowed to be rendered.
+
+        Returns:
+            RenderedPromptSection: The text to inject into the prompt as a
+            `RenderedPromptSection` object.
+
+        Raises:
+            ApplicationError: If the embedding of the users input can't be created.
+        """
+        query = memory.get(self._options.input_variable)
+
+        if not query or max_tokens <= 0 or len(self._options.index) == 0:
+            return RenderedPromptSection[str](output="", length=0, too_long=False)
+
+        keyword_results = self._keywords.query(str(query), self._options.candidates)
+        rankings = [[result.id for result in keyword_results]]
+
+        # Embedding the query is skipped when a keyword match is good enough on its own
+        threshold = self._options.keyword_threshold
+        is_keyword_match = (
+            threshold is not None
+            and len(keyword_results) > 0
+            and keyword_results[0].score >= threshold
+        )
+
+        if self._options.embeddings is not None and not is_keyword_match:
+            res = await self._options.embeddings.create_embeddings(str(query))
+
+            if res.status != "success" or not isinstance(res.output, list):
+                raise ApplicationError(
+                    "[HybridDataSource]: failed to create an embedding for the input:"
+                    f" {res.output or res.message}"
+                )
+
+            # Large indexes are queried in the executor so they don't block the event loop
+            loop = asyncio.get_running_loop()
+            results = await loop.run_in_executor(
+                None, self._options.index.query, res.output[0], self._options.candidates
+            )
+            rankings.append([result.id for result in results])
+
+        texts: List[str] = []
+        for document_id in self._fuse(rankings)[: self._options.max_documents]:
+            text = self._options.index.get_text(document_id)
+            if text is not None:
+                texts.append(text)
+
+        return render_documents(texts, tokenizer, max_tokens)
+
+    def _fuse(self, rankings: List[List[str]]) -> List[str]:
+        scores: Dict[str, float] = {}
+
+        for ranking in rankings:
+            for rank, document_id in enumerate(ranking):
+                scores[document_id] = scores.get(document_id, 0) + 1 / (
+                    self._options.rrf_k + rank + 1
+                )
+
+        return sorted(scores, key=lambda document_id: -scores[document_id])
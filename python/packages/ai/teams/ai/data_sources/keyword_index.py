@@ -0,0 +1,174 @@
+"""
+Copyright (c) Microsoft Corporation. All rights reserved.
+Licensed under the MIT License.
+"""
+
+from __future__ import annotations
+
+import heapq
+import math
+import re
+from collections import Counter
+from dataclasses import dataclass
+from typing import Dict, List, Mapping, Sequence, Set, Tuple
+
+# private
+_TERM_PATTERN = re.compile(r"\w+(?:[-_./:#]\w+)*")
+_PART_PATTERN = re.compile(r"[^\W_]+")
+
+
+@dataclass
+class KeywordQueryResult:
+    """
+    A document returned by a `KeywordIndex` query.
+    """
+
+    id: str
+    "ID of the document."
+
+    score: float
+    "BM25 score of the document."
+
+
+class KeywordIndex:
+    """
+    An in-memory inverted index that ranks documents with BM25.
+
+    Terms are lowercased words. Identifiers like `INC-1042` or `v2.1.0` are indexed both whole
+    and by their parts, so a query for `1042` finds the document with `INC-1042`. Identifiers
+    in queries are matched whole when the index has them, and by their parts otherwise.
+    """
+
+    _k1: float
+    _b: float
+    _postings: Dict[str, Dict[str, int]]
+    _terms: Dict[str, Tuple[str, ...]]
+    _lengths: Dict[str, int]
+    _total_length: int
+
+    def __init__(self, k1: float = 1.2, b: float = 0.75) -> None:
+        """
+        Creates a new, empty `KeywordIndex` instance.
+
+        Args:
+            k1 (float, optional): How quickly repeated terms stop adding to a document's score.
+                Defaults to `1.2`.
+            b (float, optional): How much long documents are penalized, from `0` to `1`.
+                Defaults to `0.75`.
+        """
+        self._k1 = k1
+        self._b = b
+        self._postings = {}
+        self._terms = {}
+        self._lengths = {}
+        self._total_length = 0
+
+    def __len__(self) -> int:
+        return len(self._lengths)
+
+    def __contains__(self, document_id: object) -> bool:
+        return document_id in self._lengths
+
+    def upsert(self, documents: Mapping[str, str]) -> None:
+        """
+        Adds documents to the index, replacing existing documents with the same IDs.
+
+        Args:
+            documents (Mapping[str, str]): The text of each document by ID.
+        """
+        self.delete([document_id for document_id in documents if document_id in self])
+
+        for document_id, text in documents.items():
+            counts = Counter(_tokenize(text))
+            self._terms[document_id] = tuple(counts)
+            self._lengths[document_id] = sum(counts.values())
+            self._total_length += self._lengths[document_id]
+
+            for term, count in counts.items():
+                self._postings.setdefault(term, {})[document_id] = count
+
+    def delete(self, ids: Sequence[str]) -> None:
+        """
+        Deletes documents from the index. Unknown IDs are ignored.
+
+        Args:
+            ids (Sequence[str]): IDs of the documents to delete.
+        """
+        for document_id in ids:
+            terms = self._terms.pop(document_id, None)
+            if terms is None:
+                continue
+
+            self._total_length -= self._lengths.pop(document_id)
+            for term in terms:
+                postings = self._postings[term]
+                del postings[document_id]
+                if len(postings) == 0:
+                    del self._postings[term]
+
+    def query(self, text: str, top_k: int = 5) -> List[KeywordQueryResult]:
+        """
+        Finds the documents that best match the terms of a query.
+
+        Args:
+            text (str): The query.
+            top_k (int, optional): Maximum number of documents to return. Defaults to `5`.
+
+        Returns:
+            List[KeywordQueryResult]: The documents containing at least one of the terms,
+                best match first.
+        """
+        if top_k <= 0 or len(self._lengths) == 0:
+            return []
+
+        count = len(self._lengths)
+        average_length = self._total_length / count
+        scores: Dict[str, float] = {}
+
+        for term in self._get_query_terms(text):
+            postings = self._postings[term]
+
+            idf = math.log(1 + (count - len(postings) + 0.5) / (len(postings) + 0.5))
+            for document_id, frequency in postings.items():
+                length = self._lengths[document_id] / average_length
+                saturation = frequency + self._k1 * (1 - self._b + self._b * length)
+                score = idf * frequency * (self._k1 + 1) / saturation
+                scores[document_id] = scores.get(document_id, 0) + score
+
+        ranked = heapq.nlargest(top_k, scores.items(), key=lambda item: item[1])
+        return [KeywordQueryResult(id=document_id, score=score) for document_id, score in ranked]
+
+    def _get_query_terms(self, text: str) -> Set[str]:
+        terms: Set[str] = set()
+
+        for match in _TERM_PATTERN.finditer(text.lower()):
+            term = match.group()
+
+            # Identifiers that are indexed whole don't need their parts, which tend to be
+            # common prefixes like `inc` that every ticket shares
+            if term in self._postings:
+                terms.add(term)
+            elif not term.isalnum():
+                terms.update(part for part in _get_parts(term) if part in self._postings)
+
+        return terms
+
+
+# private
+def _tokenize(text: str) -> List[str]:
+    # Identifiers are followed by their parts
+    terms: List[str] = []
+
+    for match in _TERM_PATTERN.finditer(text.lower()):
+        term = match.group()
+        terms.append(term)
+
+        if not term.isalnum():
+            terms.extend(_get_parts(term))
+
+    return terms
+
+
+# private
+def _get_parts(term: str) -> List[str]:
+    return _PART_PATTERN.findall(term)
@@ -0,0 +1,145 @@
+"""
+Copyright (c) Microsoft Corporation. All rights reserved.
+Licensed under the MIT License.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import List
+
+from teams.ai.tokenizers import Tokenizer
+
+# private
+_REPLACEMENT_CHARACTER = "\ufffd"
+_MAX_CHARACTER_TOKENS = 4
+
+
+@dataclass
+class TextChunk:
+    """
+    A chunk of a document created by a `TextChunker`.
+    """
+
+    text: str
+    "Text of the chunk."
+
+    start: int
+    "Offset of the first token of the chunk in the document."
+
+    end: int
+    "Offset after the last token of the chunk in the document."
+
+    @property
+    def length(self) -> int:
+        """int: Number of tokens in the chunk."""
+        return self.end - self.start
+
+
+class TextChunker:
+    """
+    Splits documents into chunks with a maximum number of tokens.
+
+    Each chunk repeats the last `overlap` tokens of the chunk before it, so text split
+    across two chunks is still found by searches for either chunk. Chunks start and end
+    between characters: when a token boundary falls inside a multi-byte character, like
+    those of CJK text or emoji, the boundary moves back to the start of the character.
+    """
+
+    _tokenizer: Tokenizer
+    _chunk_size: int
+    _overlap: int
+
+    def __init__(self, tokenizer: Tokenizer, chunk_size: int = 512, overlap: int = 64) -> None:
+        """
+        Creates a new `TextChunker` instance.
+
+        Args:
+            tokenizer (Tokenizer): Tokenizer used to count the tokens of the chunks.
+            chunk_size (int, optional): Maximum number of tokens in a chunk. Defaults to `512`.
+            overlap (int, optional): Number of tokens shared by consecutive chunks.
+                Defaults to `64`.
+
+        Raises:
+            ValueError: If `chunk_size` isn't positive or `overlap` isn't smaller than it.
+        """
+        if chunk_size <= 0:
+            raise ValueError("chunk_size must be positive")
+
+        if overlap < 0 or overlap >= chunk_size:
+            raise ValueError("overlap must be at least 0 and smaller than chunk_size")
+
+        self._tokenizer = tokenizer
+        self._chunk_size = chunk_size
+        self._overlap = overlap
+
+    @property
+    def chunk_size(self) -> int:
+        """int: Maximum number of tokens in a chunk."""
+        return self._chunk_size
+
+    @property
+    def overlap(self) -> int:
+        """int: Number of tokens shared by consecutive chunks."""
+        return self._overlap
+
+    def chunk(self, text: str) -> List[TextChunk]:
+        """
+        Splits a document into chunks.
+
+        Args:
+            text (str): The document.
+
+        Returns:
+            List[TextChunk]: The chunks in document order. Documents that only contain
+                whitespace have no chunks.
+        """
+        if text.strip() == "":
+            return []
+
+        tokens = self._tokenizer.encode(text)
+        if len(tokens) <= self._chunk_size:
+            return [TextChunk(text=text, start=0, end=len(tokens))]
+
+        # Replacement characters in the text can't be told apart from split characters
+        has_replacements = _REPLACEMENT_CHARACTER in text
+        chunks: List[TextChunk] = []
+        start = 0
+
+        while True:
+            end = min(start + self._chunk_size, len(tokens))
+            if not has_replacements:
+                end = self._find_boundary(tokens, start, end)
+
+            chunks.append(
+                TextChunk(text=self._tokenizer.decode(tokens[start:end]), start=start, end=end)
+            )
+
+            if end == len(tokens):
+                return chunks
+
+            # Chunks only overlap when the next one can start after this one
+            next_start = max(end - self._overlap, start + 1)
+            if not has_replacements:
+                next_start = self._find_boundary(tokens, start, next_start)
+            start = next_start if next_start < end else end
+
+    def _find_boundary(self, tokens: List[int], start: int, end: int) -> int:
+        # Returns the last boundary between characters after `start` and up to `end`, or the
+        # first one after `end` when a single character takes all of the tokens
+        for i in range(end, start, -1):
+            if self._is_boundary(tokens, i):
+                return i
+
+        i = end + 1
+        while i < len(tokens) and not self._is_boundary(tokens, i):
+            i += 1
+        return min(i, len(tokens))
+
+    def _is_boundary(self, tokens: List[int], i: int) -> bool:
+        # A character takes at most 4 bytes, so one that ends at `i` starts in the window
+        if i >= len(tokens):
+            return True
+
+        window = tokens[max(i - _MAX_CHARACTER_TOKENS, 0) : i]
+        return not self._tokenizer.decode(window).endswith(_REPLACEMENT_CHARACTER)
@@ -5,8 +5,6 @@ Licensed under the MIT License.
 
 from __future__ import annotations
 
-from typing import List, Optional
-
 from botbuilder.core import TurnContext
 
 from teams.ai.data_sources.data_source import DataSource
@@ -26,7 +24,6 @@ class TextDataSource(DataSource):
 
     _name: str
     _text: str
-    _tokens: Optional[List[int]] = None
 
     def __init__(self, name: str, text: str) -> None:
         """
@@ -46,6 +43,13 @@ class TextDataSource(DataSource):
         """
         return self._name
 
+    @property
+    def is_static(self) -> bool:
+        """
+        Always true as the text never changes.
+        """
+        return True
+
     async def render_data(
         self,
         turn_context: TurnContext,
@@ -67,14 +71,11 @@ class TextDataSource(DataSource):
             `RenderedPromptSection` object.
         """
 
-        if not self._tokens:  # Tokenize text on first use
-            self._tokens = tokenizer.encode(self._text)
+        length = tokenizer.count_tokens(self._text)
 
-        if len(self._tokens) > max_tokens:  # Check for max tokens
-            trimmed = self._tokens[0:max_tokens]
+        if length > max_tokens:  # Check for max tokens
+            trimmed = tokenizer.truncate(self._text, max_tokens)
             return RenderedPromptSection[str](
-                output=tokenizer.decode(trimmed), length=len(trimmed), too_long=True
+                output=trimmed, length=min(length, max(max_tokens, 0)), too_long=True
             )
-        return RenderedPromptSection[str](
-            output=self._text, length=len(self._tokens), too_long=False
-        )
+        return RenderedPromptSection[str](output=self._text, length=length, too_long=False)
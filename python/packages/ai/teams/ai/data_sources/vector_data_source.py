@@ -0,0 +1,134 @@
+"""
+Copyright (c) Microsoft Corporation. All rights reserved.
+Licensed under the MIT License.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
+from botbuilder.core import TurnContext
+
+from teams.ai.data_sources.data_source import DataSource, render_documents
+from teams.ai.data_sources.vector_index import VectorIndex
+from teams.ai.embeddings.embeddings_model import EmbeddingsModel
+from teams.ai.prompts.rendered_prompt_section import RenderedPromptSection
+from teams.ai.tokenizers import Tokenizer
+from teams.app_error import ApplicationError
+from teams.state.memory import MemoryBase
+
+
+@dataclass
+class VectorDataSourceOptions:
+    """
+    Options for configuring a `VectorDataSource`.
+    """
+
+    name: str
+    "Name of the data source."
+
+    embeddings: EmbeddingsModel
+    "Model used to create the embedding of the users input."
+
+    index: VectorIndex
+    "Index of the documents to render."
+
+    max_documents: int = 5
+    "Optional. Maximum number of documents to render. Defaults to `5`."
+
+    min_score: Optional[float] = None
+    "Optional. Minimum cosine similarity of the rendered documents."
+
+    filter: Optional[Dict[str, Any]] = None
+    "Optional. Metadata values the rendered documents must have. See `VectorIndex.query()`."
+
+    input_variable: str = "temp.input"
+    "Optional. Memory variable with the text to search for. Defaults to `temp.input`."
+
+
+class VectorDataSource(DataSource):
+    """
+    A data source that renders the documents of a `VectorIndex` that are most similar to the
+    users input.
+
+    .. remarks::
+    Documents are rendered most similar first, separated by blank lines, until the token
+    budget is used. The last document is truncated when only part of it fits. The index is
+    queried in the executor, so large indexes don't block the event loop.
+    """
+
+    _options: VectorDataSourceOptions
+
+    def __init__(self, options: VectorDataSourceOptions) -> None:
+        """
+        Creates a new `VectorDataSource` instance.
+
+        Args:
+            options (VectorDataSourceOptions): Options for configuring the data source.
+        """
+        self._options = options
+
+    @property
+    def name(self) -> str:
+        """
+        Name of the data source.
+        """
+        return self._options.name
+
+    @property
+    def options(self) -> VectorDataSourceOptions:
+        """
+        Options the data source was configured with.
+        """
+        return self._options
+
+    async def render_data(
+        self,
+        turn_context: TurnContext,
+        memory: MemoryBase,
+        tokenizer: Tokenizer,
+        max_tokens: int,
+    ) -> RenderedPromptSection[str]:
+        """
+        Renders the documents most similar to the users input.
+
+        Args:
+            turn_context (TurnContext): The turn context for current turn of conversation.
+            memory (MemoryBase): An interface for accessing state values.
+            tokenizer (Tokenizer): Tokenizer to use when rendering the data source.
+            max_tokens (int): Maximum number of tokens allowed to be rendered.
+
+        Returns:
+            RenderedPromptSection: The text to inject into the prompt as a
+            `RenderedPromptSection` object.
+
+        Raises:
+            ApplicationError: If the embedding of the users input can't be created.
+        """
+        query = memory.get(self._options.input_variable)
+
+        if not query or max_tokens <= 0 or len(self._options.index) == 0:
+            return RenderedPromptSection[str](output="", length=0, too_long=False)
+
+        res = await self._options.embeddings.create_embeddings(str(query))
+
+        if res.status != "success" or not isinstance(res.output, list):
+            raise ApplicationError(
+                "[VectorDataSource]: failed to create an embedding for the input:"
+                f" {res.output or res.message}"
+            )
+
+        vector = res.output[0]
+        loop = asyncio.get_running_loop()
+        results = await loop.run_in_executor(
+            None,
+            lambda: self._options.index.query(
+                vector,
+                top_k=self._options.max_documents,
+                filter=self._options.filter,
+                min_score=self._options.min_score,
+            ),
+        )
+        return render_documents([result.text for result in results], tokenizer, max_tokens)
@@ -0,0 +1,679 @@
+"""
+Copyright (c) Microsoft Corporation. All rights reserved.
+Licensed under the MIT License.
+"""
+
+from __future__ import annotations
+
+import json
+import math
+import os
+import shutil
+import uuid
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, List, Literal, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+# private
+_VECTORS_FILE = "vectors.npy"
+_CODES_FILE = "codes.npy"
+_SCALES_FILE = "scales.npy"
+_CENTROIDS_FILE = "centroids.npy"
+_ASSIGNMENTS_FILE = "assignments.npy"
+_ITEMS_FILE = "items.json"
+_CURRENT_FILE = "current.json"
+_GENERATION_PREFIX = "gen-"
+_BLOCK_SIZE = 16384
+
+VectorQuantization = Literal["float16", "int8"]
+
+
+@dataclass
+class VectorIndexItem:
+    """
+    A chunk of text stored in a `VectorIndex`.
+    """
+
+    id: str
+    "Unique ID of the item. Adding an item with an existing ID replaces it."
+
+    text: str
+    "Text of the item that's rendered into prompts."
+
+    vector: Union[Sequence[float], np.ndarray]
+    "Embedding of the text."
+
+    metadata: Dict[str, Any] = field(default_factory=dict)
+    "Optional. Metadata that queries can be filtered on. Must be JSON serializable."
+
+
+@dataclass
+class VectorQueryResult:
+    """
+    An item returned by a `VectorIndex` query.
+    """
+
+    id: str
+    "ID of the item."
+
+    text: str
+    "Text of the item."
+
+    metadata: Dict[str, Any]
+    "Metadata of the item."
+
+    score: float
+    "Cosine similarity between the item and the query vector."
+
+
+class VectorIndex:
+    """
+    An in-process index of embeddings that finds the items most similar to a query vector.
+
+    Vectors are normalized when they're added and stored in a single float32 matrix, so the
+    cosine similarity with every item is computed by one matrix-vector product.
+    Indexes saved with `save()` can be opened with `VectorIndex.load()`, which memory maps the
+    vectors so that processes loading the same index share its pages.
+
+    .. remarks::
+    Large indexes can trade some recall for speed and memory:
+
+    - With a `quantization`, the index also keeps float16 or int8 codes of the vectors. Queries
+      scan the codes and only read the float32 vectors of the best candidates to re-rank them
+      exactly, so a loaded index with memory mapped vectors keeps little more than the codes
+      in memory.
+    - After `train()`, the vectors are grouped into lists around k-means centroids and queries
+      only scan the lists whose centroids are closest to the query vector.
+    """
+
+    _vectors: np.ndarray
+    _count: int
+    _ids: List[str]
+    _texts: List[str]
+    _metadata: List[Dict[str, Any]]
+    _rows: Dict[str, int]
+    _masks: Dict[Tuple[str, str], np.ndarray]
+    _quantization: Optional[VectorQuantization]
+    _codes: Optional[np.ndarray]
+    _scales: Optional[np.ndarray]
+    _centroids: Optional[np.ndarray]
+    _assignments: Optional[np.ndarray]
+    _lists: Optional[Tuple[np.ndarray, np.ndarray]]
+
+    def __init__(self, dimensions: int, quantization: Optional[VectorQuantization] = None) -> None:
+        """
+        Creates a new, empty `VectorIndex` instance.
+
+        Args:
+            dimensions (int): Number of dimensions of the vectors.
+            quantization (Optional[VectorQuantization]): Optional. Keeps `float16` or `int8`
+                codes of the vectors that queries scan before re-ranking. `int8` codes take a
+                quarter of the memory of the vectors and scan about as fast. `float16` codes
+                take half, but NumPy converts them to float32 slowly. Defaults to scanning
+                the float32 vectors.
+
+        Raises:
+            ValueError: If the quantization isn't supported.
+        """
+        if quantization not in (None, "float16", "int8"):
+            raise ValueError(f"unsupported quantization: {quantization}")
+
+        self._vectors = np.zeros((0, dimensions), dtype=np.float32)
+        self._count = 0
+        self._ids = []
+        self._texts = []
+        self._metadata = []
+        self._rows = {}
+        self._masks = {}
+        self._quantization = quantization
+        self._codes = None
+        self._scales = None
+        self._centroids = None
+        self._assignments = None
+        self._lists = None
+
+        if quantization is not None:
+            self._codes = np.zeros((0, dimensions), dtype=quantization)
+
+        if quantization == "int8":
+            self._scales = np.zeros(0, dtype=np.float32)
+
+    @property
+    def dimensions(self) -> int:
+        """int: Number of dimensions of the vectors."""
+        return int(self._vectors.shape[1])
+
+    @property
+    def ids(self) -> List[str]:
+        """List[str]: IDs of the items in the index."""
+        return list(self._ids)
+
+    @property
+    def quantization(self) -> Optional[VectorQuantization]:
+        """Optional[VectorQuantization]: Type of the codes queries scan, if any."""
+        return self._quantization
+
+    @property
+    def lists(self) -> int:
+        """int: Number of lists created by `train()`, or `0` when the index isn't trained."""
+        return 0 if self._centroids is None else len(self._centroids)
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __contains__(self, item_id: object) -> bool:
+        return item_id in self._rows
+
+    def get(self, item_id: str) -> Optional[VectorIndexItem]:
+        """
+        Gets an item from the index.
+
+        Args:
+            item_id (str): ID of the item.
+
+        Returns:
+            Optional[VectorIndexItem]: The item with its normalized vector, or `None` when the
+                index doesn't have it.
+        """
+        row = self._rows.get(item_id)
+        if row is None:
+            return None
+
+        return VectorIndexItem(
+            id=item_id,
+            text=self._texts[row],
+            vector=np.array(self._vectors[row]),
+            metadata=self._metadata[row],
+        )
+
+    def get_text(self, item_id: str) -> Optional[str]:
+        """
+        Gets the text of an item without reading its vector.
+
+        Args:
+            item_id (str): ID of the item.
+
+        Returns:
+            Optional[str]: The text of the item, or `None` when the index doesn't have it.
+        """
+        row = self._rows.get(item_id)
+        return None if row is None else self._texts[row]
+
+    def texts(self) -> Iterator[Tuple[str, str]]:
+        """
+        Iterates over the IDs and texts of the items without reading their vectors, so the
+        pages of a memory-mapped index aren't loaded.
+
+        Returns:
+            Iterator[Tuple[str, str]]: The ID and text of each item.
+        """
+        return zip(list(self._ids), list(self._texts))
+
+    def upsert(self, items: Sequence[VectorIndexItem]) -> None:
+        """
+        Adds items to the index, replacing existing items with the same IDs.
+
+        Items added to a trained index join the list of their closest centroid. The centroids
+        don't move, so train the index again after adding many items.
+
+        Args:
+            items (Sequence[VectorIndexItem]): The items to add.
+
+        Raises:
+            ValueError: If a vector doesn't have the index's number of dimensions.
+        """
+        if len(items) == 0:
+            return
+
+        vectors = np.asarray([item.vector for item in items], dtype=np.float32)
+        if vectors.ndim != 2 or vectors.shape[1] != self.dimensions:
+            raise ValueError(f"vectors must have {self.dimensions} dimensions")
+
+        vectors = _normalize(vectors)
+        codes, scales = _quantize(vectors, self._quantization)
+        assignments = None if self._centroids is None else _assign(vectors, self._centroids)
+
+        self._reserve(self._count + len(items))
+        self._invalidate()
+
+        for i, item in enumerate(items):
+            row = self._rows.get(item.id)
+            if row is None:
+                row = self._count
+                self._count += 1
+                self._rows[item.id] = row
+                self._ids.append(item.id)
+                self._texts.append(item.text)
+                self._metadata.append(item.metadata)
+            else:
+                self._texts[row] = item.text
+                self._metadata[row] = item.metadata
+
+            self._vectors[row] = vectors[i]
+            if self._codes is not None and codes is not None:
+                self._codes[row] = codes[i]
+            if self._scales is not None and scales is not None:
+                self._scales[row] = scales[i]
+            if self._assignments is not None and assignments is not None:
+                self._assignments[row] = assignments[i]
+
+    def delete(self, ids: Sequence[str]) -> None:
+        """
+        Deletes items from the index. Unknown IDs are ignored.
+
+        Args:
+            ids (Sequence[str]): IDs of the items to delete.
+        """
+        rows = {self._rows[item_id] for item_id in ids if item_id in self._rows}
+        if len(rows) == 0:
+            return
+
+        self._reserve(self._count)
+        self._invalidate()
+
+        # Fill each hole with the last row
+        for row in sorted(rows, reverse=True):
+            last = self._count - 1
+            del self._rows[self._ids[row]]
+
+            if row != last:
+                for array in self._get_row_arrays():
+                    array[row] = array[last]
+                self._ids[row] = self._ids[last]
+                self._texts[row] = self._texts[last]
+                self._metadata[row] = self._metadata[last]
+                self._rows[self._ids[row]] = row
+
+            self._ids.pop()
+            self._texts.pop()
+            self._metadata.pop()
+            self._count -= 1
+
+    def train(
+        self,
+        lists: Optional[int] = None,
+        iterations: int = 10,
+        sample_size: Optional[int] = None,
+        seed: int = 0,
+    ) -> None:
+        """
+        Groups the vectors into lists around k-means centroids, so queries only scan the lists
+        closest to the query vector.
+
+        Args:
+            lists (Optional[int]): Optional. Number of lists. More lists make queries faster
+                but lower their recall for the same number of `probes`. Defaults to the square
+                root of the number of items.
+            iterations (int): Optional. Number of k-means iterations. Defaults to `10`.
+            sample_size (Optional[int]): Optional. Number of vectors the centroids are computed
+                from. Defaults to 256 vectors per list.
+            seed (int): Optional. Seed of the random sample and initial centroids.
+                Defaults to `0`.
+
+        Raises:
+            ValueError: If the index is empty.
+        """
+        if self._count == 0:
+            raise ValueError("an empty index can't be trained")
+
+        lists = min(lists or max(1, int(math.sqrt(self._count))), self._count)
+        sample_size = min(sample_size or lists * 256, self._count)
+        rng = np.random.default_rng(seed)
+
+        sample = np.sort(rng.choice(self._count, size=sample_size, replace=False))
+        self._centroids = _kmeans(np.asarray(self._vectors[sample]), lists, iterations, rng)
+
+        self._assignments = np.zeros(len(self._vectors), dtype=np.int32)
+        self._assignments[: self._count] = _assign(self._vectors[: self._count], self._centroids)
+        self._lists = None
+
+    def query(
+        self,
+        vector: Union[Sequence[float], np.ndarray],
+        top_k: int = 5,
+        *,
+        filter: Optional[Dict[str, Any]] = None,  # pylint: disable=redefined-builtin
+        min_score: Optional[float] = None,
+        probes: Optional[int] = None,
+        rerank: Optional[int] = None,
+    ) -> List[VectorQueryResult]:
+        """
+        Finds the items most similar to a vector.
+
+        Args:
+            vector (Union[Sequence[float], np.ndarray]): The query vector.
+            top_k (int): Optional. Maximum number of items to return. Defaults to `5`.
+            filter (Optional[Dict[str, Any]]): Optional. Metadata values the items must have.
+                A list value matches items with any of the listed values.
+            min_score (Optional[float]): Optional. Minimum cosine similarity of the items.
+            probes (Optional[int]): Optional. Number of lists scanned by a trained index.
+                More probes raise recall and latency. Defaults to a tenth of the lists.
+            rerank (Optional[int]): Optional. Number of candidates found by scanning the
+                codes of a quantized index that are re-ranked with their float32 vectors.
+                Defaults to `4 * top_k`.
+
+        Returns:
+            List[VectorQueryResult]: The items, most similar first.
+        """
+        if top_k <= 0 or self._count == 0:
+            return []
+
+        query = _normalize(np.asarray(vector, dtype=np.float32).reshape(1, -1))[0]
+        candidates: Optional[np.ndarray] = None
+
+        if self._centroids is not None:
+            candidates = self._get_probed_rows(query, probes)
+
+        if filter:
+            # Only score the rows that match the filter
+            mask = self._get_mask(filter)
+            candidates = (
+                np.flatnonzero(mask) if candidates is None else candidates[mask[candidates]]
+            )
+
+        scores = self._score(query, candidates)
+        if candidates is None:
+            candidates = np.arange(self._count)
+
+        if self._codes is not None and len(scores) > 0:
+            # Re-rank the best candidates with their exact similarity
+            best = np.sort(candidates[_top(scores, max(rerank or 4 * top_k, top_k))])
+            candidates = best
+            scores = np.asarray(self._vectors[best]) @ query
+
+        if min_score is not None:
+            keep = scores >= min_score
+            candidates = candidates[keep]
+            scores = scores[keep]
+
+        top = _top(scores, top_k)
+        candidates = candidates[top]
+        scores = scores[top]
+
+        order = np.argsort(-scores, kind="stable")
+        return [
+            VectorQueryResult(
+                id=self._ids[row],
+                text=self._texts[row],
+                metadata=self._metadata[row],
+                score=float(score),
+            )
+            for row, score in zip(candidates[order].tolist(), scores[order].tolist())
+        ]
+
+    def save(self, folder: str) -> None:
+        """
+        Saves the index to a folder.
+
+        Each save writes its files to a new generation folder inside `folder` and then
+        switches `current.json` to it in a single rename, so processes that load the index
+        while it's saved read either the previous or the new generation, never a mix of both.
+        The previous generation is then deleted. Other files and folders in `folder` are kept.
+
+        Args:
+            folder (str): The folder. It's created if it doesn't exist.
+        """
+        generation = f"{_GENERATION_PREFIX}{uuid.uuid4().hex}"
+        generation_folder = os.path.join(folder, generation)
+        os.makedirs(generation_folder)
+
+        arrays = {
+            _VECTORS_FILE: self._vectors,
+            _CODES_FILE: self._codes,
+            _SCALES_FILE: self._scales,
+            _ASSIGNMENTS_FILE: self._assignments,
+        }
+
+        for name, array in arrays.items():
+            if array is not None:
+                np.save(os.path.join(generation_folder, name), array[: self._count])
+
+        if self._centroids is not None:
+            np.save(os.path.join(generation_folder, _CENTROIDS_FILE), self._centroids)
+
+        with open(os.path.join(generation_folder, _ITEMS_FILE), "w", encoding="utf-8") as file:
+            json.dump(
+                {
+                    "dimensions": self.dimensions,
+                    "quantization": self._quantization,
+                    "trained": self._centroids is not None,
+                    "ids": self._ids,
+                    "texts": self._texts,
+                    "metadata": self._metadata,
+                },
+                file,
+            )
+
+        try:
+            previous: Optional[str] = _read_generation(folder)
+        except FileNotFoundError:
+            previous = None
+
+        current = os.path.join(folder, _CURRENT_FILE)
+        temp = os.path.join(folder, f"{_CURRENT_FILE}.{generation}.tmp")
+        with open(temp, "w", encoding="utf-8") as file:
+            json.dump({"generation": generation}, file)
+        os.replace(temp, current)
+
+        # Processes that already opened the previous generation keep their memory maps, and
+        # ones that read the previous pointer retry with the new one
+        if previous is not None and previous.startswith(_GENERATION_PREFIX):
+            shutil.rmtree(os.path.join(folder, previous), ignore_errors=True)
+
+    @classmethod
+    def load(cls, folder: str, mmap: bool = True) -> VectorIndex:
+        """
+        Loads an index saved with `save()`.
+
+        Args:
+            folder (str): The folder the index was saved to.
+            mmap (bool): Optional. Memory maps the vectors instead of reading them into memory.
+                The pages are shared by every process that maps the same file, and are copied
+                into memory the first time the index is changed. Defaults to `True`.
+
+        Returns:
+            VectorIndex: The loaded index.
+        """
+        generation = _read_generation(folder)
+
+        while True:
+            try:
+                return cls._load_generation(os.path.join(folder, generation), mmap)
+            except FileNotFoundError:
+                # The generation was replaced by a save while it was being loaded
+                latest = _read_generation(folder)
+                if latest == generation:
+                    raise
+                generation = latest
+
+    @classmethod
+    def _load_generation(cls, folder: str, mmap: bool) -> VectorIndex:
+        with open(os.path.join(folder, _ITEMS_FILE), "r", encoding="utf-8") as file:
+            items = json.load(file)
+
+        def load_array(name: str) -> np.ndarray:
+            return np.load(os.path.join(folder, name), mmap_mode="r" if mmap else None)
+
+        count = len(items["ids"])
+        index = cls(items["dimensions"], items.get("quantization"))
+        index._vectors = load_array(_VECTORS_FILE)
+
+        if index._codes is not None:
+            index._codes = load_array(_CODES_FILE)
+        if index._scales is not None:
+            index._scales = load_array(_SCALES_FILE)
+        if items.get("trained"):
+            index._centroids = np.load(os.path.join(folder, _CENTROIDS_FILE))
+            index._assignments = load_array(_ASSIGNMENTS_FILE)
+
+        arrays = index._get_row_arrays()
+        if any(len(array) != count for array in arrays) or index._vectors.ndim != 2:
+            raise ValueError(f"the vectors in {folder} don't match its items")
+
+        index._count = count
+        index._ids = items["ids"]
+        index._texts = items["texts"]
+        index._metadata = items["metadata"]
+        index._rows = {item_id: row for row, item_id in enumerate(index._ids)}
+        return index
+
+    def _get_row_arrays(self) -> List[np.ndarray]:
+        arrays = [self._vectors, self._codes, self._scales, self._assignments]
+        return [array for array in arrays if array is not None]
+
+    def _reserve(self, count: int) -> None:
+        # Memory mapped arrays are read-only, so they're copied before the first change
+        arrays = self._get_row_arrays()
+        if count <= len(self._vectors) and all(array.flags.writeable for array in arrays):
+            return
+
+        capacity = max(count, 2 * len(self._vectors), 16)
+        self._vectors = _resize(self._vectors, capacity, self._count)
+
+        if self._codes is not None:
+            self._codes = _resize(self._codes, capacity, self._count)
+        if self._scales is not None:
+            self._scales = _resize(self._scales, capacity, self._count)
+        if self._assignments is not None:
+            self._assignments = _resize(self._assignments, capacity, self._count)
+
+    def _invalidate(self) -> None:
+        self._masks.clear()
+        self._lists = None
+
+    def _score(self, query: np.ndarray, rows: Optional[np.ndarray]) -> np.ndarray:
+        if self._codes is None:
+            vectors = self._vectors[: self._count] if rows is None else self._vectors[rows]
+            return vectors @ query
+
+        # Codes are converted in blocks to keep the float32 copies small
+        count = self._count if rows is None else len(rows)
+        scores = np.empty(count, dtype=np.float32)
+
+        for start in range(0, count, _BLOCK_SIZE):
+            end = min(start + _BLOCK_SIZE, count)
+            codes = self._codes[start:end] if rows is None else self._codes[rows[start:end]]
+            scores[start:end] = codes.astype(np.float32) @ query
+
+        if self._scales is not None:
+            scores *= self._scales[: self._count] if rows is None else self._scales[rows]
+
+        return scores
+
+    def _get_probed_rows(self, query: np.ndarray, probes: Optional[int]) -> np.ndarray:
+        assert self._centroids is not None and self._assignments is not None
+        lists = len(self._centroids)
+        probes = min(probes or max(1, math.ceil(lists / 10)), lists)
+        nearest = _top(self._centroids @ query, probes)
+
+        if self._lists is None:
+            # Rows sorted by list, and where each list starts
+            assignments = self._assignments[: self._count]
+            order = np.argsort(assignments, kind="stable")
+            offsets = np.concatenate(([0], np.cumsum(np.bincount(assignments, minlength=lists))))
+            self._lists = (order, offsets)
+
+        order, offsets = self._lists
+        return np.concatenate([order[offsets[i] : offsets[i + 1]] for i in np.sort(nearest)])
+
+    def _get_mask(self, filter: Dict[str, Any]) -> np.ndarray:  # pylint: disable=redefined-builtin
+        mask = np.ones(self._count, dtype=bool)
+
+        for key, value in filter.items():
+            # Masks are cached until the items change
+            cache_key = (key, json.dumps(value, sort_keys=True))
+            cached = self._masks.get(cache_key)
+
+            if cached is None:
+                values = value if isinstance(value, list) else [value]
+                cached = np.fromiter(
+                    (
+                        key in metadata and metadata[key] in values
+                        for metadata in self._metadata[: self._count]
+                    ),
+                    dtype=bool,
+                    count=self._count,
+                )
+                self._masks[cache_key] = cached
+
+            mask &= cached
+
+        return mask
+
+
+# private
+def _read_generation(folder: str) -> str:
+    with open(os.path.join(folder, _CURRENT_FILE), "r", encoding="utf-8") as file:
+        return json.load(file)["generation"]
+
+
+# private
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors / np.where(norms == 0, 1, norms)
+
+
+# private
+def _top(scores: np.ndarray, count: int) -> np.ndarray:
+    if len(scores) <= count:
+        return np.arange(len(scores))
+    return np.argpartition(-scores, count - 1)[:count]
+
+
+# private
+def _resize(array: np.ndarray, capacity: int, count: int) -> np.ndarray:
+    resized = np.zeros((capacity,) + array.shape[1:], dtype=array.dtype)
+    resized[:count] = array[:count]
+    return resized
+
+
+# private
+def _quantize(
+    vectors: np.ndarray, quantization: Optional[VectorQuantization]
+) -> Tuple[Optional[np.ndarray], Optional[np.ndarray]]:
+    if quantization == "float16":
+        return vectors.astype(np.float16), None
+
+    if quantization == "int8":
+        # Each vector is scaled so that its largest component maps to 127
+        scales = np.abs(vectors).max(axis=1) / 127
+        codes = np.rint(vectors / np.where(scales == 0, 1, scales)[:, None]).astype(np.int8)
+        return codes, scales.astype(np.float32)
+
+    return None, None
+
+
+# private
+def _assign(vectors: np.ndarray, centroids: np.ndarray) -> np.ndarray:
+    assignments = np.empty(len(vectors), dtype=np.int32)
+
+    for start in range(0, len(vectors), _BLOCK_SIZE):
+        block = np.asarray(vectors[start : start + _BLOCK_SIZE], dtype=np.float32)
+        assignments[start : start + len(block)] = np.argmax(block @ centroids.T, axis=1)
+
+    return assignments
+
+
+# private
+def _kmeans(
+    vectors: np.ndarray, lists: int, iterations: int, rng: np.random.Generator
+) -> np.ndarray:
+    # Spherical k-means, since the vectors are compared by cosine similarity
+    centroids = vectors[rng.choice(len(vectors), size=lists, replace=False)].copy()
+
+    for _ in range(iterations):
+        assignments = _assign(vectors, centroids)
+        counts = np.bincount(assignments, minlength=lists)
+        order = np.argsort(assignments, kind="stable")
+        starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+        filled = counts > 0
+
+        centroids[filled] = _normalize(np.add.reduceat(vectors[order], starts[filled], axis=0))
+
+        # Lists that lost all their vectors start again from a random vector
+        empty = np.flatnonzero(~filled)
+        if len(empty) > 0:
+            centroids[empty] = vectors[rng.choice(len(vectors), size=len(empty), replace=False)]
+
+    return centroids
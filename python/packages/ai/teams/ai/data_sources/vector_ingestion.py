@@ -0,0 +1,356 @@
+"""
+Copyright (c) Microsoft Corporation. All rights reserved.
+Licensed under the MIT License.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import os
+import time
+from dataclasses import dataclass, field
+from logging import Logger
+from typing import Iterator, List, Optional, Set, Tuple, Union
+
+from teams.ai.data_sources.hybrid_data_source import HybridDataSource
+from teams.ai.data_sources.text_chunker import TextChunk, TextChunker
+from teams.ai.data_sources.vector_index import VectorIndex, VectorIndexItem
+from teams.ai.embeddings.embeddings_model import EmbeddingsModel
+from teams.ai.embeddings.embeddings_response import EmbeddingsResponse
+from teams.ai.tokenizers import Tokenizer
+
+
+@dataclass
+class VectorIngestionOptions:
+    """
+    Options for configuring a `VectorIngestion` pipeline.
+    """
+
+    embeddings: EmbeddingsModel
+    "Model used to create the embeddings of the chunks."
+
+    index: VectorIndex
+    "Index the chunks are written to."
+
+    tokenizer: Tokenizer
+    "Tokenizer used to split the files into chunks."
+
+    chunk_size: int = 512
+    "Optional. Maximum number of tokens in a chunk. Defaults to `512`."
+
+    chunk_overlap: int = 64
+    "Optional. Number of tokens shared by consecutive chunks. Defaults to `64`."
+
+    batch_size: int = 64
+    "Optional. Maximum number of chunks embedded by a request. Defaults to `64`."
+
+    concurrency: int = 4
+    "Optional. Maximum number of embeddings requests in flight. Defaults to `4`."
+
+    extensions: List[str] = field(default_factory=lambda: [".md", ".txt"])
+    "Optional. Extensions of the files to ingest. Defaults to `.md` and `.txt` files."
+
+    encoding: str = "utf-8"
+    "Optional. Encoding of the files. Defaults to `utf-8`."
+
+    checkpoint_folder: Optional[str] = None
+    """
+    Optional. Folder the index is saved to after every `checkpoint_interval` ingested files
+    and when ingestion ends, so an interrupted ingestion resumes from the last checkpoint.
+    """
+
+    checkpoint_interval: int = 100
+    "Optional. Number of ingested files between checkpoints. Defaults to `100`."
+
+    data_source: Optional[HybridDataSource] = None
+    """
+    Optional. Hybrid data source of `index`. When set, the chunks are written through it so
+    that its keyword index stays in sync with the vector index.
+    """
+
+
+@dataclass
+class IngestionMetrics:
+    """
+    Counts and throughput of an ingestion.
+    """
+
+    files: int = 0
+    "Number of files found."
+
+    files_ingested: int = 0
+    "Number of new or changed files written to the index."
+
+    files_skipped: int = 0
+    "Number of files that didn't change since they were ingested."
+
+    files_failed: int = 0
+    "Number of files that couldn't be read or embedded."
+
+    chunks: int = 0
+    "Number of chunks written to the index."
+
+    tokens: int = 0
+    "Number of tokens in the chunks written to the index."
+
+    requests: int = 0
+    "Number of embeddings requests sent."
+
+    seconds: float = 0
+    "Duration of the ingestion in seconds."
+
+    @property
+    def chunks_per_second(self) -> float:
+        """float: Number of chunks written to the index per second."""
+        return self.chunks / self.seconds if self.seconds > 0 else 0
+
+    @property
+    def tokens_per_second(self) -> float:
+        """float: Number of tokens embedded per second."""
+        return self.tokens / self.seconds if self.seconds > 0 else 0
+
+
+# private
+@dataclass
+class _File:
+    source: str
+    hash: str
+    chunks: List[TextChunk]
+    vectors: List[Optional[List[float]]]
+    remaining: int
+    failed: bool = False
+
+
+class VectorIngestion:
+    """
+    A pipeline that ingests the files of a folder into a `VectorIndex`.
+
+    Files are read one at a time, split into chunks by token count and embedded in batches,
+    with several batches in flight. Batches mix the chunks of small files so that requests
+    stay full. The chunks of a file are written to the index once all of them are embedded,
+    with IDs like `guide.md#0` and the file's path, chunk number and content hash in their
+    metadata. Files whose hash is already in the index are skipped, so ingesting a folder
+    again only embeds the files that changed. Checkpoints are saved by a worker thread while
+    no other file is written to the index.
+    """
+
+    _options: VectorIngestionOptions
+    _chunker: TextChunker
+    _log: Logger
+
+    def __init__(self, options: VectorIngestionOptions, log=Logger("teams.ai")) -> None:
+        """
+        Creates a new `VectorIngestion` instance.
+
+        Args:
+            options (VectorIngestionOptions): Options for configuring the pipeline.
+            log (Logger): Logger to use.
+
+        Raises:
+            ValueError: If the chunk size, overlap, batch size or concurrency is invalid, or
+                the data source doesn't use the index.
+        """
+        if options.batch_size <= 0 or options.concurrency <= 0:
+            raise ValueError("batch_size and concurrency must be positive")
+
+        if (
+            options.data_source is not None
+            and options.data_source.options.index is not options.index
+        ):
+            raise ValueError("data_source must use the index")
+
+        self._options = options
+        self._chunker = TextChunker(options.tokenizer, options.chunk_size, options.chunk_overlap)
+        self._log = log
+
+    @property
+    def options(self) -> VectorIngestionOptions:
+        """VectorIngestionOptions: Options the pipeline was configured with."""
+        return self._options
+
+    async def ingest(self, folder: str) -> IngestionMetrics:
+        """
+        Ingests the files of a folder and its subfolders.
+
+        Args:
+            folder (str): The folder.
+
+        Returns:
+            IngestionMetrics: Counts and throughput of the ingestion.
+        """
+        metrics = IngestionMetrics()
+        started_at = time.perf_counter()
+        loop = asyncio.get_running_loop()
+        semaphore = asyncio.Semaphore(self._options.concurrency)
+        lock = asyncio.Lock()
+        tasks: Set[asyncio.Future[None]] = set()
+        batch: List[Tuple[_File, int]] = []
+
+        async def send(chunks: List[Tuple[_File, int]]) -> None:
+            # Waiting for a free slot keeps the reader from getting ahead of the requests
+            await semaphore.acquire()
+            task = asyncio.ensure_future(self._embed(chunks, semaphore, metrics, lock))
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+
+        try:
+            for path in self._list_files(folder):
+                metrics.files += 1
+                source = os.path.relpath(path, folder).replace(os.sep, "/")
+                content = await loop.run_in_executor(None, self._read_file, path)
+
+                if content is None:
+                    metrics.files_failed += 1
+                    continue
+
+                text, digest = content
+                if self._is_ingested(source, digest):
+                    metrics.files_skipped += 1
+                    continue
+
+                chunks = await loop.run_in_executor(None, self._chunker.chunk, text)
+                file = _File(source, digest, chunks, [None] * len(chunks), len(chunks))
+
+                if len(chunks) == 0:
+                    await self._write(file, metrics, lock)
+                    continue
+
+                for i in range(len(chunks)):
+                    batch.append((file, i))
+
+                    if len(batch) == self._options.batch_size:
+                        await send(batch)
+                        batch = []
+
+            if len(batch) > 0:
+                await send(batch)
+
+            await asyncio.gather(*tasks)
+        finally:
+            for task in tasks:
+                task.cancel()
+
+        if self._options.checkpoint_folder is not None:
+            await loop.run_in_executor(
+                None, self._options.index.save, self._options.checkpoint_folder
+            )
+
+        metrics.seconds = time.perf_counter() - started_at
+        self._log.info(
+            "Ingested %d of %d files (%d skipped, %d failed): %d chunks, %.1f tokens/s",
+            metrics.files_ingested,
+            metrics.files,
+            metrics.files_skipped,
+            metrics.files_failed,
+            metrics.chunks,
+            metrics.tokens_per_second,
+        )
+        return metrics
+
+    def _list_files(self, folder: str) -> Iterator[str]:
+        extensions = tuple(extension.lower() for extension in self._options.extensions)
+
+        for root, dirs, files in os.walk(folder):
+            dirs.sort()
+            for name in sorted(files):
+                if name.lower().endswith(extensions):
+                    yield os.path.join(root, name)
+
+    def _read_file(self, path: str) -> Optional[Tuple[str, str]]:
+        try:
+            with open(path, "rb") as file:
+                content = file.read()
+            return content.decode(self._options.encoding), hashlib.sha256(content).hexdigest()
+        except (OSError, UnicodeDecodeError) as err:
+            self._log.warning("Couldn't read %s: %s", path, err)
+            return None
+
+    def _is_ingested(self, source: str, digest: str) -> bool:
+        item = self._options.index.get(f"{source}#0")
+        return item is not None and item.metadata.get("hash") == digest
+
+    async def _embed(
+        self,
+        chunks: List[Tuple[_File, int]],
+        semaphore: asyncio.Semaphore,
+        metrics: IngestionMetrics,
+        lock: asyncio.Lock,
+    ) -> None:
+        try:
+            metrics.requests += 1
+            res = await self._options.embeddings.create_embeddings(
+                [file.chunks[i].text for file, i in chunks]
+            )
+        except Exception as err:  # pylint: disable=broad-except
+            res = EmbeddingsResponse(status="error", output=str(err))
+        finally:
+            semaphore.release()
+
+        files = list({id(file): file for file, _ in chunks}.values())
+
+        if (
+            res.status != "success"
+            or not isinstance(res.output, list)
+            or len(res.output) != len(chunks)
+        ):
+            # The files aren't written, so they're embedded again by the next ingestion
+            self._log.error("Couldn't embed %d chunks: %s", len(chunks), res.output)
+            for file in files:
+                if not file.failed:
+                    file.failed = True
+                    metrics.files_failed += 1
+            return
+
+        for (file, i), vector in zip(chunks, res.output):
+            file.vectors[i] = vector
+            file.remaining -= 1
+
+        for file in files:
+            if file.remaining == 0 and not file.failed:
+                await self._write(file, metrics, lock)
+
+    async def _write(self, file: _File, metrics: IngestionMetrics, lock: asyncio.Lock) -> None:
+        async with lock:
+            self._upsert(file, metrics)
+
+            if (
+                self._options.checkpoint_folder is not None
+                and metrics.files_ingested % self._options.checkpoint_interval == 0
+            ):
+                # The lock keeps the index from changing while it's saved
+                loop = asyncio.get_running_loop()
+                await loop.run_in_executor(
+                    None, self._options.index.save, self._options.checkpoint_folder
+                )
+
+    def _upsert(self, file: _File, metrics: IngestionMetrics) -> None:
+        previous = self._options.index.get(f"{file.source}#0")
+        previous_count = previous.metadata.get("chunks", 0) if previous is not None else 0
+        target: Union[VectorIndex, HybridDataSource] = self._options.index
+        if self._options.data_source is not None:
+            target = self._options.data_source
+
+        # Remove the chunks a shorter version of the file no longer has
+        target.delete([f"{file.source}#{i}" for i in range(len(file.chunks), previous_count)])
+        target.upsert(
+            [
+                VectorIndexItem(
+                    id=f"{file.source}#{i}",
+                    text=chunk.text,
+                    vector=vector,
+                    metadata={
+                        "source": file.source,
+                        "chunk": i,
+                        "chunks": len(file.chunks),
+                        "hash": file.hash,
+                    },
+                )
+                for i, (chunk, vector) in enumerate(zip(file.chunks, file.vectors))
+                if vector is not None
+            ]
+        )
+
+        metrics.files_ingested += 1
+        metrics.chunks += len(file.chunks)
+        metrics.tokens += sum(chunk.length for chunk in file.chunks)
@@ -5,6 +5,8 @@ Licensed under the MIT License.
 
 from .azure_openai_embeddings import AzureOpenAIEmbeddings
 from .azure_openai_embeddings_options import AzureOpenAIEmbeddingsOptions
+from .cached_embeddings import CachedEmbeddings
+from .cached_embeddings_options import CachedEmbeddingsOptions
 from .embeddings_model import EmbeddingsModel
 from .embeddings_response import EmbeddingsResponse
 from .openai_embeddings import OpenAIEmbeddings
@@ -13,6 +15,8 @@ from .openai_embeddings_options import OpenAIEmbeddingsOptions
 __all__ = [
     "AzureOpenAIEmbeddings",
     "AzureOpenAIEmbeddingsOptions",
+    "CachedEmbeddings",
+    "CachedEmbeddingsOptions",
     "EmbeddingsModel",
     "EmbeddingsResponse",
     "OpenAIEmbeddings",
@@ -35,3 +35,15 @@ class AzureOpenAIEmbeddingsOptions:
 
     request_config: Optional[Dict[str, str]] = None
     "Request options to use."
+
+    batch_window: Optional[float] = None
+    """
+    Optional. Seconds to collect concurrent `create_embeddings()` calls with text inputs before
+    sending them in a shared request. Calls aren't batched when not set.
+    """
+
+    max_batch_size: int = 2048
+    "Optional. Maximum number of inputs in a shared request. Defaults to `2048`."
+
+    max_batch_tokens: int = 300000
+    "Optional. Maximum number of tokens in a shared request. Defaults to `300000`."
@@ -0,0 +1,279 @@
+"""
+Copyright (c) Microsoft Corporation. All rights reserved.
+Licensed under the MIT License.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import sqlite3
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple, TypeVar, Union
+
+import numpy as np
+
+from teams.ai.embeddings.azure_openai_embeddings import AzureOpenAIEmbeddings
+from teams.ai.embeddings.cached_embeddings_options import CachedEmbeddingsOptions
+from teams.ai.embeddings.embeddings_model import EmbeddingsModel
+from teams.ai.embeddings.embeddings_response import EmbeddingsResponse
+from teams.ai.embeddings.openai_embeddings import OpenAIEmbeddings
+
+# private
+_MAX_QUERY_KEYS = 500
+T = TypeVar("T")
+
+
+class CachedEmbeddings(EmbeddingsModel):
+    """
+    An embeddings model that caches the embeddings created by another model.
+
+    Embeddings are keyed by a hash of the text and the name of the model, and kept in a least
+    recently used memory tier and, when a `path` is configured, a SQLite database that
+    outlives the process. Only the texts that aren't cached are sent to the model, so a
+    request where some of the texts were seen before costs less than one where none were.
+    Token inputs aren't cached.
+
+    The database is only used from a single worker thread, so reading and writing it
+    doesn't block the event loop.
+    """
+
+    _options: CachedEmbeddingsOptions
+    _model: str
+    _dtype: type
+    _entries: OrderedDict[str, np.ndarray]
+    _db: Optional[sqlite3.Connection]
+    _executor: Optional[ThreadPoolExecutor]
+    _hits: int
+    _misses: int
+
+    def __init__(self, options: CachedEmbeddingsOptions) -> None:
+        """
+        Creates a new `CachedEmbeddings` instance.
+
+        Args:
+            options (CachedEmbeddingsOptions): Options for configuring the cache.
+
+        Raises:
+            ValueError: If no `model` is configured and it can't be read from the
+                wrapped embeddings model.
+        """
+        self._options = options
+        self._model = options.model or _get_model_name(options.embeddings)
+        self._dtype = np.float16 if options.float16 else np.float32
+        self._entries = OrderedDict()
+        self._db = None
+        self._executor = None
+        self._hits = 0
+        self._misses = 0
+
+        if options.path is not None:
+            # The database is opened by the worker thread the first time it's used
+            self._executor = ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix="CachedEmbeddings"
+            )
+
+    @property
+    def options(self) -> CachedEmbeddingsOptions:
+        """CachedEmbeddingsOptions: Options the cache was configured with."""
+        return self._options
+
+    @property
+    def hits(self) -> int:
+        """int: Number of texts whose embedding was returned from the cache."""
+        return self._hits
+
+    @property
+    def misses(self) -> int:
+        """int: Number of texts that were sent to the wrapped model."""
+        return self._misses
+
+    @property
+    def size(self) -> int:
+        """int: Number of embeddings kept in memory."""
+        return len(self._entries)
+
+    async def create_embeddings(
+        self, inputs: Union[str, List[str], List[int], List[List[int]]]
+    ) -> EmbeddingsResponse:
+        """
+        Creates embeddings for the given inputs, reusing cached embeddings.
+
+        Args:
+            inputs (Union[str, List[str],
+            List[int], List[List[int]]]): Text inputs to create embeddings for.
+
+        Returns:
+            EmbeddingsResponse: A status and embeddings/message when an error occurs.
+        """
+        if isinstance(inputs, str):
+            texts = [inputs]
+        elif len(inputs) > 0 and all(isinstance(text, str) for text in inputs):
+            texts = [str(text) for text in inputs]
+        else:
+            return await self._options.embeddings.create_embeddings(inputs)
+
+        keys = [self._get_key(text) for text in texts]
+        cached = await self._get(set(keys))
+
+        # Each text that isn't cached is sent once, even when it's repeated
+        misses: Dict[str, str] = {}
+        for key, text in zip(keys, texts):
+            if key not in cached and key not in misses:
+                misses[key] = text
+
+        created: Dict[str, np.ndarray] = {}
+        if len(misses) > 0:
+            res = await self._options.embeddings.create_embeddings(list(misses.values()))
+
+            if res.status != "success" or not isinstance(res.output, list):
+                return res
+
+            if len(res.output) != len(misses):
+                return EmbeddingsResponse(
+                    status="error",
+                    output=(
+                        f"[CachedEmbeddings]: expected {len(misses)} embeddings "
+                        f"but received {len(res.output)}"
+                    ),
+                )
+
+            created = await self._set(dict(zip(misses, res.output)))
+
+        self._hits += sum(1 for key in keys if key in cached)
+        self._misses += len(misses)
+
+        # Created embeddings are returned as stored, so a text always gets the same vector
+        cached.update(created)
+        return EmbeddingsResponse(status="success", output=[cached[key].tolist() for key in keys])
+
+    def clear(self) -> None:
+        """
+        Removes all embeddings from the cache, including the database, and resets the hit
+        and miss counts.
+        """
+        self._entries.clear()
+        self._hits = 0
+        self._misses = 0
+
+        if self._executor is not None:
+            self._executor.submit(self._delete).result()
+
+    def close(self) -> None:
+        """
+        Closes the database once the pending reads and writes are done. Embeddings kept in
+        memory are still returned.
+        """
+        if self._executor is not None:
+            self._executor.submit(self._disconnect).result()
+            self._executor.shutdown()
+            self._executor = None
+
+    async def _get(self, keys: Set[str]) -> Dict[str, np.ndarray]:
+        found: Dict[str, np.ndarray] = {}
+
+        for key in keys:
+            vector = self._entries.get(key)
+            if vector is not None:
+                self._entries.move_to_end(key)
+                found[key] = vector
+
+        missing = [key for key in keys if key not in found]
+        if self._executor is None or len(missing) == 0:
+            return found
+
+        loaded = await self._run(self._read, missing)
+
+        # Embeddings read from the database are promoted to the memory tier
+        self._put(loaded)
+        found.update(loaded)
+        return found
+
+    async def _set(self, embeddings: Dict[str, List[float]]) -> Dict[str, np.ndarray]:
+        vectors: Dict[str, np.ndarray] = {
+            key: np.asarray(embedding, dtype=self._dtype) for key, embedding in embeddings.items()
+        }
+        self._put(vectors)
+
+        if self._executor is not None:
+            dtype = np.dtype(self._dtype).name
+            rows = [(key, dtype, vector.tobytes()) for key, vector in vectors.items()]
+            await self._run(self._write, rows)
+
+        return vectors
+
+    def _put(self, vectors: Dict[str, np.ndarray]) -> None:
+        for key, vector in vectors.items():
+            self._entries[key] = vector
+            self._entries.move_to_end(key)
+
+        while len(self._entries) > self._options.max_size:
+            self._entries.popitem(last=False)
+
+    def _get_key(self, text: str) -> str:
+        return hashlib.sha256(f"{self._model}\0{text}".encode()).hexdigest()
+
+    async def _run(self, func: Callable[..., T], *args: Any) -> T:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, func, *args)
+
+    # The methods below are only called by the worker thread
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._db is None:
+            assert self._options.path is not None
+            self._db = sqlite3.connect(self._options.path)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("PRAGMA synchronous=NORMAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS embeddings "
+                "(key TEXT PRIMARY KEY, dtype TEXT NOT NULL, vector BLOB NOT NULL)"
+            )
+            self._db.commit()
+        return self._db
+
+    def _disconnect(self) -> None:
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+
+    def _read(self, keys: List[str]) -> Dict[str, np.ndarray]:
+        db = self._connect()
+        loaded: Dict[str, np.ndarray] = {}
+
+        for start in range(0, len(keys), _MAX_QUERY_KEYS):
+            batch = keys[start : start + _MAX_QUERY_KEYS]
+            rows = db.execute(
+                "SELECT key, dtype, vector FROM embeddings WHERE key IN"
+                f" ({','.join('?' * len(batch))})",
+                batch,
+            )
+            for key, dtype, vector in rows:
+                loaded[key] = np.frombuffer(vector, dtype=dtype)
+
+        return loaded
+
+    def _write(self, rows: List[Tuple[str, str, bytes]]) -> None:
+        db = self._connect()
+        db.executemany(
+            "INSERT OR REPLACE INTO embeddings (key, dtype, vector) VALUES (?, ?, ?)", rows
+        )
+        db.commit()
+
+    def _delete(self) -> None:
+        db = self._connect()
+        db.execute("DELETE FROM embeddings")
+        db.commit()
+
+
+# private
+def _get_model_name(embeddings: EmbeddingsModel) -> str:
+    if isinstance(embeddings, OpenAIEmbeddings):
+        return embeddings.options.model
+    if isinstance(embeddings, AzureOpenAIEmbeddings):
+        return embeddings.options.azure_deployment
+    raise ValueError(
+        "[CachedEmbeddings]: a model name is required to cache the embeddings of "
+        f"{type(embeddings).__name__}"
+    )
@@ -0,0 +1,39 @@
+"""
+Copyright (c) Microsoft Corporation. All rights reserved.
+Licensed under the MIT License.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Optional
+
+from teams.ai.embeddings.embeddings_model import EmbeddingsModel
+
+
+@dataclass
+class CachedEmbeddingsOptions:
+    """
+    Options for configuring a `CachedEmbeddings` model.
+    """
+
+    embeddings: EmbeddingsModel
+    "Model used to create the embeddings that aren't cached."
+
+    model: Optional[str] = None
+    """
+    Optional. Name of the model or deployment, which is part of the cache key. Defaults to the
+    model of an `OpenAIEmbeddings` or the deployment of an `AzureOpenAIEmbeddings`.
+    """
+
+    max_size: int = 4096
+    "Optional. Maximum number of embeddings kept in memory. Defaults to `4096`."
+
+    path: Optional[str] = None
+    "Optional. Path of a SQLite database that keeps embeddings across restarts."
+
+    float16: bool = False
+    """
+    Optional. Stores embeddings as float16 instead of float32, which halves their size but
+    rounds cached values to about 3 significant digits. Defaults to `False`.
+    """
@@ -0,0 +1,137 @@
+"""
+Copyright (c) Microsoft Corporation. All rights reserved.
+Licensed under the MIT License.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from typing import Awaitable, Callable, List, Optional, Set, Tuple
+
+from teams.ai.embeddings.embeddings_response import EmbeddingsResponse
+
+# private
+_Request = Tuple[List[str], "asyncio.Future[EmbeddingsResponse]"]
+
+
+# private
+class _EmbeddingsBatcher:
+    """
+    Merges the texts of concurrent `create_embeddings()` calls into shared requests.
+
+    Calls are collected for `window` seconds after the first one and then sent in as few
+    requests as the input-count and token limits allow. The texts of a call are never split
+    across requests. Calls are sized by their UTF-8 length, which is never less than their
+    token count, and only tokenized when that estimate doesn't fit the token limit. When a
+    shared request fails with an error, each call is retried on its own so that only the calls
+    with bad inputs get the error.
+    """
+
+    _send: Callable[[List[str]], Awaitable[EmbeddingsResponse]]
+    _count_tokens: Callable[[str], int]
+    _window: float
+    _max_size: int
+    _max_tokens: int
+    _pending: List[_Request]
+    _pending_size: int
+    _pending_tokens: int
+    _timer: Optional[asyncio.TimerHandle]
+    _tasks: Set[asyncio.Future[None]]
+
+    def __init__(
+        self,
+        send: Callable[[List[str]], Awaitable[EmbeddingsResponse]],
+        count_tokens: Callable[[str], int],
+        window: float,
+        max_size: int,
+        max_tokens: int,
+    ) -> None:
+        self._send = send
+        self._count_tokens = count_tokens
+        self._window = window
+        self._max_size = max_size
+        self._max_tokens = max_tokens
+        self._pending = []
+        self._pending_size = 0
+        self._pending_tokens = 0
+        self._timer = None
+        self._tasks = set()
+
+    async def create_embeddings(self, texts: List[str]) -> EmbeddingsResponse:
+        # Each token has at least one byte, so tokenizing is only needed near the limit
+        tokens = sum(len(text.encode("utf-8")) for text in texts)
+        if self._pending_tokens + tokens > self._max_tokens:
+            tokens = sum(self._count_tokens(text) for text in texts)
+
+        # Send what's pending first when this call doesn't fit in the same request
+        if self._pending and (
+            self._pending_size + len(texts) > self._max_size
+            or self._pending_tokens + tokens > self._max_tokens
+        ):
+            self._flush()
+
+        future: asyncio.Future[EmbeddingsResponse] = asyncio.get_running_loop().create_future()
+        self._pending.append((texts, future))
+        self._pending_size += len(texts)
+        self._pending_tokens += tokens
+
+        if self._pending_size >= self._max_size or self._pending_tokens >= self._max_tokens:
+            self._flush()
+        elif self._timer is None:
+            self._timer = asyncio.get_running_loop().call_later(self._window, self._flush)
+
+        return await future
+
+    def _flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        requests = self._pending
+        self._pending = []
+        self._pending_size = 0
+        self._pending_tokens = 0
+
+        if requests:
+            task = asyncio.ensure_future(self._send_batch(requests))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _send_batch(self, requests: List[_Request]) -> None:
+        try:
+            texts = [text for request in requests for text in request[0]]
+            res = await self._send(texts)
+
+            if res.status == "error" and len(requests) > 1:
+                results = await asyncio.gather(
+                    *(self._send(request[0]) for request in requests), return_exceptions=True
+                )
+                for (_, future), result in zip(requests, results):
+                    if isinstance(result, BaseException):
+                        if not future.done():
+                            future.set_exception(result)
+                    else:
+                        _resolve(future, result)
+                return
+
+            start = 0
+            for request_texts, future in requests:
+                if res.status == "success" and isinstance(res.output, list):
+                    end = start + len(request_texts)
+                    _resolve(
+                        future, EmbeddingsResponse(status="success", output=res.output[start:end])
+                    )
+                    start = end
+                else:
+                    _resolve(future, EmbeddingsResponse(res.status, res.output, res.message))
+        except Exception as err:  # pylint: disable=broad-except
+            for _, future in requests:
+                if not future.done():
+                    future.set_exception(err)
+
+
+# private
+def _resolve(future: asyncio.Future[EmbeddingsResponse], res: EmbeddingsResponse) -> None:
+    # The caller may have been cancelled while the request was in flight
+    if not future.done():
+        future.set_result(res)
@@ -9,13 +9,15 @@ import asyncio
 from datetime import datetime
 from logging import Logger
 from operator import attrgetter
-from typing import List, Union
+from typing import List, Optional, Union, cast
 
 import openai
 
+from teams.ai.embeddings.embeddings_batcher import _EmbeddingsBatcher
 from teams.ai.embeddings.embeddings_model import EmbeddingsModel
 from teams.ai.embeddings.embeddings_response import EmbeddingsResponse
 from teams.ai.embeddings.openai_embeddings_options import OpenAIEmbeddingsOptions
+from teams.ai.tokenizers import GPTTokenizer
 
 
 class OpenAIEmbeddings(EmbeddingsModel):
@@ -24,6 +26,7 @@ class OpenAIEmbeddings(EmbeddingsModel):
     """
 
     _log: Logger
+    _batcher: Optional[_EmbeddingsBatcher]
 
     options: OpenAIEmbeddingsOptions
     "Options the client was configured with."
@@ -42,6 +45,17 @@ class OpenAIEmbeddings(EmbeddingsModel):
         if not self.options.retry_policy:
             self.options.retry_policy = [2, 5]
 
+        self._batcher = None
+        if self.options.batch_window is not None:
+            tokenizer = GPTTokenizer.for_model(self.options.model)
+            self._batcher = _EmbeddingsBatcher(
+                self._create_embeddings,
+                tokenizer.count_tokens,
+                self.options.batch_window,
+                self.options.max_batch_size,
+                self.options.max_batch_tokens,
+            )
+
     async def create_embeddings(
         self, inputs: Union[str, List[str], List[int], List[List[int]]], retry_count=0
     ) -> EmbeddingsResponse:
@@ -55,6 +69,19 @@ class OpenAIEmbeddings(EmbeddingsModel):
             EmbeddingsResponse: A status and embeddings/message when an error occurs.
         """
 
+        # Only text inputs can be merged into a shared request
+        if self._batcher is not None and retry_count == 0:
+            if isinstance(inputs, str):
+                return await self._batcher.create_embeddings([inputs])
+            if len(inputs) > 0 and all(isinstance(text, str) for text in inputs):
+                return await self._batcher.create_embeddings(cast(List[str], inputs))
+
+        return await self._create_embeddings(inputs, retry_count)
+
+    async def _create_embeddings(
+        self, inputs: Union[str, List[str], List[int], List[List[int]]], retry_count=0
+    ) -> EmbeddingsResponse:
+
         if self.options.log_requests:
             self._log.info("Embeddings REQUEST: inputs=%s", inputs)
 
@@ -94,7 +121,7 @@ class OpenAIEmbeddings(EmbeddingsModel):
                 if retry_count < len(self.options.retry_policy):
                     delay = self.options.retry_policy[retry_count]
                     await asyncio.sleep(delay)
-                    return await self.create_embeddings(inputs, retry_count + 1)
+                    return await self._create_embeddings(inputs, retry_count + 1)
             return EmbeddingsResponse(
                 status="rate_limited", output="The embeddings API returned a rate limit error."
             )
@@ -13,7 +13,7 @@ from .chat_completion_action import ChatCompletionAction
 from .openai_model import AzureOpenAIModelOptions, OpenAIModel, OpenAIModelOptions
 from .prompt_completion_model import PromptCompletionModel
 from .prompt_completion_model_emitter import PromptCompletionModelEmitter
-from .prompt_response import PromptResponse, PromptResponseStatus
+from .prompt_response import PromptResponse, PromptResponseStatus, PromptUsage
 
 __all__ = [
     "ChatCompletionAction",
@@ -23,6 +23,7 @@ __all__ = [
     "PromptCompletionModel",
     "PromptResponse",
     "PromptResponseStatus",
+    "PromptUsage",
     "PromptCompletionModelEmitter",
     "BeforeCompletionHandler",
     "ChunkReceivedHandler",
@@ -26,7 +26,7 @@ from ..prompts.prompt_template import PromptTemplate
 from ..tokenizers import Tokenizer
 from .prompt_completion_model import PromptCompletionModel
 from .prompt_completion_model_emitter import PromptCompletionModelEmitter
-from .prompt_response import PromptResponse
+from .prompt_response import PromptResponse, PromptUsage
 
 
 @dataclass
@@ -224,6 +224,7 @@ class OpenAIModel(PromptCompletionModel):
 
         if self._options.logger is not None:
             self._options.logger.debug(f"PROMPT:\n{res.output}")
+            self._options.logger.debug("PROMPT PREFIX HASH: %s", res.prefix_hash)
 
         messages: List[chat.ChatCompletionMessageParam]
         messages = self._map_messages(res.output, is_o1_model)
@@ -353,6 +354,7 @@ class OpenAIModel(PromptCompletionModel):
 
             return PromptResponse[str](
                 input=input,
+                usage=self._get_usage(completion, res.prefix_hash),
                 message=Message(
                     role=completion.choices[0].message.role,
                     content=completion.choices[0].message.content,
@@ -376,6 +378,30 @@ class OpenAIModel(PromptCompletionModel):
                 """,
             )
 
+    def _get_usage(
+        self, completion: chat.ChatCompletion, prefix_hash: Optional[str]
+    ) -> Optional[PromptUsage]:
+        if completion.usage is None:
+            return None
+
+        details = completion.usage.prompt_tokens_details
+        cached_tokens = details.cached_tokens if details and details.cached_tokens else 0
+
+        if self._options.logger is not None:
+            self._options.logger.debug(
+                "USAGE: %s prompt tokens (%s cached), %s completion tokens",
+                completion.usage.prompt_tokens,
+                cached_tokens,
+                completion.usage.completion_tokens,
+            )
+
+        return PromptUsage(
+            prompt_tokens=completion.usage.prompt_tokens,
+            completion_tokens=completion.usage.completion_tokens,
+            cached_tokens=cached_tokens,
+            prefix_hash=prefix_hash,
+        )
+
     def _map_messages(self, msgs: List[Message], is_o1_model: bool):
         output = []
         for msg in msgs:
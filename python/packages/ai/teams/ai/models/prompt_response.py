@@ -14,6 +14,33 @@ ContentT = TypeVar("ContentT")
 PromptResponseStatus = Literal["success", "error", "rate_limited", "invalid_response", "too_long"]
 
 
+@dataclass
+class PromptUsage:
+    """
+    Token usage reported by the model for a prompt completion.
+    """
+
+    prompt_tokens: int = 0
+    """
+    Number of tokens in the prompt.
+    """
+
+    completion_tokens: int = 0
+    """
+    Number of tokens in the generated completion.
+    """
+
+    cached_tokens: int = 0
+    """
+    Number of prompt tokens that were served from the providers prompt cache.
+    """
+
+    prefix_hash: Optional[str] = None
+    """
+    Hash of the prompts stable prefix. Requests sharing a hash are candidates for prompt caching.
+    """
+
+
 @dataclass
 class PromptResponse(Generic[ContentT]):
     """
@@ -39,3 +66,8 @@ class PromptResponse(Generic[ContentT]):
     """
     Error returned.
     """
+
+    usage: Optional[PromptUsage] = None
+    """
+    Token usage reported by the model. `None` if the model didn't report usage.
+    """
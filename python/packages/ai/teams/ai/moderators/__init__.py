@@ -8,6 +8,7 @@ from .azure_content_safety_moderator import (
     AzureContentSafetyModeratorOptions,
 )
 from .default_moderator import DefaultModerator
+from .moderation_cache import ModerationCache
 from .moderator import Moderator
 from .openai_moderator import OpenAIModerator, OpenAIModeratorOptions
 
@@ -15,6 +16,7 @@ __all__ = [
     "AzureContentSafetyModerator",
     "AzureContentSafetyModeratorOptions",
     "DefaultModerator",
+    "ModerationCache",
     "Moderator",
     "OpenAIModerator",
     "OpenAIModeratorOptions",
@@ -5,13 +5,19 @@ Licensed under the MIT License.
 
 from __future__ import annotations
 
+import asyncio
 from dataclasses import dataclass, field
-from typing import Dict, Generic, List, Optional, TypeVar, Union
+from typing import Any, Dict, Generic, List, Optional, TypeVar, Union
 
+import aiohttp
 import azure.ai.contentsafety
+import azure.ai.contentsafety.aio
 from azure.ai.contentsafety import models
 from azure.core.credentials import AzureKeyCredential
 from azure.core.exceptions import HttpResponseError
+from azure.core.pipeline.transport import (  # pylint: disable=no-name-in-module
+    AioHttpTransport,
+)
 from botbuilder.core import TurnContext
 
 from ...app_error import ApplicationError
@@ -58,15 +64,38 @@ class AzureContentSafetyModeratorOptions(OpenAIModeratorOptions):
      Default value is false.
      """
 
+    session: Optional[aiohttp.ClientSession] = None
+    """
+    Optional. Session used to send requests, which can be shared with other clients.
+    Defaults to a session owned by the moderator which is closed by `close()`.
+    """
+
+    use_thread_pool: bool = False
+    """
+    Optional. When true, requests are sent with the sync client from a thread pool instead of
+    the async client. Defaults to false.
+    """
+
+    max_concurrency: int = 4
+    "Optional. Maximum number of requests the moderator sends at once. Defaults to `4`."
+
 
 class AzureContentSafetyModerator(Generic[StateT], Moderator[StateT]):
     """
     An Azure OpenAI moderator that uses OpenAI's moderation API
     to review prompts and plans for safety.
+
+    The distinct responses of the `SAY` commands in a plan are reviewed concurrently, with at
+    most `max_concurrency` requests in flight.
+
+    Requests are sent with the async Content Safety client so they don't block the event loop,
+    or with the sync client from a thread pool when `use_thread_pool` is set.
     """
 
     _options: AzureContentSafetyModeratorOptions
-    _client: azure.ai.contentsafety.ContentSafetyClient
+    _client: Optional[azure.ai.contentsafety.aio.ContentSafetyClient] = None
+    _sync_client: Optional[azure.ai.contentsafety.ContentSafetyClient] = None
+    _semaphore: Optional[asyncio.Semaphore] = None
 
     @property
     def options(self) -> AzureContentSafetyModeratorOptions:
@@ -86,11 +115,33 @@ class AzureContentSafetyModerator(Generic[StateT], Moderator[StateT]):
             )
 
         self._options = options
-        self._client = azure.ai.contentsafety.ContentSafetyClient(
-            endpoint=options.endpoint,
-            api_version=options.api_version,
-            credential=AzureKeyCredential(options.api_key),
-        )
+
+        if not options.use_thread_pool:
+            self._client = azure.ai.contentsafety.aio.ContentSafetyClient(
+                endpoint=options.endpoint,
+                api_version=options.api_version,
+                credential=AzureKeyCredential(options.api_key),
+                **(
+                    {"transport": AioHttpTransport(session=options.session, session_owner=False)}
+                    if options.session is not None
+                    else {}
+                ),
+            )
+        else:
+            self._sync_client = azure.ai.contentsafety.ContentSafetyClient(
+                endpoint=options.endpoint,
+                api_version=options.api_version,
+                credential=AzureKeyCredential(options.api_key),
+            )
+
+    async def close(self) -> None:
+        """
+        Closes the client. A session passed in the options is left open.
+        """
+        if self._client is not None:
+            await self._client.close()
+        if self._sync_client is not None:
+            self._sync_client.close()
 
     async def review_input(self, context: TurnContext, state: StateT) -> Optional[Plan]:
         if self._options.moderate == "output":
@@ -99,45 +150,7 @@ class AzureContentSafetyModerator(Generic[StateT], Moderator[StateT]):
         input = state.temp.input if state.temp.input != "" else context.activity.text
 
         try:
-            res = self._client.analyze_text(
-                options=models.AnalyzeTextOptions(
-                    text=input,
-                    categories=self._options.categories,
-                    blocklist_names=self._options.blocklist_names,
-                    halt_on_blocklist_hit=self._options.halt_on_blocklist_hit,
-                )
-            )
-
-            flagged: bool = False
-            categories: Dict[str, bool] = {}
-            category_scores: Dict[str, int] = {}
-
-            categories_analysis = res["categoriesAnalysis"]
-
-            for result in categories_analysis:
-                category = result["category"].lower()
-                if category == "selfharm":
-                    category = "self_harm"
-                categories[category] = result["severity"] is not None and result["severity"] > 0
-                category_scores[category] = 0 if result["severity"] is None else result["severity"]
-                if result["severity"] is not None and result["severity"] > 0:
-                    flagged = True
-            return (
-                None
-                if not flagged
-                else Plan(
-                    commands=[
-                        PredictedDoCommand(
-                            action=ActionTypes.FLAGGED_INPUT,
-                            parameters={
-                                "flagged": flagged,
-                                "categories": categories,
-                                "category_scores": category_scores,
-                            },
-                        )
-                    ]
-                )
-            )
+            result = await self._analyze_text(input)
         except HttpResponseError as err:
             return Plan(
                 commands=[
@@ -145,64 +158,88 @@ class AzureContentSafetyModerator(Generic[StateT], Moderator[StateT]):
                 ]
             )
 
+        if not result["flagged"]:
+            return None
+
+        return Plan(
+            commands=[PredictedDoCommand(action=ActionTypes.FLAGGED_INPUT, parameters=result)]
+        )
+
     async def review_output(self, context: TurnContext, state: StateT, plan: Plan) -> Plan:
         if self._options.moderate == "input":
             return plan
 
-        for cmd in plan.commands:
-            if isinstance(cmd, PredictedSayCommand):
-                try:
-                    res = self._client.analyze_text(
-                        options=models.AnalyzeTextOptions(
-                            text=(
-                                cmd.response.content
-                                if cmd.response and cmd.response.content is not None
-                                else ""
-                            ),
-                            categories=self._options.categories,
-                            blocklist_names=self._options.blocklist_names,
-                            halt_on_blocklist_hit=self._options.halt_on_blocklist_hit,
-                        )
-                    )
-
-                    flagged: bool = False
-                    categories: Dict[str, bool] = {}
-                    category_scores: Dict[str, int] = {}
-
-                    categories_analysis = res["categoriesAnalysis"]
-
-                    for result in categories_analysis:
-                        category = result["category"].lower()
-                        if category == "selfharm":
-                            category = "self_harm"
-                        categories[category] = (
-                            result["severity"] is not None and result["severity"] > 0
-                        )
-                        category_scores[category] = (
-                            0 if result["severity"] is None else result["severity"]
-                        )
-                        if result["severity"] is not None and result["severity"] > 0:
-                            flagged = True
-
-                    if flagged:
-                        return Plan(
-                            commands=[
-                                PredictedDoCommand(
-                                    action=ActionTypes.FLAGGED_OUTPUT,
-                                    parameters={
-                                        "flagged": flagged,
-                                        "categories": categories,
-                                        "category_scores": category_scores,
-                                    },
-                                )
-                            ]
-                        )
-                except HttpResponseError as err:
-                    return Plan(
-                        commands=[
-                            PredictedDoCommand(
-                                action=ActionTypes.HTTP_ERROR, parameters=err.__dict__
-                            )
-                        ]
-                    )
+        # Each distinct text is reviewed once
+        texts: List[str] = list(
+            dict.fromkeys(
+                cmd.response.content if cmd.response and cmd.response.content is not None else ""
+                for cmd in plan.commands
+                if isinstance(cmd, PredictedSayCommand)
+            )
+        )
+
+        try:
+            results = await asyncio.gather(*(self._analyze_text(text) for text in texts))
+        except HttpResponseError as err:
+            return Plan(
+                commands=[
+                    PredictedDoCommand(action=ActionTypes.HTTP_ERROR, parameters=err.__dict__)
+                ]
+            )
+
+        for result in results:
+            if result["flagged"]:
+                return Plan(
+                    commands=[
+                        PredictedDoCommand(action=ActionTypes.FLAGGED_OUTPUT, parameters=result)
+                    ]
+                )
         return plan
+
+    async def _analyze_text(self, text: str) -> Dict[str, Any]:
+        cache = self._options.cache
+        model = (
+            f"{self._options.endpoint}\0{self._options.api_version}\0{self._options.categories}"
+            f"\0{self._options.blocklist_names}\0{self._options.halt_on_blocklist_hit}"
+        )
+
+        if cache is not None:
+            cached = cache.get(text, model)
+            if cached is not None:
+                return cached
+
+        options = models.AnalyzeTextOptions(
+            text=text,
+            categories=self._options.categories,
+            blocklist_names=self._options.blocklist_names,
+            halt_on_blocklist_hit=self._options.halt_on_blocklist_hit,
+        )
+
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self._options.max_concurrency)
+
+        async with self._semaphore:
+            if self._client is not None:
+                res = await self._client.analyze_text(options=options)
+            else:
+                # Keep the sync client off the event loop
+                client = self._sync_client
+                assert client is not None
+                loop = asyncio.get_running_loop()
+                res = await loop.run_in_executor(None, lambda: client.analyze_text(options=options))
+
+        flagged: bool = False
+        categories: Dict[str, bool] = {}
+        category_scores: Dict[str, int] = {}
+
+        for result in res["categoriesAnalysis"]:
+            category = result["category"].lower()
+            if category == "selfharm":
+                category = "self_harm"
+            categories[category] = result["severity"] is not None and result["severity"] > 0
+            category_scores[category] = 0 if result["severity"] is None else result["severity"]
+            if result["severity"] is not None and result["severity"] > 0:
+                flagged = True
+
+        result = {"flagged": flagged, "categories": categories, "category_scores": category_scores}
+        return cache.set(text, model, result) if cache is not None else result
@@ -0,0 +1,171 @@
+"""
+Copyright (c) Microsoft Corporation. All rights reserved.
+Licensed under the MIT License.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import re
+import time
+import unicodedata
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+
+class ModerationCache:
+    """
+    A bounded cache of moderation results with a time to live.
+
+    Results are keyed by a hash of the normalized text and the model (or analysis options)
+    used to moderate it, so the same cache can be shared by `review_input`, `review_output`
+    and multiple moderators.
+
+    The cache stores the category scores returned by the service. The per-category
+    `thresholds` policy is applied each time a result is read, so changing a threshold
+    re-evaluates cached results without moderating their texts again.
+    """
+
+    _max_size: int
+    _ttl: float
+    _thresholds: Dict[str, float]
+    _entries: OrderedDict[str, Tuple[float, Dict[str, Any]]]
+    _hits: int
+    _misses: int
+
+    def __init__(
+        self,
+        max_size: int = 1024,
+        ttl: float = 3600,
+        thresholds: Optional[Dict[str, float]] = None,
+    ) -> None:
+        """
+        Creates a new `ModerationCache` instance.
+
+        Args:
+            max_size (int, optional): Maximum number of results to keep. The least recently
+                used results are evicted first. Defaults to `1024`.
+            ttl (float, optional): Number of seconds results are kept for. Defaults to `3600`.
+            thresholds (Optional[Dict[str, float]], optional): Scores at or above which a
+                category is flagged, like `{"hate": 0.5}`. Categories without a threshold
+                use the service's verdict. Defaults to none.
+        """
+        self._max_size = max_size
+        self._ttl = ttl
+        self._thresholds = thresholds if thresholds is not None else {}
+        self._entries = OrderedDict()
+        self._hits = 0
+        self._misses = 0
+
+    @property
+    def thresholds(self) -> Dict[str, float]:
+        """Dict[str, float]: The per-category thresholds applied to results."""
+        return self._thresholds
+
+    @property
+    def hits(self) -> int:
+        """int: Number of lookups that returned a cached result."""
+        return self._hits
+
+    @property
+    def misses(self) -> int:
+        """int: Number of lookups that didn't find a cached result."""
+        return self._misses
+
+    @property
+    def size(self) -> int:
+        """int: Number of results in the cache, including expired ones not yet evicted."""
+        return len(self._entries)
+
+    def get(self, text: str, model: str) -> Optional[Dict[str, Any]]:
+        """
+        Gets the cached result for a text.
+
+        Args:
+            text (str): The moderated text.
+            model (str): The model or analysis options used to moderate the text.
+
+        Returns:
+            Optional[Dict[str, Any]]: The result with the `thresholds` policy applied, or
+                `None` when the text isn't cached or its result has expired.
+        """
+        key = self._get_key(text, model)
+        entry = self._entries.get(key)
+
+        if entry is not None and entry[0] <= time.monotonic():
+            del self._entries[key]
+            entry = None
+
+        if entry is None:
+            self._misses += 1
+            return None
+
+        self._hits += 1
+        self._entries.move_to_end(key)
+        return self.evaluate(entry[1])
+
+    def set(self, text: str, model: str, result: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Caches the result for a text.
+
+        Args:
+            text (str): The moderated text.
+            model (str): The model or analysis options used to moderate the text.
+            result (Dict[str, Any]): The result returned by the service, with `flagged`,
+                `categories` and `category_scores` entries.
+
+        Returns:
+            Dict[str, Any]: The result with the `thresholds` policy applied.
+        """
+        key = self._get_key(text, model)
+        self._entries[key] = (time.monotonic() + self._ttl, result)
+        self._entries.move_to_end(key)
+
+        while len(self._entries) > self._max_size:
+            self._entries.popitem(last=False)
+
+        return self.evaluate(result)
+
+    def evaluate(self, result: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Applies the `thresholds` policy to a result.
+
+        Args:
+            result (Dict[str, Any]): The result returned by the service.
+
+        Returns:
+            Dict[str, Any]: A copy of the result with `categories` and `flagged` updated for
+                the categories that have a threshold.
+        """
+        scores = result["category_scores"]
+        thresholds = {
+            category: threshold
+            for category, threshold in self._thresholds.items()
+            if scores.get(category) is not None
+        }
+
+        if len(thresholds) == 0:
+            return dict(result)
+
+        categories = dict(result["categories"])
+        for category, threshold in thresholds.items():
+            categories[category] = scores[category] >= threshold
+
+        return {
+            **result,
+            "flagged": any(categories.values()),
+            "categories": categories,
+        }
+
+    def clear(self) -> None:
+        """
+        Removes all results from the cache and resets the hit and miss counts.
+        """
+        self._entries.clear()
+        self._hits = 0
+        self._misses = 0
+
+    def _get_key(self, text: str, model: str) -> str:
+        # Normalize unicode forms and whitespace so trivially different texts share a result
+        normalized = re.sub(r"\s+", " ", unicodedata.normalize("NFKC", text or "")).strip()
+        return hashlib.sha256(f"{model}\0{normalized}".encode()).hexdigest()
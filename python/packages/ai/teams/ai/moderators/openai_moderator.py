@@ -5,8 +5,9 @@ Licensed under the MIT License.
 
 from __future__ import annotations
 
+import asyncio
 from dataclasses import dataclass
-from typing import Generic, Literal, Optional, TypeVar
+from typing import Any, Dict, Generic, List, Literal, Optional, TypeVar
 
 import openai
 from botbuilder.core import TurnContext
@@ -14,10 +15,15 @@ from botbuilder.core import TurnContext
 from ...state import TurnState
 from ..actions import ActionTypes
 from ..planners.plan import Plan, PredictedDoCommand, PredictedSayCommand
+from .moderation_cache import ModerationCache
 from .moderator import Moderator
 
 StateT = TypeVar("StateT", bound=TurnState)
 
+# private
+# Maximum number of texts to send in a single moderation request.
+_MAX_BATCH_SIZE = 32
+
 
 @dataclass
 class OpenAIModeratorOptions:
@@ -40,10 +46,15 @@ class OpenAIModeratorOptions:
     model: str = "text-moderation-latest"
     "Optional. OpenAI model to use. Default: text-moderation-latest"
 
+    cache: Optional[ModerationCache] = None
+    "Optional. Cache used to reuse the results of texts that were already moderated."
+
 
 class OpenAIModerator(Generic[StateT], Moderator[StateT]):
     """
     A moderator that uses OpenAI's moderation API to review prompts and plans for safety.
+
+    The responses of all `SAY` commands in a plan are reviewed together in batched requests.
     """
 
     _options: OpenAIModeratorOptions
@@ -83,18 +94,7 @@ class OpenAIModerator(Generic[StateT], Moderator[StateT]):
         input = state.temp.input if state.temp.input != "" else context.activity.text
 
         try:
-            res = await self._client.moderations.create(input=input, model=self._options.model)
-
-            for result in res.results:
-                if result.flagged:
-                    return Plan(
-                        commands=[
-                            PredictedDoCommand(
-                                action=ActionTypes.FLAGGED_INPUT, parameters=result.model_dump()
-                            )
-                        ]
-                    )
-            return None
+            results = await self._moderate([input])
         except openai.APIError as err:
             return Plan(
                 commands=[
@@ -102,34 +102,70 @@ class OpenAIModerator(Generic[StateT], Moderator[StateT]):
                 ]
             )
 
+        for result in results:
+            if result["flagged"]:
+                return Plan(
+                    commands=[
+                        PredictedDoCommand(action=ActionTypes.FLAGGED_INPUT, parameters=result)
+                    ]
+                )
+        return None
+
     async def review_output(self, context: TurnContext, state: StateT, plan: Plan) -> Plan:
         if self._options.moderate == "input":
             return plan
 
-        for cmd in plan.commands:
-            if isinstance(cmd, PredictedSayCommand):
-                try:
-                    res = await self._client.moderations.create(
-                        input=cmd.response.content if cmd.response and cmd.response.content else "",
-                        model=self._options.model,
-                    )
-
-                    for result in res.results:
-                        if result.flagged:
-                            return Plan(
-                                commands=[
-                                    PredictedDoCommand(
-                                        action=ActionTypes.FLAGGED_OUTPUT,
-                                        parameters=result.model_dump(),
-                                    )
-                                ]
-                            )
-                except openai.APIError as err:
-                    return Plan(
-                        commands=[
-                            PredictedDoCommand(
-                                action=ActionTypes.HTTP_ERROR, parameters=err.__dict__
-                            )
-                        ]
-                    )
+        texts: List[str] = [
+            cmd.response.content
+            for cmd in plan.commands
+            if isinstance(cmd, PredictedSayCommand) and cmd.response and cmd.response.content
+        ]
+
+        if len(texts) == 0:
+            return plan
+
+        try:
+            results = await self._moderate(texts)
+        except openai.APIError as err:
+            return Plan(
+                commands=[
+                    PredictedDoCommand(action=ActionTypes.HTTP_ERROR, parameters=err.__dict__)
+                ]
+            )
+
+        for result in results:
+            if result["flagged"]:
+                return Plan(
+                    commands=[
+                        PredictedDoCommand(action=ActionTypes.FLAGGED_OUTPUT, parameters=result)
+                    ]
+                )
         return plan
+
+    async def _moderate(self, texts: List[str]) -> List[Dict[str, Any]]:
+        cache = self._options.cache
+        model = self._options.model
+        cached = [cache.get(text, model) if cache else None for text in texts]
+
+        # Moderate each text that isn't cached once
+        pending = list(dict.fromkeys(text for text, res in zip(texts, cached) if res is None))
+
+        # Results are returned in the same order as the texts of each batch
+        responses = await asyncio.gather(
+            *(
+                self._client.moderations.create(input=pending[i : i + _MAX_BATCH_SIZE], model=model)
+                for i in range(0, len(pending), _MAX_BATCH_SIZE)
+            )
+        )
+
+        moderated: Dict[str, Dict[str, Any]] = {}
+        for text, result in zip(pending, (result for res in responses for result in res.results)):
+            parameters = result.model_dump()
+            moderated[text] = cache.set(text, model, parameters) if cache else parameters
+
+        results: List[Dict[str, Any]] = []
+        for text, res in zip(texts, cached):
+            res = res if res is not None else moderated.get(text)
+            if res is not None:
+                results.append(res)
+        return results
@@ -15,6 +15,7 @@ from .assistants_planner import (
 )
 from .plan import Plan, PredictedCommand, PredictedDoCommand, PredictedSayCommand
 from .planner import Planner
+from .streaming_plan import StreamingPlan
 
 __all__ = [
     "ActionPlanner",
@@ -28,4 +29,5 @@ __all__ = [
     "PredictedDoCommand",
     "PredictedSayCommand",
     "Planner",
+    "StreamingPlan",
 ]
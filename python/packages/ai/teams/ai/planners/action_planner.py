@@ -5,26 +5,31 @@ Licensed under the MIT License.
 
 from __future__ import annotations
 
+import asyncio
 from dataclasses import dataclass, field
 from logging import Logger
-from typing import Awaitable, Callable, List, Optional, TypeVar, Union
+from typing import Any, Awaitable, Callable, List, Optional, TypeVar, Union
 
 from botbuilder.core import TurnContext
 
 from ...app_error import ApplicationError
 from ...state import MemoryBase, TurnState
+from ..augmentations.augmentation import Augmentation
+from ..augmentations.command_stream import CommandStream
 from ..augmentations.default_augmentation import DefaultAugmentation
 from ..clients import LLMClient, LLMClientOptions
-from ..models import ResponseReceivedHandler
+from ..models import OpenAIModel, ResponseReceivedHandler, StreamHandlerTypes
 from ..models.prompt_completion_model import PromptCompletionModel
 from ..models.prompt_response import PromptResponse
+from ..prompts.message import MessageContext
 from ..prompts.prompt_functions import PromptFunctions
 from ..prompts.prompt_manager import PromptManager
 from ..prompts.prompt_template import PromptTemplate
 from ..tokenizers import GPTTokenizer, Tokenizer
 from ..validators import DefaultResponseValidator, PromptResponseValidator
-from .plan import Plan
+from .plan import Plan, PredictedCommand, PredictedDoCommand, PredictedSayCommand
 from .planner import Planner
+from .streaming_plan import StreamingPlan
 
 ActionPlannerPromptFactory = Callable[
     [TurnContext, TurnState, "ActionPlanner"], Awaitable[PromptTemplate]
@@ -51,8 +56,12 @@ class ActionPlannerOptions:
     max_repair_attempts: int = 3
     "Maximum number of repair attempts to make. Defaults to `3`"
 
-    tokenizer: Tokenizer = field(default_factory=GPTTokenizer)
-    "Optional tokenizer to use. Defaults to `GPTTokenizer`"
+    tokenizer: Tokenizer = field(default_factory=lambda: GPTTokenizer.for_model(None))
+    """
+    Optional tokenizer to use. Defaults to the shared `GPTTokenizer`, in which case the shared
+    `GPTTokenizer` for the model configured by the prompt (or the model's default model) is
+    used instead.
+    """
 
     logger: Optional[Logger] = None
     "Optional. When set the model will log requests"
@@ -66,6 +75,15 @@ class ActionPlannerOptions:
     enable_feedback_loop: Optional[bool] = False
     "Optional. Enables the Teams thumbs up or down buttons."
 
+    stream_plans: bool = False
+    """
+    Optional. When True, streamed responses for augmentations that support it, like the
+    `sequence` and `monologue` augmentations, return a `StreamingPlan` whose commands are
+    added as soon as each of them is complete. The text of those responses isn't streamed to
+    the user. When a response is repaired into commands that differ from the ones already
+    streamed, the plan ends with an `ApplicationError`. Defaults to `False`
+    """
+
 
 class ActionPlanner(Planner[StateT]):
     """
@@ -102,11 +120,23 @@ class ActionPlanner(Planner[StateT]):
     async def continue_task(self, context: TurnContext, state: TurnState) -> Plan:
         template = await self._prompt_factory(context, state, self)
         augmentation = template.augmentation or DefaultAugmentation()
+        stream = augmentation.create_command_stream() if self._options.stream_plans else None
+
+        if stream is not None and self._options.model.events is not None:
+            return await self._stream_plan(context, state, template, augmentation, stream)
 
         res = await self.complete_prompt(
             context=context, memory=state, prompt=template, validator=augmentation
         )
+        return await self._create_plan(context, state, augmentation, res)
 
+    async def _create_plan(
+        self,
+        context: TurnContext,
+        state: TurnState,
+        augmentation: Augmentation,
+        res: PromptResponse[str],
+    ) -> Plan:
         if res.status != "success":
             raise ApplicationError(res.error or "[ActionPlanner]: failed task")
 
@@ -134,6 +164,16 @@ class ActionPlanner(Planner[StateT]):
             validator (Validator): Optional. A validator to use to validate
                 the response returned by the model.
         """
+        return await self._complete_prompt(context, memory, prompt, validator, True)
+
+    async def _complete_prompt(
+        self,
+        context: TurnContext,
+        memory: MemoryBase,
+        prompt: Union[str, PromptTemplate],
+        validator: PromptResponseValidator,
+        stream_text: bool,
+    ) -> PromptResponse[str]:
         name = ""
 
         if isinstance(prompt, str):
@@ -158,6 +198,7 @@ class ActionPlanner(Planner[StateT]):
                 start_streaming_message=self._options.start_streaming_message,
                 end_stream_handler=self._options.end_stream_handler,
                 enable_feedback_loop=self._enable_feedback_loop,
+                stream_text=stream_text,
             )
         )
 
@@ -165,10 +206,110 @@ class ActionPlanner(Planner[StateT]):
             context=context,
             memory=memory,
             functions=self._options.prompts,
-            tokenizer=self._options.tokenizer,
+            tokenizer=self._get_tokenizer(template),
             template=template,
         )
 
+    async def _stream_plan(
+        self,
+        context: TurnContext,
+        state: TurnState,
+        template: PromptTemplate,
+        augmentation: Augmentation,
+        stream: CommandStream,
+    ) -> Plan:
+        events = self._options.model.events
+        assert events is not None
+
+        plan = StreamingPlan()
+        tokenizer = self._get_tokenizer(template)
+        chunks: asyncio.Queue[Optional[str]] = asyncio.Queue()
+        attempts = 0
+        # Citations of the response arrive with its chunks
+        message_context: Optional[MessageContext] = None
+
+        def before_completion(ctx: TurnContext, *_args: Any) -> None:
+            # The other arguments are the memory, functions, tokenizer, template and streaming
+            nonlocal attempts
+            if ctx == context:
+                attempts += 1
+
+        def chunk_received(ctx: TurnContext, _memory: MemoryBase, chunk: Any) -> None:
+            # The chunk is a `PromptChunk`
+            # Repaired responses are only used once they're complete
+            nonlocal message_context
+            if ctx != context or attempts > 1:
+                return
+
+            if chunk.delta and chunk.delta.context:
+                message_context = chunk.delta.context
+
+            if chunk.delta and chunk.delta.content:
+                chunks.put_nowait(chunk.delta.content)
+
+        async def parse() -> None:
+            while True:
+                text = await chunks.get()
+                if text is None:
+                    return
+
+                for command in await stream.write(context, state, tokenizer, text):
+                    if isinstance(command, PredictedSayCommand) and command.response:
+                        command.response.context = command.response.context or message_context
+                    plan.add_command(command)
+
+        async def complete() -> None:
+            try:
+                res = await self._complete_prompt(context, state, template, augmentation, False)
+                chunks.put_nowait(None)
+                await parsing
+
+                if res.message is not None and res.message.context is None:
+                    res.message.context = message_context
+                final = await self._create_plan(context, state, augmentation, res)
+                self._end_plan(plan, final)
+            except Exception as err:  # pylint: disable=broad-except
+                plan.end(err)
+            finally:
+                events.unsubscribe(StreamHandlerTypes.BEFORE_COMPLETION, before_completion)
+                events.unsubscribe(StreamHandlerTypes.CHUNK_RECEIVED, chunk_received)
+
+        events.subscribe(StreamHandlerTypes.BEFORE_COMPLETION, before_completion)
+        events.subscribe(StreamHandlerTypes.CHUNK_RECEIVED, chunk_received)
+        parsing = asyncio.ensure_future(parse())
+        plan.add_task(parsing)
+        plan.add_task(asyncio.ensure_future(complete()))
+
+        # Return once the first command is ready, or once the plan has ended without any
+        try:
+            await plan.wait_for_command(0)
+        except asyncio.CancelledError:
+            await plan.close()
+            raise
+
+        return plan
+
+    def _end_plan(self, plan: StreamingPlan, final: Plan) -> None:
+        # Add the rest of the commands from the complete response. When a repair changed the
+        # commands that were already streamed, they may have run already, so the plan can't be
+        # completed
+        count = len(plan.commands)
+        if len(final.commands) < count or not all(
+            _is_same_command(streamed, command)
+            for streamed, command in zip(plan.commands, final.commands)
+        ):
+            plan.end(
+                ApplicationError(
+                    "[ActionPlanner]: the repaired response doesn't match the streamed plan"
+                )
+            )
+            return
+
+        for command in final.commands[count:]:
+            plan.add_command(command)
+
+        plan.end()
+
     def add_semantic_function(
         self, prompt: Union[str, PromptTemplate], _validator: Optional[PromptResponseValidator]
     ) -> "ActionPlanner":
@@ -192,6 +333,16 @@ class ActionPlanner(Planner[StateT]):
         self._options.prompts.add_function(name, __func__)
         return self
 
+    def _get_tokenizer(self, template: PromptTemplate) -> Tokenizer:
+        if self._options.tokenizer is not GPTTokenizer.for_model(None):
+            return self._options.tokenizer
+
+        model = template.config.completion.model
+        if model is None and isinstance(self._options.model, OpenAIModel):
+            model = self._options.model.options.default_model
+
+        return GPTTokenizer.for_model(model)
+
     def _default_prompt_factory(self, name: str) -> ActionPlannerPromptFactory:
         async def __factory__(
             _context: TurnContext, _state: TurnState, _planner: "ActionPlanner"
@@ -199,3 +350,16 @@ class ActionPlanner(Planner[StateT]):
             return await self._options.prompts.get_prompt(name)
 
         return __factory__
+
+
+# private
+def _is_same_command(streamed: PredictedCommand, command: PredictedCommand) -> bool:
+    if isinstance(streamed, PredictedDoCommand) and isinstance(command, PredictedDoCommand):
+        return streamed.action == command.action and streamed.parameters == command.parameters
+
+    if isinstance(streamed, PredictedSayCommand) and isinstance(command, PredictedSayCommand):
+        return (streamed.response.content if streamed.response else None) == (
+            command.response.content if command.response else None
+        )
+
+    return False
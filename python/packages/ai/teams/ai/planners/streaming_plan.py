@@ -0,0 +1,160 @@
+"""
+Copyright (c) Microsoft Corporation. All rights reserved.
+Licensed under the MIT License.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from typing import Any, Awaitable, Callable, List, Optional
+
+from .plan import Plan, PredictedCommand
+
+
+class StreamingPlan(Plan):
+    """
+    A plan whose commands are added while the model is still generating its response.
+
+    Commands are appended to `commands` as soon as they're complete. Use `wait_for_command()`
+    to wait for the command at an index. The plan is ended once the response is complete.
+    """
+
+    _ended: bool
+    _error: Optional[BaseException]
+    _changed: asyncio.Event
+    _tasks: List[asyncio.Future[Any]]
+
+    def __init__(self, commands: Optional[List[PredictedCommand]] = None) -> None:
+        """
+        Creates a new `StreamingPlan` instance.
+
+        Args:
+            commands (Optional[List[PredictedCommand]]): Optional. The commands received so far.
+        """
+        super().__init__(commands=commands if commands is not None else [])
+        self._ended = False
+        self._error = None
+        self._changed = asyncio.Event()
+        self._tasks = []
+
+    @property
+    def ended(self) -> bool:
+        """bool: True once no more commands will be added."""
+        return self._ended
+
+    def add_command(self, command: PredictedCommand) -> None:
+        """
+        Adds a command to the end of the plan.
+
+        Args:
+            command (PredictedCommand): The command to add.
+        """
+        self.commands.append(command)
+        self._changed.set()
+
+    def end(self, error: Optional[BaseException] = None) -> None:
+        """
+        Ends the plan.
+
+        Args:
+            error (Optional[BaseException]): Optional. Error that stopped the plan from being
+                completed. It's raised by `wait_for_command()` once all commands were consumed.
+        """
+        self._ended = True
+        self._error = error
+        self._changed.set()
+
+    def add_task(self, task: asyncio.Future[Any]) -> None:
+        """
+        Adds a background task that produces the plan's commands.
+
+        Args:
+            task (asyncio.Future[Any]): The task. It's cancelled by `cancel()`.
+        """
+        self._tasks.append(task)
+
+    def cancel(self) -> None:
+        """
+        Cancels the background tasks that are still producing the plan's commands and ends
+        the plan.
+        """
+        for task in self._tasks:
+            task.cancel()
+
+        if not self._ended:
+            self.end()
+
+    async def close(self) -> None:
+        """
+        Cancels the plan like `cancel()` and waits for its background tasks to finish, so that
+        none of them can change the turn state afterwards.
+        """
+        self.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    async def wait_for_command(self, index: int) -> bool:
+        """
+        Waits until the plan has a command at an index.
+
+        Args:
+            index (int): Index of the command.
+
+        Returns:
+            bool: True if the plan has a command at the index, or False if it ended without one.
+        """
+        while index >= len(self.commands):
+            if self._ended:
+                if self._error is not None:
+                    raise self._error
+                return False
+
+            self._changed.clear()
+            await self._changed.wait()
+
+        return True
+
+    def review(self, reviewer: Callable[[Plan], Awaitable[Plan]]) -> StreamingPlan:
+        """
+        Creates a plan with the commands of this plan reviewed as they're added.
+
+        Commands are reviewed in batches: each review covers all the commands added since the
+        previous review started, so commands streamed while a review is in flight share the
+        next request. When the reviewer returns a different plan, its commands replace the
+        rest of the commands.
+
+        Args:
+            reviewer (Callable[[Plan], Awaitable[Plan]]): Function used to review the commands,
+                like `Moderator.review_output()`.
+
+        Returns:
+            StreamingPlan: The reviewed plan.
+        """
+        reviewed = StreamingPlan()
+
+        async def forward() -> None:
+            index = 0
+            try:
+                while await self.wait_for_command(index):
+                    commands = self.commands[index:]
+                    plan = Plan(commands=list(commands))
+                    res = await reviewer(plan)
+
+                    if res is not plan:
+                        for command in res.commands:
+                            reviewed.add_command(command)
+                        break
+
+                    for command in commands:
+                        reviewed.add_command(command)
+                    index += len(commands)
+
+                reviewed.end()
+            except Exception as err:  # pylint: disable=broad-except
+                reviewed.end(err)
+
+        # Cancelling the reviewed plan also cancels this plan's tasks
+        reviewed.add_task(asyncio.ensure_future(forward()))
+        for task in self._tasks:
+            reviewed.add_task(task)
+
+        return reviewed
@@ -77,7 +77,7 @@ class FunctionCallMessage(PromptSectionBase):
         """
         # Calculate and cache response text and length
         if self._length < 0:
-            self._length = len(tokenizer.encode(json.dumps(asdict(self.function_call))))
+            self._length = tokenizer.count_tokens(json.dumps(asdict(self.function_call)))
 
         # Return output
         return self._return_messages(
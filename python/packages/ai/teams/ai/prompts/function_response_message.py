@@ -87,7 +87,7 @@ class FunctionResponseMessage(PromptSectionBase):
         # Calculate and cache response text and length
         if self._length < 0:
             self._text = to_string(tokenizer, self.response)
-            self._length = len(tokenizer.encode(self.name)) + len(tokenizer.encode(self._text))
+            self._length = tokenizer.count_tokens(self.name) + tokenizer.count_tokens(self._text)
 
         # Return output
         return self._return_messages(
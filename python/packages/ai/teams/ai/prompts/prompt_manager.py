@@ -5,11 +5,14 @@ Licensed under the MIT License.
 
 from __future__ import annotations
 
+import asyncio
 import json
 import os
+import time
 from copy import deepcopy
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Callable, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 from botbuilder.core import TurnContext
 
@@ -37,11 +40,28 @@ from .user_input_message import UserInputMessage
 from .user_message import UserMessage
 
 
+# private
+@dataclass
+class _PromptFiles:
+    config: PromptTemplateConfig
+    prompt: str
+    actions: List[ChatCompletionAction]
+    stamp: Tuple[Optional[int], ...]
+
+
+# private
+@dataclass
+class _PromptStamp:
+    files: Tuple[Optional[int], ...]
+    checked_at: float
+
+
 class PromptManager(PromptFunctions):
     _options: PromptManagerOptions
     _data_sources: Dict[str, DataSource]
     _functions: Dict[str, PromptFunction]
     _prompts: Dict[str, PromptTemplate]
+    _prompt_stamps: Dict[str, _PromptStamp]
 
     def __init__(self, options: PromptManagerOptions):
         """
@@ -54,6 +74,7 @@ class PromptManager(PromptFunctions):
         self._data_sources = {}
         self._functions = {}
         self._prompts = {}
+        self._prompt_stamps = {}
 
     @property
     def options(self) -> PromptManagerOptions:
@@ -253,97 +274,36 @@ class PromptManager(PromptFunctions):
             ApplicationError: If the prompt is not found or there is an error loading it.
         """
         if name not in self._prompts:
-            template_name = name
-
-            # Load template from disk
-            folder = os.path.join(self._options.prompts_folder, name)
-            config_file = os.path.join(folder, "config.json")
-            prompt_file = os.path.join(folder, "skprompt.txt")
-            actions_file = os.path.join(folder, "actions.json")
-
-            # Load prompt config
-            try:
-                with open(config_file, "r", encoding="utf-8") as file:
-                    template_config = PromptTemplateConfig.from_dict(json.load(file))
-            except Exception as e:
-                raise ApplicationError(
-                    "PromptManager.get_prompt(): an error occurred while loading "
-                    f"'{config_file}'. The file is either invalid or missing."
-                ) from e
-
-            # Load prompt text
-            sections: List[PromptSection] = []
-            try:
-                with open(prompt_file, "r", encoding="utf-8") as file:
-                    prompt = file.read()
-                    sections.append(TemplateSection(prompt, self._options.role))
-            except Exception as e:
-                raise ApplicationError(
-                    "PromptManager.get_prompt(): an error occurred while loading "
-                    f"'{prompt_file}'. The file is either invalid or missing."
-                ) from e
-
-            # Load optional actions
-            template_actions: List[ChatCompletionAction] = []
-            try:
-                with open(actions_file, "r", encoding="utf-8") as file:
-                    actions = json.load(file)
-
-                    for action in actions:
-                        template_actions.append(ChatCompletionAction.from_dict(action))
-            except IOError:
-                # Ignore missing actions file
-                pass
-
-            # Migrate the templates config as needed
-            self._update_config(template_config)
+            # Cache loaded template
+            template = await self._load_prompt(name)
+            self._prompts.setdefault(name, template)
+        elif name in self._prompt_stamps and self._options.hot_reload_interval is not None:
+            await self._reload_prompt_if_changed(name, self._options.hot_reload_interval)
 
-            # Add augmentations
-            augmentation = self._append_augmentations(
-                name, template_config, template_actions, sections
-            )
+        return self._prompts[name]
 
-            # Group everything into a system message
-            sections = [GroupSection(sections, "system")]
-
-            # Include conversation history
-            # - The ConversationHistory section will use the remaining tokens from
-            #   max_input_tokens.
-            if template_config.completion.include_history:
-                sections.append(
-                    ConversationHistorySection(
-                        f"conversation.{template_name}_history",
-                        self._options.max_conversation_history_tokens,
-                    )
-                )
+    async def preload(self) -> List[str]:
+        """
+        Loads every prompt folder under `prompts_folder` that hasn't been loaded yet.
 
-            # Include user input
-            if template_config.completion.include_images:
-                sections.append(UserInputMessage(self._options.max_input_tokens))
-            elif template_config.completion.include_input:
-                sections.append(UserMessage("{{$temp.input}}", self._options.max_input_tokens))
+        The prompts are read concurrently off the event loop so calling this at startup
+        removes the disk I/O from the first request for each prompt.
 
-            if (
-                template_config.augmentation
-                and template_config.augmentation.augmentation_type == "tools"
-            ):
-                include_history = template_config.completion.include_history
-                history_var = (
-                    f"conversation.{name}_history" if include_history else f"temp.{name}_history"
-                )
-                sections.append(ActionOutputMessage(history_variable=history_var))
-
-            template = PromptTemplate(
-                template_name, Prompt(sections), template_config, template_actions
-            )
+        Returns:
+            List[str]: Names of the prompts that were loaded.
 
-            if augmentation:
-                template.augmentation = augmentation
+        Raises:
+            ApplicationError: If there is an error loading any of the prompts.
+        """
+        loop = asyncio.get_running_loop()
+        names = await loop.run_in_executor(None, self._list_prompt_folders)
+        names = [name for name in names if name not in self._prompts]
+        templates = await asyncio.gather(*(self._load_prompt(name) for name in names))
 
-            # Cache loaded template
-            self._prompts[name] = template
+        for name, template in zip(names, templates):
+            self._prompts.setdefault(name, template)
 
-        return self._prompts[name]
+        return names
 
     def has_prompt(self, name: str) -> bool:
         """
@@ -362,6 +322,168 @@ class PromptManager(PromptFunctions):
             return Path(prompt_file).exists()
         return True
 
+    async def _load_prompt(self, name: str) -> PromptTemplate:
+        loop = asyncio.get_running_loop()
+        files = await loop.run_in_executor(None, self._read_prompt_files, name)
+        template = self._create_prompt(name, files)
+        self._prompt_stamps[name] = _PromptStamp(files.stamp, time.monotonic())
+        return template
+
+    async def _reload_prompt_if_changed(self, name: str, interval: float) -> None:
+        stamp = self._prompt_stamps[name]
+        now = time.monotonic()
+        if now - stamp.checked_at < interval:
+            return
+
+        stamp.checked_at = now
+        loop = asyncio.get_running_loop()
+        current = await loop.run_in_executor(None, self._get_prompt_stamp, name)
+        if current == stamp.files:
+            return
+
+        try:
+            template = await self._load_prompt(name)
+        except ApplicationError:
+            # Keep serving the current template while the files are being edited. The reload
+            # is retried on the next check because the stamp hasn't been updated.
+            return
+
+        # Swap in the new template. Renders already in progress keep using the old one.
+        self._prompts[name] = template
+
+    def _list_prompt_folders(self) -> List[str]:
+        folder = Path(self._options.prompts_folder)
+        if not folder.is_dir():
+            return []
+
+        return sorted(
+            entry.name
+            for entry in folder.iterdir()
+            if entry.is_dir() and (entry / "skprompt.txt").exists()
+        )
+
+    def _get_prompt_files(self, name: str) -> Tuple[str, str, str]:
+        folder = os.path.join(self._options.prompts_folder, name)
+        return (
+            os.path.join(folder, "config.json"),
+            os.path.join(folder, "skprompt.txt"),
+            os.path.join(folder, "actions.json"),
+        )
+
+    def _get_prompt_stamp(self, name: str) -> Tuple[Optional[int], ...]:
+        stamp: List[Optional[int]] = []
+        for file in self._get_prompt_files(name):
+            try:
+                stamp.append(os.stat(file).st_mtime_ns)
+            except OSError:
+                stamp.append(None)
+
+        return tuple(stamp)
+
+    def _read_prompt_files(self, name: str) -> _PromptFiles:
+        # Stamp before reading so that edits made while reading trigger another reload
+        stamp = self._get_prompt_stamp(name)
+        config_file, prompt_file, actions_file = self._get_prompt_files(name)
+
+        # Load prompt config
+        try:
+            with open(config_file, "r", encoding="utf-8") as file:
+                template_config = PromptTemplateConfig.from_dict(json.load(file))
+        except Exception as e:
+            raise ApplicationError(
+                "PromptManager.get_prompt(): an error occurred while loading "
+                f"'{config_file}'. The file is either invalid or missing."
+            ) from e
+
+        # Load prompt text
+        try:
+            with open(prompt_file, "r", encoding="utf-8") as file:
+                prompt = file.read()
+        except Exception as e:
+            raise ApplicationError(
+                "PromptManager.get_prompt(): an error occurred while loading "
+                f"'{prompt_file}'. The file is either invalid or missing."
+            ) from e
+
+        # Load optional actions
+        template_actions: List[ChatCompletionAction] = []
+        try:
+            with open(actions_file, "r", encoding="utf-8") as file:
+                actions = json.load(file)
+
+                for action in actions:
+                    template_actions.append(ChatCompletionAction.from_dict(action))
+        except IOError:
+            # Ignore missing actions file
+            pass
+
+        return _PromptFiles(template_config, prompt, template_actions, stamp)
+
+    def _create_prompt(self, name: str, files: _PromptFiles) -> PromptTemplate:
+        template_name = name
+        template_config = files.config
+        template_actions = files.actions
+        sections: List[PromptSection] = [
+            TemplateSection(
+                files.prompt,
+                self._options.role,
+                concurrent_functions=self._options.concurrent_functions,
+            )
+        ]
+
+        # Migrate the templates config as needed
+        self._update_config(template_config)
+
+        # Add augmentations
+        augmentation = self._append_augmentations(name, template_config, template_actions, sections)
+
+        # Group everything into a system message
+        volatile: List[PromptSection] = []
+        if self._options.stable_prefix:
+            # Keep static sections ahead of the conversation history and move the rest after it
+            volatile = [section for section in sections if not section.is_static]
+            sections = [section for section in sections if section.is_static]
+        sections = [GroupSection(sections, "system")] if sections else []
+
+        # Include conversation history
+        # - The ConversationHistory section will use the remaining tokens from
+        #   max_input_tokens.
+        if template_config.completion.include_history:
+            sections.append(
+                ConversationHistorySection(
+                    f"conversation.{template_name}_history",
+                    self._options.max_conversation_history_tokens,
+                )
+            )
+
+        if volatile:
+            sections.append(GroupSection(volatile, "system"))
+
+        # Include user input
+        if template_config.completion.include_images:
+            sections.append(UserInputMessage(self._options.max_input_tokens))
+        elif template_config.completion.include_input:
+            sections.append(UserMessage("{{$temp.input}}", self._options.max_input_tokens))
+
+        if (
+            template_config.augmentation
+            and template_config.augmentation.augmentation_type == "tools"
+        ):
+            include_history = template_config.completion.include_history
+            history_var = (
+                f"conversation.{name}_history" if include_history else f"temp.{name}_history"
+            )
+            sections.append(ActionOutputMessage(history_variable=history_var))
+
+        template = PromptTemplate(
+            template_name, Prompt(sections), template_config, template_actions
+        )
+
+        if augmentation:
+            template.augmentation = augmentation
+
+        return template
+
     def _update_config(self, template_config: PromptTemplateConfig):
         # Migrate old schema
         if template_config.schema == 1:
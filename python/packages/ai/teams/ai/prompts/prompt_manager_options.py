@@ -6,6 +6,7 @@ Licensed under the MIT License.
 from __future__ import annotations
 
 from dataclasses import dataclass
+from typing import Optional
 
 
 @dataclass
@@ -46,3 +47,27 @@ class PromptManagerOptions:
     user input included in prompts. For example, if set to `100` then the any user input over
     100 tokens in length will be truncated.
     """
+
+    stable_prefix: bool = False
+    """
+    Optional. When true, prompts loaded from `prompts_folder` are laid out so that their static
+    sections come first and volatile ones last. The prompt text and actions without any
+    template parameters are rendered as a leading system message, while data sources and
+    templated text are rendered as a second system message between the conversation history
+    and the user input. This keeps the start of each request the same across turns so that
+    providers can serve it from their prompt cache. Defaults to `False`.
+    """
+
+    concurrent_functions: bool = False
+    """
+    Optional. When true, the template functions of prompts loaded from `prompts_folder` are
+    called concurrently instead of one after the other. Only enable this when the functions
+    don't depend on each other's side effects. Defaults to `False`.
+    """
+
+    hot_reload_interval: Optional[float] = None
+    """
+    Optional. When set, prompts loaded from `prompts_folder` are reloaded if their files have
+    changed on disk. The files modification times are checked at most once every
+    `hot_reload_interval` seconds when the prompt is requested. Defaults to `None` (disabled).
+    """
@@ -6,7 +6,7 @@ Licensed under the MIT License.
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Generic, TypeVar
+from typing import Generic, Optional, TypeVar
 
 T = TypeVar("T")
 
@@ -20,8 +20,12 @@ class RenderedPromptSection(Generic[T]):
         output (T): The section that was rendered.
         length (int): The number of tokens that were rendered.
         too_long (bool): If true the section was truncated because it exceeded the maxTokens budget.
+        prefix_hash (Optional[str]): Hash of the messages rendered by the leading run of static
+            sections. Renders with the same hash start with the same messages, which lets
+            providers serve them from their prompt cache.
     """
 
     output: T
     length: int
     too_long: bool
+    prefix_hash: Optional[str] = None
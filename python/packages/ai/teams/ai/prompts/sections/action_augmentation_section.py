@@ -39,8 +39,7 @@ class ActionAugmentationSection(PromptSectionBase):
     """
 
     _text: str
-    _token_list: Optional[List[int]] = None
-    _actions: Dict[str, ChatCompletionAction] = {}
+    _actions: Dict[str, ChatCompletionAction]
 
     @property
     def actions(self) -> Dict[str, ChatCompletionAction]:
@@ -49,6 +48,13 @@ class ActionAugmentationSection(PromptSectionBase):
         """
         return self._actions
 
+    @property
+    def is_static(self) -> bool:
+        """
+        Always true as the actions are fixed when the section is created.
+        """
+        return True
+
     def __init__(self, actions: List[ChatCompletionAction], call_to_action: str) -> None:
         """
         Creates a new `ActionAugmentationSection` instance.
@@ -59,6 +65,7 @@ class ActionAugmentationSection(PromptSectionBase):
 
         """
         super().__init__(-1, True, "\n\n")
+        self._actions = {}
 
         # Convert actions to an ActionList
         action_list = ActionList(actions={})
@@ -102,20 +109,18 @@ class ActionAugmentationSection(PromptSectionBase):
             RenderedPromptSection[List[Message[str]]]: The rendered prompt section.
 
         """
-        # Tokenize on first use
-        if not self._token_list:
-            self._token_list = tokenizer.encode(self._text)
+        length = tokenizer.count_tokens(self._text)
 
         # Check for max tokens
-        if len(self._token_list) > max_tokens:
-            trimmed = self._token_list[0:max_tokens]
+        if length > max_tokens:
+            trimmed = tokenizer.truncate(self._text, max_tokens)
             return RenderedPromptSection[List[Message[str]]](
-                output=[Message[str](role="system", content=tokenizer.decode(trimmed))],
-                length=len(trimmed),
+                output=[Message[str](role="system", content=trimmed)],
+                length=min(length, max(max_tokens, 0)),
                 too_long=True,
             )
         return RenderedPromptSection[List[Message[str]]](
             output=[Message[str](role="system", content=self._text)],
-            length=len(self._token_list),
+            length=length,
             too_long=False,
         )
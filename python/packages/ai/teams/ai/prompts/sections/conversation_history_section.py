@@ -5,8 +5,10 @@ Licensed under the MIT License.
 
 from __future__ import annotations
 
-from copy import deepcopy
-from typing import List
+import weakref
+from bisect import bisect_left
+from copy import copy, deepcopy
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 from botbuilder.core import TurnContext
 
@@ -19,6 +21,125 @@ from ..rendered_prompt_section import RenderedPromptSection
 from .prompt_section_base import PromptSectionBase
 
 
+# private
+class _HistoryTotals:
+    """
+    Running token totals for a stored conversation history.
+
+    `totals[i]` holds the combined length of the first `i` messages so the length of any
+    trailing window of the history is a single subtraction. The totals are extended as
+    messages are appended to the history and re-based when older messages are trimmed
+    from the front, so repeat renders only measure messages they haven't seen before.
+    """
+
+    tokenizer: Optional[Tokenizer]
+    messages: List[Message]
+    rendered: List[Any]
+    totals: List[int]
+
+    def __init__(self) -> None:
+        self.tokenizer = None
+        self.messages = []
+        self.rendered = []
+        self.totals = [0]
+
+    def update(
+        self,
+        history: List[Message],
+        tokenizer: Tokenizer,
+        render: Callable[[Message], Tuple[Any, int]],
+    ) -> None:
+        start = self._find_start(history) if self.tokenizer is tokenizer else None
+        if start is None:
+            self.tokenizer = tokenizer
+            self.messages = []
+            self.rendered = []
+            self.totals = [0]
+        elif start > 0:
+            # Older messages were trimmed from the front of the history
+            base = self.totals[start]
+            del self.messages[:start]
+            del self.rendered[:start]
+            self.totals = [total - base for total in self.totals[start:]]
+
+        for msg in history[len(self.messages) :]:
+            output, length = render(msg)
+            self.messages.append(msg)
+            self.rendered.append(output)
+            self.totals.append(self.totals[-1] + length)
+
+    def select(self, budget: float, required: bool, separator_length: int) -> Tuple[int, int]:
+        """
+        Returns the index of the oldest message in the newest window of messages that fits
+        the budget, along with the length of that window.
+        """
+        count = len(self.messages)
+
+        # Every stored length includes a separator which the first line of a window doesn't need
+        start = min(bisect_left(self.totals, self.totals[count] - budget - separator_length), count)
+
+        # Add initial message if required
+        if start == count and required and count > 0:
+            start = count - 1
+
+        if start == count:
+            return start, 0
+
+        return start, self.totals[count] - self.totals[start] - separator_length
+
+    def _find_start(self, history: List[Message]) -> Optional[int]:
+        if not self.messages:
+            return 0
+
+        if not history:
+            return None
+
+        start = next((i for i, msg in enumerate(self.messages) if msg is history[0]), None)
+        if start is None or len(history) < len(self.messages) - start:
+            return None
+
+        for cached, msg in zip(self.messages[start:], history):
+            if cached is not msg:
+                return None
+
+        return start
+
+
+# private
+class _HistoryTotalsCache:
+    """
+    The `_HistoryTotals` of each memory a section renders.
+
+    Sections are shared by every conversation that uses their prompt, so the totals are kept
+    per memory and dropped along with it instead of being shared by concurrent turns.
+    """
+
+    _entries: Dict[int, Tuple[weakref.ref, _HistoryTotals]]
+
+    def __init__(self) -> None:
+        self._entries = {}
+
+    def get(self, memory: MemoryBase) -> _HistoryTotals:
+        key = id(memory)
+        entry = self._entries.get(key)
+        if entry is not None and entry[0]() is memory:
+            return entry[1]
+
+        totals = _HistoryTotals()
+
+        def remove(ref: weakref.ref) -> None:
+            if self._entries.get(key, (None,))[0] is ref:
+                del self._entries[key]
+
+        try:
+            self._entries[key] = (weakref.ref(memory, remove), totals)
+        except TypeError:
+            # Memories that can't be weakly referenced aren't cached
+            pass
+
+        return totals
+
+
 class ConversationHistorySection(PromptSectionBase):
     """
     A section that renders the conversation history.
@@ -27,6 +148,8 @@ class ConversationHistorySection(PromptSectionBase):
     _variable: str
     _user_prefix: str
     _assistant_prefix: str
+    _text_totals: _HistoryTotalsCache
+    _message_totals: _HistoryTotalsCache
 
     def __init__(
         self,
@@ -56,6 +179,8 @@ class ConversationHistorySection(PromptSectionBase):
         self._variable = variable
         self._user_prefix = user_prefix
         self._assistant_prefix = assistant_prefix
+        self._text_totals = _HistoryTotalsCache()
+        self._message_totals = _HistoryTotalsCache()
 
     @property
     def variable(self):
@@ -102,32 +227,19 @@ class ConversationHistorySection(PromptSectionBase):
 
         # Get messages from memory
         history: List[Message] = memory.get(self.variable) or []
-        history = deepcopy(history)
+        separator_length = tokenizer.count_tokens(self.separator)
 
-        # Populate history and stay under the token budget
-        tokens = 0
-        budget = min(self.tokens, max_tokens) if self.tokens > 1.0 else max_tokens
-        separator_length = len(tokenizer.encode(self.separator))
-        lines: List[str] = []
-        for msg in reversed(history):
-            msg = Message(role=msg.role, content=to_string(tokenizer, msg.content))
+        def render_line(msg: Message) -> Tuple[str, int]:
             prefix = self.user_prefix if msg.role == "user" else self.assistant_prefix
-            line = prefix + (msg.content if msg.content is not None else "")
-            length = len(tokenizer.encode(line)) + (separator_length if len(lines) > 0 else 0)
-
-            # Add initial line if required
-            if len(lines) == 0 and self.required:
-                tokens += length
-                lines.insert(0, line)
-                continue
+            line = prefix + to_string(tokenizer, msg.content)
+            return line, tokenizer.count_tokens(line) + separator_length
 
-            # Stop if we're over the token budget
-            if tokens + length > budget:
-                break
-
-            # Add line
-            tokens += length
-            lines.insert(0, line)
+        # Select the newest lines that stay under the token budget
+        budget = min(self.tokens, max_tokens) if self.tokens > 1.0 else max_tokens
+        totals = self._text_totals.get(memory)
+        totals.update(history, tokenizer, render_line)
+        start, tokens = totals.select(budget, self.required, separator_length)
+        lines: List[str] = totals.rendered[start:]
 
         return RenderedPromptSection[str](self.separator.join(lines), tokens, tokens > max_tokens)
 
@@ -155,20 +267,14 @@ class ConversationHistorySection(PromptSectionBase):
 
         # Get messages from memory
         history: List[Message] = memory.get(self.variable) or []
-        history = deepcopy(history)
 
-        # Populate messages and stay under the token budget
-        tokens = 0
-        budget = self._get_token_budget(max_tokens)
-        messages: List[Message] = []
-        for msg in reversed(history):
-            # Clone message
-            message = deepcopy(msg)
+        def render_message(msg: Message) -> Tuple[Message, int]:
+            message = copy(msg)
             if message.content is not None:
                 message.content = to_string(tokenizer, message.content)
 
             # Get text message length
-            length = len(tokenizer.encode(self.get_message_text(message)))
+            length = tokenizer.count_tokens(self.get_message_text(message))
 
             # Add length of any image parts
             if isinstance(message.content, list):
@@ -180,19 +286,14 @@ class ConversationHistorySection(PromptSectionBase):
 
                 length += count * 85
 
-            # Add initial message if required
-            if len(messages) == 0 and self.required:
-                tokens += length
-                messages.insert(0, message)
-                continue
+            return message, length
 
-            # Stop if we're over the token budget
-            if tokens + length > budget:
-                break
-
-            # Add message
-            tokens += length
-            messages.insert(0, message)
+        # Select the newest messages that stay under the token budget
+        budget = self._get_token_budget(max_tokens)
+        totals = self._message_totals.get(memory)
+        totals.update(history, tokenizer, render_message)
+        start, tokens = totals.select(budget, self.required, 0)
+        messages: List[Message] = deepcopy(totals.rendered[start:])
 
         # Remove completed partial action outputs
         while messages and messages[0].role == "tool":
@@ -36,6 +36,13 @@ class DataSourceSection(PromptSectionBase):
         super().__init__(tokens, True, "\n\n")
         self._data_source = data_source
 
+    @property
+    def is_static(self) -> bool:
+        """
+        True if the data source is static.
+        """
+        return self._data_source.is_static
+
     async def render_as_messages(
         self,
         context: TurnContext,
@@ -68,6 +68,13 @@ class GroupSection(PromptSectionBase):
         """
         return self._role
 
+    @property
+    def is_static(self) -> bool:
+        """
+        True if all sections in this group are static.
+        """
+        return all(section.is_static for section in self._sections)
+
     async def render_as_messages(
         self,
         context: TurnContext,
@@ -6,7 +6,9 @@ Licensed under the MIT License.
 from __future__ import annotations
 
 import asyncio
-from typing import Any, Awaitable, Callable, List, Optional
+import hashlib
+from copy import copy
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
 
 from botbuilder.core import TurnContext
 
@@ -18,18 +20,28 @@ from ..prompt_section_layout import _PromptSectionLayout
 from ..rendered_prompt_section import RenderedPromptSection
 from .prompt_section import PromptSection
 
+# private
+# The last render of a static section: (section, tokenizer, max_tokens, rendered).
+_StaticRender = Tuple[PromptSection, Tokenizer, int, RenderedPromptSection[Any]]
+
 
 class LayoutEngineSection(PromptSection):
     """
     Base layout engine that renders a set of `auto`, `fixed`, or `proportional` length sections.
     This class is used internally by the `Prompt` and `GroupSection` classes to
     render their sections.
+
+    The last render of each static section (see `PromptSection.is_static`) is kept per
+    tokenizer and reused for as long as the section is asked to render with the same budget.
+    Message renders also report a `prefix_hash` of the messages rendered by the leading static
+    sections.
     """
 
     _sections: List[PromptSection]
     _required: bool
     _tokens: float
     _separator: str
+    _static_renders: Dict[Tuple[int, bool], _StaticRender]
 
     @property
     def sections(self) -> List[PromptSection]:
@@ -61,6 +73,7 @@ class LayoutEngineSection(PromptSection):
         self._required = required
         self._tokens = tokens
         self._separator = separator
+        self._static_renders = {}
 
     async def render_as_text(
         self,
@@ -90,25 +103,36 @@ class LayoutEngineSection(PromptSection):
         self._add_sections_to_layout(self.sections, layout)
 
         # Layout sections
-        remaining = await self._layout_sections(
+        await self._layout_sections(
             layout,
             max_tokens,
-            lambda section: section.render_as_text(
-                context, memory, functions, tokenizer, max_tokens
+            lambda section: self._render_section(
+                section,
+                True,
+                context=context,
+                memory=memory,
+                functions=functions,
+                tokenizer=tokenizer,
+                max_tokens=max_tokens,
             ),
-            lambda section, remaining: section.render_as_text(
-                context, memory, functions, tokenizer, remaining
+            lambda section, remaining: self._render_section(
+                section,
+                True,
+                context=context,
+                memory=memory,
+                functions=functions,
+                tokenizer=tokenizer,
+                max_tokens=remaining,
             ),
             True,
             tokenizer,
         )
 
-        # Build output
+        # Build output and verify the estimated length with a single count
         output = [section.layout.output for section in layout if section.layout]
         text = self.separator.join(output)
-        return RenderedPromptSection(
-            output=text, length=len(tokenizer.encode(text)), too_long=remaining < 0
-        )
+        length = tokenizer.count_tokens(text)
+        return RenderedPromptSection(output=text, length=length, too_long=length > max_tokens)
 
     async def render_as_messages(
         self,
@@ -141,11 +165,23 @@ class LayoutEngineSection(PromptSection):
         remaining = await self._layout_sections(
             layout,
             max_tokens,
-            lambda section: section.render_as_messages(
-                context, memory, functions, tokenizer, max_tokens
+            lambda section: self._render_section(
+                section,
+                False,
+                context=context,
+                memory=memory,
+                functions=functions,
+                tokenizer=tokenizer,
+                max_tokens=max_tokens,
             ),
-            lambda section, remaining: section.render_as_messages(
-                context, memory, functions, tokenizer, remaining
+            lambda section, remaining: self._render_section(
+                section,
+                False,
+                context=context,
+                memory=memory,
+                functions=functions,
+                tokenizer=tokenizer,
+                max_tokens=remaining,
             ),
         )
 
@@ -154,9 +190,65 @@ class LayoutEngineSection(PromptSection):
             message for section in layout if section.layout for message in section.layout.output
         ]
         return RenderedPromptSection(
-            output=output, length=self._get_layout_length(layout), too_long=remaining < 0
+            output=output,
+            length=self._get_layout_length(layout),
+            too_long=remaining < 0,
+            prefix_hash=self._get_prefix_hash(layout),
+        )
+
+    # pylint: disable=too-many-arguments # No argument can be removed based on the design
+    async def _render_section(
+        self,
+        section: PromptSection,
+        as_text: bool,
+        *,
+        context: TurnContext,
+        memory: MemoryBase,
+        functions: PromptFunctions,
+        tokenizer: Tokenizer,
+        max_tokens: int,
+    ) -> RenderedPromptSection[Any]:
+        render = section.render_as_text if as_text else section.render_as_messages
+        if not section.is_static:
+            return await render(context, memory, functions, tokenizer, max_tokens)
+
+        # Reuse the last render of static sections
+        key = (id(section), as_text)
+        cached = self._static_renders.get(key)
+        if (
+            cached is None
+            or cached[0] is not section
+            or cached[1] is not tokenizer
+            or cached[2] != max_tokens
+        ):
+            rendered: RenderedPromptSection[Any] = await render(
+                context, memory, functions, tokenizer, max_tokens
+            )
+            cached = (section, tokenizer, max_tokens, rendered)
+            self._static_renders[key] = cached
+
+        # Hand out copies of messages so callers can't change the cached render
+        rendered = cached[3]
+        output = rendered.output if as_text else [copy(message) for message in rendered.output]
+        return RenderedPromptSection(
+            output=output, length=rendered.length, too_long=rendered.too_long
         )
 
+    # pylint: enable=too-many-arguments
+
+    def _get_prefix_hash(self, layout: List[_PromptSectionLayout[List[Message]]]) -> Optional[str]:
+        digest = hashlib.sha256()
+        count = 0
+        for section in layout:
+            if not section.section.is_static:
+                break
+
+            for message in section.layout.output if section.layout else []:
+                digest.update(f"{message.role}\0{message.name}\0{message.content}\0".encode())
+                count += 1
+
+        return digest.hexdigest() if count > 0 else None
+
     def _add_sections_to_layout(
         self, sections: List[PromptSection], layout: List[_PromptSectionLayout[Any]]
     ):
@@ -166,6 +258,7 @@ class LayoutEngineSection(PromptSection):
             else:
                 layout.append(_PromptSectionLayout(section=section))
 
+    # pylint: disable=too-many-arguments # No argument can be removed based on the design
     async def _layout_sections(
         self,
         layout: List[_PromptSectionLayout[Any]],
@@ -177,13 +270,16 @@ class LayoutEngineSection(PromptSection):
         text_layout: bool = False,
         tokenizer: Optional[Tokenizer] = None,
     ) -> int:
+        # Text layouts pay for a separator between each pair of rendered sections
+        separator_length = (
+            tokenizer.count_tokens(self.separator) if text_layout and tokenizer else 0
+        )
+
         # Layout fixed sections
         await self._layout_fixed_sections(layout, callback_fixed)
 
         # Get tokens remaining and drop optional sections if too long
-        remaining = max_tokens - self._get_layout_length(layout, text_layout, tokenizer)
-        while remaining < 0 and self._drop_last_optional_section(layout):
-            remaining = max_tokens - self._get_layout_length(layout, text_layout, tokenizer)
+        remaining = self._drop_optional_sections(layout, max_tokens, separator_length)
 
         # Layout proportional sections
         if self._needs_more_layout(layout) and remaining > 0:
@@ -193,12 +289,12 @@ class LayoutEngineSection(PromptSection):
             )
 
             # Get tokens remaining and drop optional sections if too long
-            remaining = max_tokens - self._get_layout_length(layout, text_layout, tokenizer)
-            while remaining < 0 and self._drop_last_optional_section(layout):
-                remaining = max_tokens - self._get_layout_length(layout, text_layout, tokenizer)
+            remaining = self._drop_optional_sections(layout, max_tokens, separator_length)
 
         return remaining
 
+    # pylint: enable=too-many-arguments
+
     async def _layout_fixed_sections(
         self,
         layouts: List[_PromptSectionLayout[Any]],
@@ -233,24 +329,36 @@ class LayoutEngineSection(PromptSection):
 
         await asyncio.gather(*tasks)
 
-    def _get_layout_length(
-        self,
-        layout: List[_PromptSectionLayout[Any]],
-        text_layout: bool = False,
-        tokenizer: Optional[Tokenizer] = None,
+    def _get_layout_length(self, layout: List[_PromptSectionLayout[Any]]) -> int:
+        return sum(section.layout.length for section in layout if section.layout)
+
+    def _drop_optional_sections(
+        self, layout: List[_PromptSectionLayout[Any]], max_tokens: int, separator_length: int
     ) -> int:
-        if text_layout and tokenizer:
-            output = [section.layout.output for section in layout if section.layout]
-            return len(tokenizer.encode(self.separator.join(output)))
+        # Sum the section lengths once and adjust the total as sections are dropped
+        count = sum(1 for section in layout if section.layout)
+        remaining = (
+            max_tokens - self._get_layout_length(layout) - max(count - 1, 0) * separator_length
+        )
 
-        return sum(section.layout.length for section in layout if section.layout)
+        while remaining < 0:
+            dropped = self._drop_last_optional_section(layout)
+            if dropped is None:
+                break
+
+            if dropped.layout:
+                count -= 1
+                remaining += dropped.layout.length + (separator_length if count > 0 else 0)
+
+        return remaining
 
-    def _drop_last_optional_section(self, layout: List[_PromptSectionLayout[Any]]) -> bool:
+    def _drop_last_optional_section(
+        self, layout: List[_PromptSectionLayout[Any]]
+    ) -> Optional[_PromptSectionLayout[Any]]:
         for i in reversed(range(len(layout))):
             if not layout[i].section.required:
-                del layout[i]
-                return True
-        return False
+                return layout.pop(i)
+        return None
 
     def _needs_more_layout(self, layout: List[_PromptSectionLayout[Any]]) -> bool:
         return any(not section.layout for section in layout)
@@ -40,6 +40,14 @@ class PromptSection(ABC):
           should be allowed to consume.
         """
 
+    @property
+    def is_static(self) -> bool:
+        """
+        If true the section renders the same output every turn for a given tokenizer and budget,
+        so the layout engine can reuse its last render.
+        """
+        return False
+
     @abstractmethod
     async def render_as_text(
         self,
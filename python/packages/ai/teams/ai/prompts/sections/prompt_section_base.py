@@ -145,8 +145,8 @@ class PromptSectionBase(PromptSection):
         )
 
         # Calculate length
-        prefix_length = len(tokenizer.encode(self.text_prefix))
-        separator_length = len(tokenizer.encode(self.separator))
+        prefix_length = tokenizer.count_tokens(self.text_prefix)
+        separator_length = tokenizer.count_tokens(self.separator)
         length = (
             prefix_length + as_messages.length + (len(as_messages.output) - 1) * separator_length
         )
@@ -154,8 +154,7 @@ class PromptSectionBase(PromptSection):
         # Truncate if fixed length
         text = self.text_prefix + text
         if self.tokens > 1.0 and length > self.tokens:
-            encoded = tokenizer.encode(text)
-            text = tokenizer.decode(encoded[: int(self.tokens)])
+            text = tokenizer.truncate(text, int(self.tokens))
             length = int(self.tokens)
 
         return RenderedPromptSection(text, length, length > max_tokens)
@@ -170,11 +169,11 @@ class PromptSectionBase(PromptSection):
         if self.tokens > 1.0:
             while length > self.tokens:
                 msg = output.pop()
-                encoded = tokenizer.encode(PromptSectionBase.get_message_text(msg))
-                length -= len(encoded)
+                text = PromptSectionBase.get_message_text(msg)
+                length -= tokenizer.count_tokens(text)
                 if length < self.tokens:
                     delta = self.tokens - length
-                    truncated = tokenizer.decode(encoded[: int(delta)])
+                    truncated = tokenizer.truncate(text, int(delta))
                     output.append(Message(msg.role, truncated))
                     length += int(delta)
 
@@ -5,14 +5,20 @@ Licensed under the MIT License.
 
 from __future__ import annotations
 
+import asyncio
+from dataclasses import dataclass
 from enum import Enum
-from typing import Awaitable, Callable, List
+from typing import Any, List, Optional, Tuple, Union
 
 from botbuilder.core import TurnContext
 
 from ....app_error import ApplicationError
 from ....state import MemoryBase
-from ....utils.to_string import to_string
+from ....utils.to_string import (
+    ToStringSerializer,
+    get_to_string_serializer,
+    to_string,
+)
 from ...tokenizers import Tokenizer
 from ..message import Message
 from ..prompt_functions import PromptFunctions
@@ -28,7 +34,60 @@ class _ParseState(Enum):
 
 
 # private
-_PartRenderer = Callable[[TurnContext, MemoryBase, PromptFunctions, Tokenizer, int], Awaitable[str]]
+# Values that can't change without being replaced in memory, so their renders can be reused.
+_IMMUTABLE_TYPES = (str, int, float, bool)
+
+
+# private
+class _VariablePart:
+    name: str
+    _last: Optional[Tuple[Tokenizer, ToStringSerializer, Any, str]]
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self._last = None
+
+    def render(self, memory: MemoryBase, tokenizer: Tokenizer) -> str:
+        value = memory.get(self.name)
+        serializer = get_to_string_serializer(self.name)
+
+        # Reuse the last render when the value hasn't changed
+        last = self._last
+        if (
+            last is not None
+            and last[0] is tokenizer
+            and last[1] == serializer
+            and type(last[2]) is type(value)  # pylint: disable=unidiomatic-typecheck
+            and last[2] == value
+        ):
+            return last[3]
+
+        text = to_string(tokenizer, value, serializer=serializer)
+        if isinstance(value, _IMMUTABLE_TYPES):
+            self._last = (tokenizer, serializer, value, text)
+
+        return text
+
+
+# private
+@dataclass
+class _FunctionPart:
+    name: str
+    args: List[str]
+
+    async def render(
+        self,
+        context: TurnContext,
+        memory: MemoryBase,
+        functions: PromptFunctions,
+        tokenizer: Tokenizer,
+    ) -> str:
+        value = await functions.invoke_function(self.name, context, memory, tokenizer, self.args)
+        return to_string(tokenizer, value)
+
+
+# private
+_TemplatePart = Union[str, _VariablePart, _FunctionPart]
 
 
 class TemplateSection(PromptSectionBase):
@@ -47,11 +106,21 @@ class TemplateSection(PromptSectionBase):
 
     Function arguments are optional and separated by spaces.
     They can be quoted using ', ", or ` delimiters.
+
+    Templates are compiled once into a plan of static text, variable and function parts.
+    The length of templates without any parameters is counted once per tokenizer. Parts are
+    rendered in order unless `concurrent_functions` is set, in which case functions are called
+    concurrently so that functions doing I/O overlap, and variables that follow a function in
+    the template are rendered after all functions have returned.
     """
 
     _template: str
     _role: str
-    _parts: List[_PartRenderer]
+    _parts: List[_TemplatePart]
+    _first_function: int
+    _concurrent_functions: bool
+    _static_text: Optional[str]
+    _static_length: Optional[Tuple[Tokenizer, int]]
 
     # pylint: disable=too-many-arguments # No argument can be removed based on the design
     def __init__(
@@ -62,6 +131,8 @@ class TemplateSection(PromptSectionBase):
         required: bool = True,
         separator: str = "\n",
         text_prefix: str = "",
+        *,
+        concurrent_functions: bool = False,
     ):
         """
         Creates a new 'TemplateSection' instance.
@@ -75,13 +146,27 @@ class TemplateSection(PromptSectionBase):
               Defaults to `\n`.
             text_prefix (str, optional): The text prefix. Prefix to use for text output.
               Defaults to ''.
+            concurrent_functions (bool, optional): Calls the template's functions concurrently
+              instead of one after the other. Only enable for functions that don't depend on
+              each other's side effects. Defaults to `False`.
 
         """
         super().__init__(tokens, required, separator, text_prefix)
         self._template = template
         self._role = role
-        self._parts: List[_PartRenderer] = []
+        self._concurrent_functions = concurrent_functions
+        self._parts = []
+        self._static_length = None
         self._parse_template()
+        self._first_function = next(
+            (i for i, part in enumerate(self._parts) if isinstance(part, _FunctionPart)),
+            len(self._parts),
+        )
+        self._static_text = (
+            "".join(part for part in self._parts if isinstance(part, str))
+            if all(isinstance(part, str) for part in self._parts)
+            else None
+        )
 
     # pylint: enable=too-many-arguments
 
@@ -95,6 +180,11 @@ class TemplateSection(PromptSectionBase):
         """str: The role of the template."""
         return self._role
 
+    @property
+    def is_static(self) -> bool:
+        """bool: True if the template has no variables or functions."""
+        return self._static_text is not None
+
     # pylint: disable=too-many-arguments # No argument can be removed based on the design
     async def render_as_messages(
         self,
@@ -118,13 +208,16 @@ class TemplateSection(PromptSectionBase):
             RenderedPromptSection[List[Message]]: The rendered prompt section as a list of messages.
         """
 
-        rendered_parts = [
-            await part(context, memory, functions, tokenizer, max_tokens) for part in self._parts
-        ]
-
-        # Join all parts
-        text = "".join(rendered_parts)
-        length = len(tokenizer.encode(text))
+        if self._static_text is not None:
+            # Count static templates once per tokenizer
+            text = self._static_text
+            if self._static_length is None or self._static_length[0] is not tokenizer:
+                self._static_length = (tokenizer, tokenizer.count_tokens(text))
+            length = self._static_length[1]
+        else:
+            # Join all parts
+            text = "".join(await self._render_parts(context, memory, functions, tokenizer))
+            length = tokenizer.count_tokens(text)
 
         # Return output
         messages = [Message(role=self.role, content=text)] if length > 0 else []
@@ -132,6 +225,46 @@ class TemplateSection(PromptSectionBase):
 
     # pylint: enable=too-many-arguments
 
+    async def _render_parts(
+        self,
+        context: TurnContext,
+        memory: MemoryBase,
+        functions: PromptFunctions,
+        tokenizer: Tokenizer,
+    ) -> List[str]:
+        rendered = [part if isinstance(part, str) else "" for part in self._parts]
+
+        if not self._concurrent_functions:
+            for i, part in enumerate(self._parts):
+                if isinstance(part, _VariablePart):
+                    rendered[i] = part.render(memory, tokenizer)
+                elif isinstance(part, _FunctionPart):
+                    rendered[i] = await part.render(context, memory, functions, tokenizer)
+
+            return rendered
+
+        # Variables ahead of the first function can't observe any of its side effects
+        for i in range(self._first_function):
+            part = self._parts[i]
+            if isinstance(part, _VariablePart):
+                rendered[i] = part.render(memory, tokenizer)
+
+        # Call functions concurrently
+        calls = [(i, part) for i, part in enumerate(self._parts) if isinstance(part, _FunctionPart)]
+        results = await asyncio.gather(
+            *(part.render(context, memory, functions, tokenizer) for _, part in calls)
+        )
+        for (i, _), result in zip(calls, results):
+            rendered[i] = result
+
+        # Render remaining variables once functions have updated memory
+        for i in range(self._first_function, len(self._parts)):
+            part = self._parts[i]
+            if isinstance(part, _VariablePart):
+                rendered[i] = part.render(memory, tokenizer)
+
+        return rendered
+
     def _parse_template(self):
         # Parse template
         part = ""
@@ -143,7 +276,7 @@ class TemplateSection(PromptSectionBase):
             if state == _ParseState.IN_TEXT:
                 if char == "{" and i + 1 < len(self.template) and self.template[i + 1] == "{":
                     if len(part) > 0:
-                        self._parts.append(self._create_text_renderer(part))
+                        self._parts.append(part)
                         part = ""
                     state = _ParseState.IN_PARAMETER
                     i += 1
@@ -154,9 +287,9 @@ class TemplateSection(PromptSectionBase):
                     if len(part) > 0:
                         part = part.strip()
                         if part[0] == "$":
-                            self._parts.append(self._create_variable_renderer(part[1:]))
+                            self._parts.append(_VariablePart(part[1:]))
                         else:
-                            self._parts.append(self._create_function_renderer(part))
+                            self._parts.append(self._parse_function(part))
                         part = ""
 
                     state = _ParseState.IN_TEXT
@@ -180,33 +313,9 @@ class TemplateSection(PromptSectionBase):
 
         # Add final part
         if len(part) > 0:
-            self._parts.append(self._create_text_renderer(part))
-
-    def _create_text_renderer(self, text: str) -> _PartRenderer:
-        async def renderer(
-            _context: TurnContext,
-            _memory: MemoryBase,
-            _functions: PromptFunctions,
-            _tokenizer: Tokenizer,
-            _max_tokens: int,
-        ) -> str:
-            return text
-
-        return renderer
-
-    def _create_variable_renderer(self, name: str) -> _PartRenderer:
-        async def renderer(
-            _context: TurnContext,
-            memory: MemoryBase,
-            _functions: PromptFunctions,
-            tokenizer: Tokenizer,
-            _max_tokens: int,
-        ) -> str:
-            return to_string(tokenizer, memory.get(name))
-
-        return renderer
-
-    def _create_function_renderer(self, param: str) -> _PartRenderer:
+            self._parts.append(part)
+
+    def _parse_function(self, param: str) -> _FunctionPart:
         name = ""
         args: List[str] = []
 
@@ -253,14 +362,4 @@ class TemplateSection(PromptSectionBase):
             else:
                 args.append(part)
 
-        async def renderer(
-            context: TurnContext,
-            memory: MemoryBase,
-            functions: PromptFunctions,
-            tokenizer: Tokenizer,
-            _max_tokens: int,
-        ) -> str:
-            value = await functions.invoke_function(name, context, memory, tokenizer, args)
-            return to_string(tokenizer, value)
-
-        return renderer
+        return _FunctionPart(name, args)
@@ -68,6 +68,11 @@ class TextSection(PromptSectionBase):
         """Message role to use for this section."""
         return self._role
 
+    @property
+    def is_static(self) -> bool:
+        """bool: Always true as the text never changes."""
+        return True
+
     async def render_as_messages(
         self,
         context: TurnContext,
@@ -91,7 +96,7 @@ class TextSection(PromptSectionBase):
         """
         # Calculate and cache length
         if self._length < 0:
-            self._length = len(tokenizer.encode(self.text))
+            self._length = tokenizer.count_tokens(self.text)
 
         # Return output
         messages: List[Message] = (
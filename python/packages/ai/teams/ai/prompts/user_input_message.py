@@ -79,16 +79,16 @@ class UserInputMessage(PromptSectionBase):
         length = 0
         budget = self._get_token_budget(max_tokens)
         if len(input_text) > 0:
-            encoded = tokenizer.encode(input_text)
-            if len(encoded) <= budget:
+            input_length = tokenizer.count_tokens(input_text)
+            if input_length <= budget:
                 if message.content is not None:
                     message.content.append(TextContentPart(type="text", text=input_text))
-                    length += len(encoded)
-                    budget -= len(encoded)
+                    length += input_length
+                    budget -= input_length
             else:
                 if message.content is not None:
                     message.content.append(
-                        TextContentPart(type="text", text=tokenizer.decode(encoded[:budget]))
+                        TextContentPart(type="text", text=tokenizer.truncate(input_text, budget))
                     )
                     length += budget
                     budget = 0
@@ -3,7 +3,7 @@ Copyright (c) Microsoft Corporation. All rights reserved.
 Licensed under the MIT License.
 """
 
-from .gpt_tokenizer import GPTTokenizer
+from .gpt_tokenizer import GPTTokenizer, encoding_for_model
 from .tokenizer import Tokenizer
 
-__all__ = ["GPTTokenizer", "Tokenizer"]
+__all__ = ["GPTTokenizer", "Tokenizer", "encoding_for_model"]
@@ -5,21 +5,106 @@ Licensed under the MIT License.
 
 from __future__ import annotations
 
-from typing import List
+import re
+from functools import lru_cache
+from threading import Lock
+from typing import Callable, Dict, List, Optional
 
-from tiktoken import Encoding, get_encoding
+from tiktoken import Encoding, encoding_name_for_model, get_encoding
 
 from .tokenizer import Tokenizer
 
+_DEFAULT_ENCODING = "cl100k_base"
+
+# Only short strings like separators, prefixes and static template text are worth caching.
+_MAX_CACHED_TEXT_LENGTH = 8192
+
+# Model families that use the `o200k_base` encoding. Matched anywhere in the name so that
+# Azure OpenAI deployment names like `my-gpt-4o-deployment` resolve correctly.
+_O200K_MODELS = re.compile(r"(gpt-?4o|gpt-?4\.[15]|gpt-?5|(^|[^a-z0-9])o[1-9](-|$))")
+
+
+def encoding_for_model(model: Optional[str]) -> str:
+    """
+    Returns the name of the tiktoken encoding used by a model.
+
+    Args:
+        model (Optional[str]): Name of the model or Azure OpenAI deployment.
+
+    Returns:
+        str: The encoding name. Defaults to `cl100k_base` for unknown models.
+    """
+    if not model:
+        return _DEFAULT_ENCODING
+
+    name = model.lower()
+    if _O200K_MODELS.search(name):
+        return "o200k_base"
+
+    try:
+        return encoding_name_for_model(name)
+    except KeyError:
+        return _DEFAULT_ENCODING
+
+
+@lru_cache(maxsize=None)
+def _get_shared_encoding(name: str) -> Encoding:
+    return get_encoding(name)
+
 
 class GPTTokenizer(Tokenizer):
-    """Used to encode and decode text for GPT-3.5/GPT-4 model."""
+    """Used to encode and decode text for GPT-3.5/GPT-4/GPT-4o model."""
 
     _encoding: Encoding
+    _cached_count: Callable[[str], int]
+    _shared: Dict[str, GPTTokenizer] = {}
+    _shared_lock = Lock()
+
+    def __init__(
+        self, model: Optional[str] = None, encoding: Optional[str] = None, cache_size: int = 1024
+    ):
+        """
+        Initializes the GPTTokenizer object.
 
-    def __init__(self):
-        """Initializes the GPTTokenizer object."""
-        self._encoding = get_encoding("cl100k_base")
+        Args:
+            model (Optional[str]): Optional. Name of the model the text will be sent to. Used to
+              pick the encoding when `encoding` isn't set.
+            encoding (Optional[str]): Optional. Name of the tiktoken encoding to use. Defaults to
+              the encoding of `model` or `cl100k_base`.
+            cache_size (int): Optional. Maximum number of strings whose token counts are cached
+              by `count_tokens()`. Defaults to `1024`.
+        """
+        self._encoding = _get_shared_encoding(encoding or encoding_for_model(model))
+        self._cached_count = lru_cache(maxsize=cache_size)(self._count)
+
+    @classmethod
+    def for_model(cls, model: Optional[str]) -> GPTTokenizer:
+        """
+        Returns the process wide tokenizer for a model.
+
+        Tokenizers are shared per encoding so every model using the same encoding gets the
+        same instance.
+
+        Args:
+            model (Optional[str]): Name of the model or Azure OpenAI deployment.
+
+        Returns:
+            GPTTokenizer: The shared tokenizer.
+        """
+        name = encoding_for_model(model)
+        tokenizer = cls._shared.get(name)
+        if tokenizer is None:
+            with cls._shared_lock:
+                tokenizer = cls._shared.setdefault(name, cls(encoding=name))
+
+        return tokenizer
+
+    @property
+    def encoding_name(self) -> str:
+        """
+        Name of the tiktoken encoding used by the tokenizer.
+        """
+        return self._encoding.name
 
     def decode(self, tokens: List[int]) -> str:
         """Decodes a list of tokens into a string.
@@ -42,3 +127,57 @@ class GPTTokenizer(Tokenizer):
             List[int]: The list of encoded tokens.
         """
         return self._encoding.encode(text)
+
+    def encode_batch(self, texts: List[str]) -> List[List[int]]:
+        """Encodes a list of strings in parallel.
+
+        Args:
+            texts (List[str]): The strings to be encoded.
+
+        Returns:
+            List[List[int]]: The list of encoded tokens for each string.
+        """
+        return self._encoding.encode_batch(texts)
+
+    def count_tokens(self, text: str) -> int:
+        """Counts the number of tokens in a string.
+
+        Counts for short strings are kept in a bounded LRU cache so repeated separators,
+        prefixes and static text are only encoded once.
+
+        Args:
+            text (str): The text to count.
+
+        Returns:
+            int: The number of tokens in the text.
+        """
+        if len(text) > _MAX_CACHED_TEXT_LENGTH:
+            return self._count(text)
+
+        return self._cached_count(text)
+
+    def truncate(self, text: str, max_tokens: int) -> str:
+        """Truncates a string to a maximum number of tokens.
+
+        Args:
+            text (str): The text to truncate.
+            max_tokens (int): The maximum number of tokens to keep.
+
+        Returns:
+            str: The text unchanged if it fits, otherwise its first `max_tokens` tokens.
+        """
+        if max_tokens <= 0:
+            return ""
+
+        # Every token covers at least one byte of text
+        if len(text) <= max_tokens and len(text.encode("utf-8")) <= max_tokens:
+            return text
+
+        tokens = self._encoding.encode(text)
+        if len(tokens) <= max_tokens:
+            return text
+
+        return self._encoding.decode(tokens[:max_tokens])
+
+    def _count(self, text: str) -> int:
+        return len(self._encoding.encode(text))
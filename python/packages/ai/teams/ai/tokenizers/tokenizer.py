@@ -37,3 +37,49 @@ class Tokenizer(ABC):
         Returns:
             List[int]: A list of integers representing the encoded text.
         """
+
+    def encode_batch(self, texts: List[str]) -> List[List[int]]:
+        """Encodes a list of strings into lists of tokens.
+
+        Tokenizers that can encode several strings at once should override this method.
+
+        Args:
+            texts (List[str]): The texts to encode.
+
+        Returns:
+            List[List[int]]: The encoded tokens for each text.
+        """
+        return [self.encode(text) for text in texts]
+
+    def count_tokens(self, text: str) -> int:
+        """Counts the number of tokens in a string.
+
+        Tokenizers that can count tokens without building the full token list should override
+        this method.
+
+        Args:
+            text (str): The text to count.
+
+        Returns:
+            int: The number of tokens in the text.
+        """
+        return len(self.encode(text))
+
+    def truncate(self, text: str, max_tokens: int) -> str:
+        """Truncates a string to a maximum number of tokens.
+
+        Args:
+            text (str): The text to truncate.
+            max_tokens (int): The maximum number of tokens to keep.
+
+        Returns:
+            str: The text unchanged if it fits, otherwise its first `max_tokens` tokens.
+        """
+        if max_tokens <= 0:
+            return ""
+
+        tokens = self.encode(text)
+        if len(tokens) <= max_tokens:
+            return text
+
+        return self.decode(tokens[:max_tokens])
@@ -9,6 +9,9 @@ from typing import Any, Dict, List, Optional
 
 from botbuilder.core import TurnContext
 from jsonschema import ValidationError, validate
+from jsonschema.exceptions import SchemaError, best_match
+from jsonschema.protocols import Validator
+from jsonschema.validators import validator_for
 
 from ...state import MemoryBase
 from ...utils.json import parse
@@ -23,9 +26,13 @@ NEW_LINE = "\n"
 class JSONResponseValidator(PromptResponseValidator):
     """
     Default response validator that always returns true.
+
+    The schema is checked and compiled into a validator once, when the instance is created.
+    Invalid schemas aren't compiled and are checked again by every validation instead.
     """
 
     _schema: Optional[Dict[str, Any]]
+    _validator: Optional[Validator]
     _missing_json_feedback: str
     _error_feedback: str
 
@@ -41,6 +48,16 @@ class JSONResponseValidator(PromptResponseValidator):
 
         super().__init__()
         self._schema = schema
+        self._validator = None
+
+        if schema is not None:
+            cls = validator_for(schema)
+            try:
+                cls.check_schema(schema)
+                self._validator = cls(schema)
+            except SchemaError:
+                # Keep reporting invalid schemas when responses are validated
+                self._validator = None
         self._missing_json_feedback = (
             missing_json_feedback
             if missing_json_feedback is not None
@@ -99,12 +116,24 @@ class JSONResponseValidator(PromptResponseValidator):
         errors: List[str] = []
 
         for obj in parsed:
-            try:
-                validate(instance=obj, schema=self._schema)
+            error = self._find_error(obj)
+            if error is None:
                 return Validation(value=obj)
-            except ValidationError as err:
-                errors.append(err.message)
+            errors.append(error)
 
         return Validation(
             valid=False, feedback=f"{self._error_feedback}{NEW_LINE}{NEW_LINE.join(errors)}"
         )
+
+    def _find_error(self, obj: Any) -> Optional[str]:
+        if self._validator is None:
+            # Raises a `SchemaError` for the invalid schema
+            try:
+                validate(instance=obj, schema=self._schema)
+                return None
+            except ValidationError as err:
+                return err.message
+
+        # Report the same error as `jsonschema.validate()`
+        error = best_match(self._validator.iter_errors(obj))
+        return None if error is None else error.message
@@ -4,6 +4,17 @@ Licensed under the MIT License.
 """
 
 from .snippet import snippet
-from .to_string import to_string
+from .to_string import (
+    ToStringSerializer,
+    get_to_string_serializer,
+    set_to_string_serializer,
+    to_string,
+)
 
-__all__ = ["snippet", "to_string"]
+__all__ = [
+    "snippet",
+    "to_string",
+    "ToStringSerializer",
+    "get_to_string_serializer",
+    "set_to_string_serializer",
+]
@@ -3,7 +3,9 @@ Copyright (c) Microsoft Corporation. All rights reserved.
 Licensed under the MIT License.
 """
 
+from .json_stream_parser import JSONStreamParser
 from .parse import parse
 from .parse_object import parse_object
+from .parse_objects import ParsedObject, parse_objects
 
-__all__ = ["parse", "parse_object"]
+__all__ = ["JSONStreamParser", "parse", "parse_object", "parse_objects", "ParsedObject"]
@@ -0,0 +1,152 @@
+"""
+Copyright (c) Microsoft Corporation. All rights reserved.
+Licensed under the MIT License.
+"""
+
+from __future__ import annotations
+
+import json
+import re
+from typing import Any, Dict, List, Optional, Sequence
+
+from .parse_object import _repair_object
+
+# private
+_OBJECT_START = re.compile(r"\{")
+_STRUCTURAL_CHARS = re.compile(r'["{}\[\]:,]')
+_STRING_CHARS = re.compile(r'["\\]')
+
+
+# private
+class _Frame:
+    is_object: bool
+    key: Optional[str]
+    expecting_key: bool
+    start: Optional[int]
+
+    def __init__(self, is_object: bool, start: Optional[int]) -> None:
+        self.is_object = is_object
+        self.key = None
+        self.expecting_key = is_object
+        self.start = start
+
+
+class JSONStreamParser:
+    """
+    Incrementally parses JSON that arrives in chunks, like a streamed model response, and
+    returns the objects found at a path as soon as each of them is complete.
+
+    The path is relative to each top-level object in the text. Strings select the value of an
+    object member and `None` selects the items of an array, so `["commands", None]` selects
+    each object in the `commands` array of `{"commands": [{...}, {...}]}`.
+    Text outside of top-level objects is ignored.
+    """
+
+    _path: List[Optional[str]]
+    _text: str
+    _pos: int
+    _stack: List[_Frame]
+    _string_start: int
+
+    def __init__(self, path: Sequence[Optional[str]]) -> None:
+        """
+        Creates a new `JSONStreamParser` instance.
+
+        Args:
+            path (Sequence[Optional[str]]): Path of the objects to return.
+        """
+        self._path = list(path)
+        self._text = ""
+        self._pos = 0
+        self._stack = []
+        self._string_start = -1
+
+    def feed(self, text: str) -> List[Dict[str, Any]]:
+        """
+        Adds the next chunk of text.
+
+        Args:
+            text (str): The chunk of text.
+
+        Returns:
+            List[Dict[str, Any]]: The objects at the path completed by the chunk.
+
+        Raises:
+            ValueError: If a completed object at the path isn't valid JSON.
+        """
+        self._text += text
+        objects: List[Dict[str, Any]] = []
+
+        while True:
+            if self._string_start >= 0:
+                if not self._scan_string():
+                    break
+                continue
+
+            pattern = _STRUCTURAL_CHARS if len(self._stack) > 0 else _OBJECT_START
+            match = pattern.search(self._text, self._pos)
+            if match is None:
+                self._pos = len(self._text)
+                break
+
+            i = match.start()
+            self._pos = i + 1
+            obj = self._scan_char(self._text[i], i)
+            if obj is not None:
+                objects.append(obj)
+
+        return objects
+
+    def _scan_char(self, char: str, i: int) -> Optional[Dict[str, Any]]:
+        if char == '"':
+            self._string_start = i
+        elif char in "{[":
+            start = i if char == "{" and self._get_path() == self._path else None
+            self._stack.append(_Frame(char == "{", start))
+        elif char in "}]":
+            frame = self._stack.pop()
+            if frame.start is not None:
+                return self._load(self._text[frame.start : i + 1])
+        elif char == ":":
+            self._stack[-1].expecting_key = False
+        elif char == ",":
+            self._stack[-1].expecting_key = self._stack[-1].is_object
+
+        return None
+
+    def _scan_string(self) -> bool:
+        # Returns false when more text is needed to finish the string
+        while True:
+            match = _STRING_CHARS.search(self._text, self._pos)
+            if match is None:
+                self._pos = len(self._text)
+                return False
+
+            i = match.start()
+            if self._text[i] == "\\":
+                if i + 1 >= len(self._text):
+                    self._pos = i
+                    return False
+                self._pos = i + 2
+                continue
+
+            self._pos = i + 1
+            frame = self._stack[-1]
+            if frame.expecting_key:
+                frame.key = json.loads(self._text[self._string_start : i + 1])
+            self._string_start = -1
+            return True
+
+    def _get_path(self) -> List[Optional[str]]:
+        # Path of a value starting at the current position, relative to the top-level object
+        return [frame.key if frame.is_object else None for frame in self._stack]
+
+    def _load(self, text: str) -> Dict[str, Any]:
+        try:
+            return json.loads(text)
+        except ValueError:
+            # Quote unquoted <placeholder> values
+            obj = _repair_object(text, 0, len(text))[0]
+            if obj is None:
+                raise
+            return obj
@@ -7,27 +7,17 @@ from __future__ import annotations
 
 from typing import Any, List
 
-from .parse_object import parse_object
+from .parse_objects import parse_objects
 
 
 def parse(text: str) -> List[Any]:
     """
     Parse all objects from a response string.
-    """
-
-    objects: List[Any] = []
-    lines = text.split("\n")
-
-    for line in lines:
-        obj = parse_object(line)
 
-        if obj is not None and len(obj) > 0:
-            objects.append(obj)
-
-    if len(objects) == 0:
-        obj = parse_object(text)
+    Empty objects are only returned when no other objects are found.
+    """
 
-        if obj is not None:
-            objects.append(obj)
+    objects = [obj.value for obj in parse_objects(text)]
+    non_empty = [obj for obj in objects if len(obj) > 0]
 
-    return objects
+    return non_empty if len(non_empty) > 0 else objects[:1]
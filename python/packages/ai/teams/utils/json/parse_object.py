@@ -6,7 +6,15 @@ Licensed under the MIT License.
 from __future__ import annotations
 
 import json
-from typing import Any, Optional
+import re
+from typing import Any, List, Optional, Tuple
+
+# private
+_decoder = json.JSONDecoder()
+
+# private
+# Characters that change the state of the repair scan
+_SPECIAL_CHARS = re.compile(r'["\\{}\[\]<>]')
 
 
 def parse_object(text: str) -> Optional[Any]:
@@ -19,64 +27,73 @@ def parse_object(text: str) -> Optional[Any]:
     if start_brace == -1:
         return None
 
-    obj = text[start_brace:]
-    nesting = ["}"]
-    cleaned = "{"
-    in_string = False
-    i = 1
-
-    while i < len(obj) and len(nesting) > 0:
-        char = obj[i]
+    try:
+        return _decoder.raw_decode(text, start_brace)[0]
+    except ValueError:
+        return _repair_object(text, start_brace, len(text))[0]
 
-        if in_string:
-            cleaned += char
 
-            if char == "\\":
-                while char == "\\":
-                    i += 1
-                    char = obj[i]
-
-                if i < len(obj):
-                    cleaned += obj[i]
-                else:
-                    return None
-            elif char == '"':
-                in_string = False
-        else:
-            add_pre = False
-            add_post = False
-
-            if char == '"':
-                in_string = True
-            elif char == "{":
-                nesting.append("}")
-            elif char == "[":
-                nesting.append("]")
-            elif char in ("}", "]"):
-                close = nesting.pop()
+def _repair_object(text: str, start: int, stop: int) -> Tuple[Optional[Any], int, bool]:
+    """
+    Leniently parses the object starting at `start`, scanning no further than `stop`.
+    Unquoted `<placeholder>` values are quoted and unclosed objects and arrays are closed.
 
-                if close != char:
-                    return None
-            elif char == "<":
-                add_pre = True
-            elif char == ">":
-                add_post = True
+    Returns the parsed object (or `None`), the offset the scan ended at and whether the
+    object was closed before `stop`.
+    """
 
-            if add_pre:
-                cleaned += '"'
+    parts: List[str] = []
+    nesting: List[str] = []
+    in_string = False
+    last = start
+    end = stop
+    pos = start
 
-            cleaned += char
+    while pos < stop:
+        match = _SPECIAL_CHARS.search(text, pos, stop)
 
-            if add_post:
-                cleaned += '"'
+        if match is None:
+            break
 
-        i += 1
+        i = match.start()
+        char = text[i]
+        pos = i + 1
 
-    if len(nesting) > 0:
-        nesting.reverse()
-        cleaned += "".join(nesting)
+        if in_string:
+            if char == "\\":
+                # Skip the escaped character
+                if pos >= stop:
+                    return None, stop, False
+                pos += 1
+            elif char == '"':
+                in_string = False
+        elif char == '"':
+            in_string = True
+        elif char == "{":
+            nesting.append("}")
+        elif char == "[":
+            nesting.append("]")
+        elif char in ("}", "]"):
+            if len(nesting) == 0 or nesting.pop() != char:
+                return None, pos, True
+
+            if len(nesting) == 0:
+                end = pos
+                break
+        elif char == "<":
+            parts.append(text[last:i])
+            parts.append('"')
+            last = i
+        elif char == ">":
+            parts.append(text[last:pos])
+            parts.append('"')
+            last = pos
+
+    parts.append(text[last:end])
+    nesting.reverse()
+    parts.extend(nesting)
 
     try:
-        return json.loads(cleaned)
+        return json.loads("".join(parts)), end, len(nesting) == 0
     except ValueError:
-        return None
+        return None, end, len(nesting) == 0
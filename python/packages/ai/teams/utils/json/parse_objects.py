@@ -0,0 +1,71 @@
+"""
+Copyright (c) Microsoft Corporation. All rights reserved.
+Licensed under the MIT License.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Dict, List
+
+from .parse_object import _decoder, _repair_object
+
+
+@dataclass
+class ParsedObject:
+    """
+    A JSON object found in a string.
+    """
+
+    value: Dict[str, Any]
+    "The parsed object."
+
+    start: int
+    "Offset of the object's opening brace."
+
+    end: int
+    "Offset just past the end of the object."
+
+
+def parse_objects(text: str) -> List[ParsedObject]:
+    """
+    Parse all top-level objects from a string in a single pass.
+
+    Each candidate object is parsed with `json.JSONDecoder.raw_decode()`. When that fails,
+    the object is repaired by quoting `<placeholder>` values and closing unclosed objects and
+    arrays. Objects left open at the end of their line are repaired across the following lines
+    first, and within their line when that fails.
+    Scanning resumes after each object, or on the next line when a candidate can't be parsed.
+
+    Args:
+        text (str): The string to parse.
+
+    Returns:
+        List[ParsedObject]: The objects found, in order.
+    """
+
+    objects: List[ParsedObject] = []
+    start = text.find("{")
+
+    while start != -1:
+        line_end = text.find("\n", start)
+        line_end = len(text) if line_end == -1 else line_end
+
+        try:
+            value, end = _decoder.raw_decode(text, start)
+        except ValueError:
+            value, end, closed = _repair_object(text, start, line_end)
+
+            # Objects that aren't closed within their line may continue on the next lines
+            if not closed and line_end < len(text):
+                repaired, repaired_end, _ = _repair_object(text, start, len(text))
+                if repaired is not None:
+                    value, end = repaired, repaired_end
+
+        if isinstance(value, dict):
+            objects.append(ParsedObject(value=value, start=start, end=end))
+            start = text.find("{", end)
+        else:
+            start = text.find("{", line_end)
+
+    return objects
@@ -6,15 +6,66 @@ Licensed under the MIT License.
 from __future__ import annotations
 
 import json
-from typing import Any
+from typing import Any, Dict, Literal, Optional
 
 import yaml
 
 from ..ai.tokenizers import Tokenizer
 from ..state import todict
 
+ToStringSerializer = Literal["auto", "json", "yaml", "tokens"]
+"""
+Strategy used by `to_string()` to serialize objects.
+
+- `auto`: Use JSON or YAML, whichever serializes to fewer characters.
+- `json`: Always use JSON.
+- `yaml`: Always use YAML.
+- `tokens`: Tokenize both JSON and YAML and use the one with fewer tokens.
+"""
+
+# Prefer the libyaml based dumper which is much faster than the pure Python one.
+_YamlDumper = getattr(yaml, "CDumper", yaml.Dumper)
+
+# private
+# Serializers configured per memory variable. The `None` entry is used for all other values.
+_serializers: Dict[Optional[str], ToStringSerializer] = {None: "auto"}
+
+
+def set_to_string_serializer(
+    serializer: ToStringSerializer, variable: Optional[str] = None
+) -> None:
+    """
+    Sets the serializer used by `to_string()`.
+
+    Args:
+        serializer (ToStringSerializer): The serializer to use.
+        variable (Optional[str], optional): Name of the memory variable to use the serializer
+            for, like `conversation.list`. Defaults to setting the serializer for all values.
+    """
+    _serializers[variable] = serializer
+
+
+def get_to_string_serializer(variable: Optional[str] = None) -> ToStringSerializer:
+    """
+    Gets the serializer used by `to_string()`.
+
+    Args:
+        variable (Optional[str], optional): Name of the memory variable to get the serializer
+            for. Defaults to getting the serializer used for all values.
+
+    Returns:
+        ToStringSerializer: The serializer.
+    """
+    return _serializers.get(variable, _serializers[None])
 
-def to_string(tokenizer: Tokenizer, value: Any, as_json: bool = False) -> str:
+
+def to_string(
+    tokenizer: Tokenizer,
+    value: Any,
+    as_json: bool = False,
+    serializer: Optional[ToStringSerializer] = None,
+    variable: Optional[str] = None,
+) -> str:
     """
     Converts a value to a string representation.
     Dates are converted to ISO strings and Objects are converted to JSON or YAML,
@@ -25,6 +76,9 @@ def to_string(tokenizer: Tokenizer, value: Any, as_json: bool = False) -> str:
         value (Any): The value to be converted.
         as_json (bool, optional): Flag indicating whether to return the value as JSON string.
         Defaults to False.
+        serializer (Optional[ToStringSerializer], optional): Serializer to use. Defaults to
+        the serializer configured for `variable` or globally.
+        variable (Optional[str], optional): Name of the memory variable the value was read from.
 
     Returns:
         str: The string representation of the value.
@@ -35,15 +89,39 @@ def to_string(tokenizer: Tokenizer, value: Any, as_json: bool = False) -> str:
     if hasattr(value, "isoformat") and callable(value.isoformat):
         # Used when the value is a datetime object
         return value.isoformat()
-    value = todict(value)
 
     if as_json:
-        return json.dumps(value, default=lambda o: o.__dict__, ensure_ascii=False)
+        serializer = "json"
+    elif serializer is None:
+        serializer = get_to_string_serializer(variable)
 
-    # Return shorter version of object
-    yaml_str = yaml.dump(value, allow_unicode=True)
+    return _serialize(tokenizer, value, serializer)
+
+
+def _serialize(tokenizer: Tokenizer, value: Any, serializer: ToStringSerializer) -> str:
+    value = todict(value)
     json_str = json.dumps(value, default=lambda o: o.__dict__, ensure_ascii=False)
-    if len(tokenizer.encode(yaml_str)) < len(tokenizer.encode(json_str)):
+
+    if serializer == "json":
+        return json_str
+
+    # YAML adds a document end marker to scalars so it can only be shorter than JSON when
+    # a string needs escaping
+    if serializer == "auto" and not isinstance(value, (dict, list)):
+        if not isinstance(value, str) or len(json_str) == len(value) + 2:
+            return json_str
+
+    # The C dumper omits the document end marker after scalars, so keep the pure Python
+    # dumper for those to match its output exactly
+    dumper = _YamlDumper if isinstance(value, (dict, list)) else yaml.Dumper
+    yaml_str = yaml.dump(value, Dumper=dumper, allow_unicode=True)
+    if serializer == "yaml":
         return yaml_str
 
-    return json_str
+    # Return shorter version of object
+    if serializer == "tokens":
+        shorter = tokenizer.count_tokens(yaml_str) < tokenizer.count_tokens(json_str)
+    else:
+        shorter = len(yaml_str) < len(json_str)
+
+    return yaml_str if shorter else json_str
@@ -172,3 +172,34 @@ class TestMonologueAugmentation(IsolatedAsyncioTestCase):
         assert isinstance(plan.commands[0], PredictedDoCommand)
         self.assertEqual(plan.commands[0].action, "test")
         self.assertEqual(plan.commands[0].parameters.get("foo"), "bar")
+
+    async def test_command_stream(self):
+        state = TurnState()
+        stream = self.monologue_augmentation.create_command_stream()
+        assert stream is not None
+
+        text = json.dumps(
+            {
+                "thoughts": {"thought": "test", "reasoning": "test", "plan": "test"},
+                "action": {"name": "SAY", "parameters": {"text": "hello world"}},
+            }
+        )
+        commands = await stream.write(cast(TurnContext, {}), state, self.tokenizer, text[:-2])
+        self.assertEqual(len(commands), 0)
+
+        commands = await stream.write(cast(TurnContext, {}), state, self.tokenizer, text[-2:])
+        self.assertEqual(len(commands), 1)
+        assert isinstance(commands[0], PredictedSayCommand)
+        assert commands[0].response is not None
+        self.assertEqual(commands[0].response.content, "hello world")
+
+    async def test_command_stream_invalid_action(self):
+        state = TurnState()
+        stream = self.monologue_augmentation.create_command_stream()
+        assert stream is not None
+
+        commands = await stream.write(
+            cast(TurnContext, {}), state, self.tokenizer, '{"action":{"name":"test1"}}'
+        )
+        self.assertEqual(commands, [])
+        self.assertFalse(stream.valid)
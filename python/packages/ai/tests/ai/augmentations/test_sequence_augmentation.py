@@ -207,3 +207,30 @@ class TestSequenceAugmentation(IsolatedAsyncioTestCase):
         assert command1.response is not None
         self.assertEqual(command1.response.role, "assistant")
         self.assertEqual(command1.response.content, "hello world")
+
+    async def test_command_stream(self):
+        state = TurnState()
+        stream = self.sequence_augmentation.create_command_stream()
+        assert stream is not None
+
+        commands = await stream.write(
+            cast(TurnContext, {}),
+            state,
+            self.tokenizer,
+            '{"type":"plan","commands":[{"type":"DO","action":"test1","parameters":{"foo":"bar"}}',
+        )
+        self.assertEqual(commands, [PredictedDoCommand(action="test1", parameters={"foo": "bar"})])
+
+        commands = await stream.write(
+            cast(TurnContext, {}),
+            state,
+            self.tokenizer,
+            ',{"type":"SAY","response":"hello world"},{"type":"DO","action":"test2"},'
+            + '{"type":"SAY","response":"unreachable"}]}',
+        )
+        self.assertEqual(len(commands), 1)
+        assert isinstance(commands[0], PredictedSayCommand)
+        assert commands[0].response is not None
+        self.assertEqual(commands[0].response.content, "hello world")
+        self.assertFalse(stream.valid)
+        self.assertIsNotNone(stream.feedback)
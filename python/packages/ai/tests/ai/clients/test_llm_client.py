@@ -3,7 +3,7 @@ Copyright (c) Microsoft Corporation. All rights reserved.
 Licensed under the MIT License.
 """
 
-from typing import cast
+from typing import List, cast
 from unittest import IsolatedAsyncioTestCase, mock
 
 import httpx
@@ -12,14 +12,16 @@ from openai.types import chat
 
 from teams.ai.clients.llm_client import LLMClient, LLMClientOptions
 from teams.ai.models.openai_model import OpenAIModel, OpenAIModelOptions
+from teams.ai.models.prompt_completion_model import PromptCompletionModel
 from teams.ai.models.prompt_response import PromptResponse
-from teams.ai.prompts import Message
+from teams.ai.prompts import Message, Prompt
 from teams.ai.prompts.completion_config import CompletionConfig
 from teams.ai.prompts.prompt_functions import PromptFunctions
 from teams.ai.prompts.prompt_template import PromptTemplate
 from teams.ai.prompts.prompt_template_config import PromptTemplateConfig
 from teams.ai.prompts.sections.text_section import TextSection
 from teams.ai.tokenizers.gpt_tokenizer import GPTTokenizer
+from teams.ai.validators import PromptResponseValidator, Validation
 from teams.state import TurnState
 from teams.state.conversation_state import ConversationState
 from teams.state.temp_state import TempState
@@ -70,6 +72,29 @@ class MockAsyncOpenAIError:
     chat = MockAsyncChat(should_error=True)
 
 
+class MockRenderingModel(PromptCompletionModel):
+    renders: List[List[Message]]
+
+    def __init__(self) -> None:
+        self.renders = []
+
+    async def complete_prompt(self, context, memory, functions, tokenizer, template):
+        rendered = await template.prompt.render_as_messages(
+            context, memory, functions, tokenizer, template.config.completion.max_input_tokens
+        )
+        self.renders.append(rendered.output)
+        return PromptResponse[str](
+            message=Message(role="assistant", content=f"response {len(self.renders)}")
+        )
+
+
+class MockRepairValidator(PromptResponseValidator):
+    async def validate_response(self, context, memory, tokenizer, response, remaining_attempts):
+        if response.message and response.message.content == "response 3":
+            return Validation()
+        return Validation(valid=False, feedback="try again")
+
+
 class TestLLMClient(IsolatedAsyncioTestCase):
     def create_mock_context(
         self, channel_id="channel1", bot_id="bot1", conversation_id="conversation1", user_id="user1"
@@ -180,3 +205,45 @@ class TestLLMClient(IsolatedAsyncioTestCase):
             self.assertEqual(response.message.content, "test")
 
         self.assertEqual(state.get(client.options.history_variable), expected_history)
+
+    async def test_complete_prompt_repair_reuses_first_render(self):
+        context = self.create_mock_context()
+        state = await TurnState[ConversationState, UserState, TempState].load(context)
+
+        model = MockRenderingModel()
+        client = LLMClient(LLMClientOptions(model, validator=MockRepairValidator()))
+        prompt = Prompt([TextSection(text="this is a test prompt", role="system")])
+        with mock.patch.object(
+            prompt, "render_as_messages", wraps=prompt.render_as_messages
+        ) as render:
+            response = await client.complete_prompt(
+                context=context,
+                memory=state,
+                functions=cast(PromptFunctions, {}),
+                tokenizer=GPTTokenizer(),
+                template=PromptTemplate(
+                    name="default",
+                    prompt=prompt,
+                    config=PromptTemplateConfig(
+                        schema=1.0,
+                        type="completion",
+                        description="test",
+                        completion=CompletionConfig(completion_type="chat"),
+                    ),
+                ),
+            )
+
+        self.assertEqual(response.status, "success")
+        self.assertEqual(render.call_count, 1)
+        self.assertEqual(len(model.renders), 3)
+        self.assertEqual(
+            [message.content for message in model.renders[2]],
+            [
+                "this is a test prompt",
+                '"response 1"',
+                '"try again"',
+                '"response 2"',
+                '"try again"',
+            ],
+        )
+        self.assertIsNone(state.get(f"{client.options.history_variable}-repair"))
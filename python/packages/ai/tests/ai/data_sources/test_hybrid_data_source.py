@@ -0,0 +1,96 @@
+"""
+Copyright (c) Microsoft Corporation. All rights reserved.
+Licensed under the MIT License.
+"""
+
+from typing import cast
+from unittest import IsolatedAsyncioTestCase, mock
+
+from botbuilder.core import TurnContext
+
+from teams.ai.data_sources import (
+    HybridDataSource,
+    HybridDataSourceOptions,
+    VectorIndex,
+    VectorIndexItem,
+)
+from teams.ai.tokenizers import GPTTokenizer
+from teams.app_error import ApplicationError
+from teams.state import Memory
+from tests.utils import MockEmbeddings
+
+
+class TestHybridDataSource(IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.tokenizer = GPTTokenizer()
+        self.embeddings = MockEmbeddings()
+        self.index = VectorIndex(2)
+        self.index.upsert(
+            [
+                VectorIndexItem("1", "Laptop will not turn on", [1, 0]),
+                VectorIndexItem("2", "Laptop screen is cracked", [1, 0.2]),
+                VectorIndexItem("3", "Ticket INC-1042: printer jammed", [0, 1]),
+            ]
+        )
+        self.state = Memory()
+        self.state.set("temp.input", "INC-1042 laptop")
+
+    def create_data_source(self, **kwargs) -> HybridDataSource:
+        return HybridDataSource(
+            HybridDataSourceOptions(
+                name="docs", embeddings=self.embeddings, index=self.index, **kwargs
+            )
+        )
+
+    async def render(self, data_source: HybridDataSource, max_tokens: int = 100) -> str:
+        section = await data_source.render_data(
+            cast(TurnContext, {}), self.state, self.tokenizer, max_tokens
+        )
+        self.assertLessEqual(section.length, max_tokens)
+        return section.output
+
+    async def test_render_data_fuses_keywords_and_vectors(self):
+        output = await self.render(self.create_data_source(max_documents=2))
+
+        # The identifier match ranks first by keywords and isn't close by meaning
+        self.assertEqual(output, "Ticket INC-1042: printer jammed\n\nLaptop will not turn on")
+        self.assertEqual(self.embeddings.calls, 1)
+
+    async def test_texts_are_read_without_vectors(self):
+        with mock.patch.object(self.index, "get", side_effect=AssertionError("vector read")):
+            output = await self.render(self.create_data_source(max_documents=1))
+
+        self.assertEqual(output, "Ticket INC-1042: printer jammed")
+
+    async def test_render_data_without_embeddings(self):
+        data_source = HybridDataSource(
+            HybridDataSourceOptions(name="docs", index=self.index, max_documents=1)
+        )
+
+        self.assertEqual(await self.render(data_source), "Ticket INC-1042: printer jammed")
+
+    async def test_render_data_skips_embeddings_for_keyword_match(self):
+        output = await self.render(self.create_data_source(max_documents=1, keyword_threshold=0.5))
+
+        self.assertEqual(output, "Ticket INC-1042: printer jammed")
+        self.assertEqual(self.embeddings.calls, 0)
+
+    async def test_render_data_fits_token_budget(self):
+        output = await self.render(self.create_data_source(), max_tokens=8)
+
+        self.assertTrue(output.startswith("Ticket INC-1042"))
+        self.assertEqual(self.tokenizer.count_tokens(output), 8)
+
+    async def test_upsert_and_delete_update_both_indexes(self):
+        data_source = self.create_data_source(max_documents=1)
+        data_source.upsert([VectorIndexItem("4", "Ticket INC-1042 was closed", [0, 1])])
+        data_source.delete(["3"])
+
+        self.assertNotIn("3", self.index)
+        self.assertEqual(await self.render(data_source), "Ticket INC-1042 was closed")
+
+    async def test_render_data_embeddings_error(self):
+        self.embeddings.status = "error"
+
+        with self.assertRaisesRegex(ApplicationError, "input: failed"):
+            await self.render(self.create_data_source())
@@ -0,0 +1,50 @@
+"""
+Copyright (c) Microsoft Corporation. All rights reserved.
+Licensed under the MIT License.
+"""
+
+from unittest import TestCase
+
+from teams.ai.data_sources import KeywordIndex
+
+
+class TestKeywordIndex(TestCase):
+    def setUp(self):
+        self.index = KeywordIndex()
+        self.index.upsert(
+            {
+                "a": "Printer on floor 3 is jammed, see ticket INC-1042",
+                "b": "Ticket INC-2077: laptop battery drains overnight",
+                "c": "How to reset your password",
+                "d": "Password rules: passwords expire after 90 days. Change your password often.",
+            }
+        )
+
+    def test_query_matches_exact_identifier(self):
+        results = self.index.query("status of INC-1042?")
+
+        self.assertEqual([result.id for result in results], ["a"])
+        self.assertEqual({result.id for result in self.index.query("INC-3000")}, {"a", "b"})
+
+    def test_query_matches_identifier_parts(self):
+        self.assertEqual([result.id for result in self.index.query("2077")], ["b"])
+
+    def test_query_prefers_repeated_terms(self):
+        results = self.index.query("password", top_k=2)
+
+        self.assertEqual({result.id for result in results}, {"c", "d"})
+        self.assertEqual(len(self.index.query("unknown words")), 0)
+
+    def test_upsert_replaces_documents(self):
+        self.index.upsert({"a": "Monitor flickers"})
+
+        self.assertEqual(len(self.index), 4)
+        self.assertEqual(self.index.query("1042"), [])
+        self.assertEqual(self.index.query("monitor")[0].id, "a")
+
+    def test_delete_removes_documents(self):
+        self.index.delete(["b", "missing"])
+
+        self.assertNotIn("b", self.index)
+        self.assertEqual(self.index.query("2077"), [])
+        self.assertNotIn("2077", self.index._postings)
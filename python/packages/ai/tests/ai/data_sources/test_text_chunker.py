@@ -0,0 +1,57 @@
+"""
+Copyright (c) Microsoft Corporation. All rights reserved.
+Licensed under the MIT License.
+"""
+
+from unittest import TestCase
+
+from teams.ai.data_sources import TextChunker
+from teams.ai.tokenizers import GPTTokenizer
+
+
+class TestTextChunker(TestCase):
+    def setUp(self):
+        self.tokenizer = GPTTokenizer()
+
+    def test_short_text_is_one_chunk(self):
+        chunks = TextChunker(self.tokenizer, chunk_size=10, overlap=2).chunk("hello world")
+
+        self.assertEqual(len(chunks), 1)
+        self.assertEqual(chunks[0].text, "hello world")
+        self.assertEqual(chunks[0].length, 2)
+
+    def test_long_text_is_split_with_overlap(self):
+        text = " ".join(str(i) for i in range(100))
+        tokens = self.tokenizer.encode(text)
+        chunks = TextChunker(self.tokenizer, chunk_size=30, overlap=5).chunk(text)
+
+        self.assertTrue(all(chunk.length <= 30 for chunk in chunks))
+        self.assertEqual(chunks[0].start, 0)
+        self.assertEqual(chunks[-1].end, len(tokens))
+
+        for previous, chunk in zip(chunks, chunks[1:]):
+            self.assertEqual(chunk.start, previous.end - 5)
+            self.assertEqual(chunk.text, self.tokenizer.decode(tokens[chunk.start : chunk.end]))
+
+    def test_chunks_end_between_characters(self):
+        text = "日本語のテキストを分割します。🙂👍🏽 絵文字もあります。" * 4
+        tokens = self.tokenizer.encode(text)
+        chunks = TextChunker(self.tokenizer, chunk_size=7, overlap=2).chunk(text)
+
+        self.assertTrue(all("\ufffd" not in chunk.text for chunk in chunks))
+        self.assertEqual(chunks[-1].end, len(tokens))
+
+        for previous, chunk in zip(chunks, chunks[1:]):
+            self.assertGreater(chunk.start, previous.start)
+            self.assertLessEqual(chunk.start, previous.end)
+            self.assertTrue(text.startswith(self.tokenizer.decode(tokens[: chunk.start])))
+
+    def test_whitespace_has_no_chunks(self):
+        self.assertEqual(TextChunker(self.tokenizer).chunk(" \n "), [])
+
+    def test_invalid_overlap_raises(self):
+        with self.assertRaises(ValueError):
+            TextChunker(self.tokenizer, chunk_size=10, overlap=10)
+
+        with self.assertRaises(ValueError):
+            TextChunker(self.tokenizer, chunk_size=0, overlap=0)
@@ -0,0 +1,100 @@
+"""
+Copyright (c) Microsoft Corporation. All rights reserved.
+Licensed under the MIT License.
+"""
+
+from typing import cast
+from unittest import IsolatedAsyncioTestCase
+
+from botbuilder.core import TurnContext
+
+from teams.ai.data_sources import (
+    VectorDataSource,
+    VectorDataSourceOptions,
+    VectorIndex,
+    VectorIndexItem,
+)
+from teams.ai.data_sources.data_source import render_documents
+from teams.ai.tokenizers import GPTTokenizer
+from teams.app_error import ApplicationError
+from teams.state import Memory
+from tests.utils import MockEmbeddings
+
+
+class TestVectorDataSource(IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.tokenizer = GPTTokenizer()
+        self.index = VectorIndex(2)
+        self.index.upsert(
+            [
+                VectorIndexItem("1", "Hello World!", [1, 0], {"lang": "en"}),
+                VectorIndexItem("2", "Goodbye World!", [1, 1], {"lang": "en"}),
+                VectorIndexItem("3", "Bonjour", [1, 0.1], {"lang": "fr"}),
+            ]
+        )
+        self.state = Memory()
+        self.state.set("temp.input", "hello")
+
+    def create_data_source(self, **kwargs) -> VectorDataSource:
+        return VectorDataSource(
+            VectorDataSourceOptions(
+                name="docs", embeddings=MockEmbeddings(), index=self.index, **kwargs
+            )
+        )
+
+    async def test_render_data_returns_most_similar_documents(self):
+        section = await self.create_data_source(max_documents=2, filter={"lang": "en"}).render_data(
+            cast(TurnContext, {}), self.state, self.tokenizer, 100
+        )
+
+        self.assertEqual(section.output, "Hello World!\n\nGoodbye World!")
+        self.assertEqual(section.length, self.tokenizer.count_tokens(section.output))
+        self.assertFalse(section.too_long)
+
+    async def test_render_data_fits_token_budget(self):
+        data_source = self.create_data_source(filter={"lang": "en"})
+
+        section = await data_source.render_data(
+            cast(TurnContext, {}), self.state, self.tokenizer, 5
+        )
+
+        self.assertEqual(section.output, "Hello World!\n\nGood")
+        self.assertEqual(section.length, self.tokenizer.count_tokens(section.output))
+        self.assertLessEqual(section.length, 5)
+        self.assertTrue(section.too_long)
+
+    async def test_render_data_reports_dropped_documents(self):
+        section = await self.create_data_source(filter={"lang": "en"}).render_data(
+            cast(TurnContext, {}), self.state, self.tokenizer, 3
+        )
+
+        self.assertEqual(section.output, "Hello World!")
+        self.assertTrue(section.too_long)
+
+    def test_render_documents_fits_merged_tokens(self):
+        # Separators can merge with the text around them into fewer or more tokens
+        texts = ["a\n", "\nb", "c"]
+        for max_tokens in range(1, 8):
+            section = render_documents(texts, self.tokenizer, max_tokens)
+            self.assertLessEqual(section.length, max_tokens)
+            self.assertLessEqual(self.tokenizer.count_tokens(section.output), max_tokens)
+
+    async def test_render_data_without_input(self):
+        self.state.delete("temp.input")
+
+        section = await self.create_data_source().render_data(
+            cast(TurnContext, {}), self.state, self.tokenizer, 100
+        )
+
+        self.assertEqual(section.output, "")
+        self.assertEqual(section.length, 0)
+
+    async def test_render_data_embeddings_error(self):
+        data_source = VectorDataSource(
+            VectorDataSourceOptions(
+                name="docs", embeddings=MockEmbeddings("error"), index=self.index
+            )
+        )
+
+        with self.assertRaisesRegex(ApplicationError, "input: failed"):
+            await data_source.render_data(cast(TurnContext, {}), self.state, self.tokenizer, 100)
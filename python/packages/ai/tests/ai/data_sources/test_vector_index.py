@@ -0,0 +1,233 @@
+"""
+Copyright (c) Microsoft Corporation. All rights reserved.
+Licensed under the MIT License.
+"""
+
+import json
+import os
+import tempfile
+from typing import Any, List, cast
+from unittest import TestCase, mock
+
+import numpy as np
+
+from teams.ai.data_sources import VectorIndex, VectorIndexItem, VectorQuantization
+
+
+class TestVectorIndex(TestCase):
+    def setUp(self):
+        self.index = VectorIndex(3)
+        self.index.upsert(
+            [
+                VectorIndexItem("a", "apples", [1, 0, 0], {"topic": "fruit"}),
+                VectorIndexItem("b", "bananas", [1, 1, 0], {"topic": "fruit"}),
+                VectorIndexItem("c", "carrots", [0, 1, 0], {"topic": "vegetable"}),
+                VectorIndexItem("d", "dates", [0, 0, 2]),
+            ]
+        )
+
+    def test_query_returns_most_similar_items(self):
+        results = self.index.query([2, 0.1, 0], top_k=2)
+
+        self.assertEqual([result.id for result in results], ["a", "b"])
+        self.assertAlmostEqual(results[0].score, 2 / np.linalg.norm([2, 0.1]), places=5)
+        self.assertEqual(results[0].text, "apples")
+        self.assertEqual(results[0].metadata, {"topic": "fruit"})
+
+    def test_get_returns_item(self):
+        item = self.index.get("d")
+
+        self.assertIsNotNone(item)
+        assert item is not None
+        self.assertEqual(item.text, "dates")
+        self.assertEqual(list(item.vector), [0, 0, 1])
+        self.assertIsNone(self.index.get("e"))
+
+    def test_texts_skip_vectors(self):
+        self.assertEqual(
+            list(self.index.texts()),
+            [("a", "apples"), ("b", "bananas"), ("c", "carrots"), ("d", "dates")],
+        )
+        self.assertEqual(self.index.get_text("c"), "carrots")
+        self.assertIsNone(self.index.get_text("e"))
+
+    def test_query_matches_brute_force(self):
+        rng = np.random.default_rng(7)
+        vectors = rng.normal(size=(500, 16))
+        index = VectorIndex(16)
+        index.upsert([VectorIndexItem(str(i), "", vector) for i, vector in enumerate(vectors)])
+        query = rng.normal(size=16)
+
+        scores = vectors @ query / np.linalg.norm(vectors, axis=1) / np.linalg.norm(query)
+        expected = [str(i) for i in np.argsort(-scores)[:10]]
+        self.assertEqual([result.id for result in index.query(query, top_k=10)], expected)
+
+    def test_query_filters_by_metadata(self):
+        results = self.index.query([1, 0, 0], filter={"topic": "vegetable"})
+        self.assertEqual([result.id for result in results], ["c"])
+
+        results = self.index.query([1, 0, 0], filter={"topic": ["vegetable", "fruit"]})
+        self.assertEqual([result.id for result in results], ["a", "b", "c"])
+
+        results = self.index.query([1, 0, 0], min_score=0.5)
+        self.assertEqual([result.id for result in results], ["a", "b"])
+
+    def test_upsert_and_delete(self):
+        self.index.upsert([VectorIndexItem("a", "apricots", [0, 0, 1], {"topic": "fruit"})])
+        self.index.delete(["d", "c", "unknown", "c"])
+
+        self.assertEqual(len(self.index), 2)
+        self.assertNotIn("c", self.index)
+        results = self.index.query([0, 0, 1], filter={"topic": "fruit"})
+        self.assertEqual([(result.id, result.text) for result in results][0], ("a", "apricots"))
+
+        with self.assertRaises(ValueError):
+            self.index.upsert([VectorIndexItem("e", "eggplants", [1, 0])])
+
+    def test_save_and_load(self):
+        with tempfile.TemporaryDirectory() as folder:
+            self.index.save(folder)
+            generation = next(name for name in os.listdir(folder) if name != "current.json")
+            self.assertEqual(
+                sorted(os.listdir(os.path.join(folder, generation))), ["items.json", "vectors.npy"]
+            )
+
+            loaded = VectorIndex.load(folder)
+            self.assertIsInstance(loaded._vectors, np.memmap)
+            self.assertEqual(
+                [result.id for result in loaded.query([1, 1, 0], top_k=4)],
+                [result.id for result in self.index.query([1, 1, 0], top_k=4)],
+            )
+
+            # Changes are made to a copy of the mapped vectors
+            loaded.upsert([VectorIndexItem("e", "eggplants", [0, 1, 1])])
+            self.assertEqual(len(loaded), 5)
+            self.assertEqual(len(VectorIndex.load(folder, mmap=False)), 4)
+            del loaded
+
+    def test_save_switches_generations(self):
+        with tempfile.TemporaryDirectory() as folder:
+            self.index.save(folder)
+            previous = os.listdir(folder)
+            self.index.delete(["a"])
+            self.index.save(folder)
+
+            # Loads that read the previous pointer retry with the new generation
+            generations = [name for name in previous if name != "current.json"]
+            with open(os.path.join(folder, "current.json"), "r", encoding="utf-8") as file:
+                generations.append(json.load(file)["generation"])
+
+            with mock.patch(
+                "teams.ai.data_sources.vector_index._read_generation", side_effect=generations
+            ):
+                loaded = VectorIndex.load(folder, mmap=False)
+
+            self.assertEqual(len(os.listdir(folder)), 2)
+            self.assertNotIn(generations[0], os.listdir(folder))
+            self.assertEqual(sorted(loaded.ids), ["b", "c", "d"])
+
+    def test_save_keeps_other_folders(self):
+        with tempfile.TemporaryDirectory() as folder:
+            os.makedirs(os.path.join(folder, "notes"))
+            self.index.save(folder)
+            self.index.save(folder)
+
+            names = sorted(os.listdir(folder))
+            self.assertEqual(len(names), 3)
+            self.assertIn("notes", names)
+            self.assertIn("current.json", names)
+            self.assertTrue(any(name.startswith("gen-") for name in names))
+
+
+class TestApproximateVectorIndex(TestCase):
+    def setUp(self):
+        # Clustered vectors, like the embeddings of documents about a few topics
+        rng = np.random.default_rng(3)
+        centers = rng.normal(size=(20, 32))
+        self.vectors = centers[rng.integers(0, 20, 2000)] + 0.3 * rng.normal(size=(2000, 32))
+        self.queries = centers[:10] + 0.3 * rng.normal(size=(10, 32))
+        self.items = [VectorIndexItem(str(i), "", vector) for i, vector in enumerate(self.vectors)]
+
+    def brute_force(self, query: np.ndarray, top_k: int = 10) -> List[str]:
+        scores = self.vectors @ query / np.linalg.norm(self.vectors, axis=1)
+        return [str(i) for i in np.argsort(-scores)[:top_k]]
+
+    def recall(self, index: VectorIndex, **kwargs) -> float:
+        found = 0
+        for query in self.queries:
+            expected = set(self.brute_force(query))
+            found += len(expected & {result.id for result in index.query(query, 10, **kwargs)})
+        return found / (10 * len(self.queries))
+
+    def test_quantized_query_reranks_exactly(self):
+        quantizations: List[VectorQuantization] = ["float16", "int8"]
+        for quantization in quantizations:
+            index = VectorIndex(32, quantization=quantization)
+            index.upsert(self.items)
+            assert index._codes is not None
+            self.assertEqual(index._codes.dtype.name, quantization)
+
+            results = index.query(self.queries[0], top_k=10)
+            scores = [result.score for result in results]
+            self.assertEqual(scores, sorted(scores, reverse=True))
+            self.assertGreaterEqual(self.recall(index), 0.95)
+
+            # Re-ranking every item is exact
+            query = self.queries[1]
+            results = index.query(query, top_k=10, rerank=len(index))
+            self.assertEqual([result.id for result in results], self.brute_force(query))
+
+    def test_trained_query(self):
+        index = VectorIndex(32)
+        index.upsert(self.items)
+        index.train(lists=20)
+
+        self.assertEqual(index.lists, 20)
+        self.assertGreaterEqual(self.recall(index, probes=5), 0.9)
+
+        # Probing every list is exact
+        query = self.queries[2]
+        results = index.query(query, top_k=10, probes=20)
+        self.assertEqual([result.id for result in results], self.brute_force(query))
+
+    def test_trained_upsert_and_delete(self):
+        index = VectorIndex(32, quantization="int8")
+        index.upsert(self.items[:1000])
+        index.train(lists=10)
+        index.upsert(self.items[1000:])
+        index.delete([str(i) for i in range(0, 2000, 3)])
+
+        self.assertEqual(len(index), 1333)
+        assert index._assignments is not None
+        self.assertEqual(int(np.bincount(index._assignments[: len(index)]).sum()), 1333)
+
+        results = index.query(self.vectors[1999], top_k=1, probes=10)
+        self.assertEqual(results[0].id, "1999")
+        self.assertNotEqual(index.query(self.vectors[0], top_k=1, probes=10)[0].id, "0")
+
+    def test_save_and_load_trained(self):
+        index = VectorIndex(32, quantization="int8")
+        index.upsert(self.items)
+        index.train(lists=10)
+
+        with tempfile.TemporaryDirectory() as folder:
+            index.save(folder)
+            loaded = VectorIndex.load(folder)
+
+            self.assertEqual(loaded.quantization, "int8")
+            self.assertEqual(loaded.lists, 10)
+            self.assertEqual(
+                [result.id for result in loaded.query(self.queries[0], top_k=10)],
+                [result.id for result in index.query(self.queries[0], top_k=10)],
+            )
+
+            loaded.upsert([VectorIndexItem("new", "", self.queries[0])])
+            self.assertEqual(loaded.query(self.queries[0], top_k=1, probes=10)[0].id, "new")
+            del loaded
+
+    def test_invalid_arguments(self):
+        with self.assertRaises(ValueError):
+            VectorIndex(32, quantization=cast(Any, "int4"))
+
+        with self.assertRaises(ValueError):
+            VectorIndex(32).train()
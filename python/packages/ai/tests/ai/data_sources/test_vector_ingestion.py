@@ -0,0 +1,193 @@
+"""
+Copyright (c) Microsoft Corporation. All rights reserved.
+Licensed under the MIT License.
+"""
+
+import asyncio
+import os
+import tempfile
+import threading
+from typing import List, Union
+from unittest import IsolatedAsyncioTestCase, mock
+
+from teams.ai.data_sources import (
+    HybridDataSource,
+    HybridDataSourceOptions,
+    VectorIndex,
+    VectorIngestion,
+    VectorIngestionOptions,
+)
+from teams.ai.embeddings import EmbeddingsModel, EmbeddingsResponse
+from teams.ai.tokenizers import GPTTokenizer
+
+
+class MockEmbeddings(EmbeddingsModel):
+    requests: List[List[str]]
+    in_flight: int
+    max_in_flight: int
+    fail: str
+    error: bool
+
+    def __init__(self, fail: str = "", error: bool = False) -> None:
+        self.requests = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.fail = fail
+        self.error = error
+
+    async def create_embeddings(
+        self, inputs: Union[str, List[str], List[int], List[List[int]]]
+    ) -> EmbeddingsResponse:
+        texts = [str(text) for text in inputs]
+        self.requests.append(texts)
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(0.01)
+        self.in_flight -= 1
+
+        if self.fail and any(self.fail in text for text in texts):
+            if self.error:
+                raise RuntimeError("failed")
+            return EmbeddingsResponse(status="error", output="failed")
+
+        return EmbeddingsResponse(
+            status="success", output=[[float(len(text)), 1.0] for text in texts]
+        )
+
+
+class TestVectorIngestion(IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.folder = tempfile.TemporaryDirectory()  # pylint: disable=consider-using-with
+        self.write("a.md", "apples are red")
+        self.write("b.txt", " ".join(str(i) for i in range(50)))
+        self.write("sub/c.md", "carrots are orange")
+        self.write("ignored.py", "print()")
+
+    def tearDown(self):
+        self.folder.cleanup()
+
+    def write(self, name: str, text: str) -> None:
+        path = os.path.join(self.folder.name, name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w", encoding="utf-8") as file:
+            file.write(text)
+
+    def create(self, embeddings: EmbeddingsModel, index: VectorIndex) -> VectorIngestion:
+        return VectorIngestion(
+            VectorIngestionOptions(
+                embeddings=embeddings,
+                index=index,
+                tokenizer=GPTTokenizer(),
+                chunk_size=20,
+                chunk_overlap=5,
+                batch_size=2,
+                concurrency=2,
+            )
+        )
+
+    async def test_should_ingest_files(self):
+        embeddings = MockEmbeddings()
+        index = VectorIndex(2)
+        metrics = await self.create(embeddings, index).ingest(self.folder.name)
+
+        self.assertEqual(metrics.files, 3)
+        self.assertEqual(metrics.files_ingested, 3)
+        self.assertEqual(metrics.chunks, len(index))
+        self.assertGreater(metrics.chunks, 3)
+        self.assertEqual(metrics.requests, len(embeddings.requests))
+        self.assertTrue(all(len(request) <= 2 for request in embeddings.requests))
+        self.assertEqual(embeddings.max_in_flight, 2)
+        self.assertGreater(metrics.tokens_per_second, 0)
+
+        item = index.get("sub/c.md#0")
+        assert item is not None
+        self.assertEqual(item.text, "carrots are orange")
+        self.assertEqual(item.metadata["source"], "sub/c.md")
+        self.assertNotIn("ignored.py#0", index)
+
+    async def test_should_skip_unchanged_files(self):
+        index = VectorIndex(2)
+        await self.create(MockEmbeddings(), index).ingest(self.folder.name)
+        self.write("b.txt", "bananas")
+
+        embeddings = MockEmbeddings()
+        metrics = await self.create(embeddings, index).ingest(self.folder.name)
+
+        self.assertEqual(metrics.files_skipped, 2)
+        self.assertEqual(metrics.files_ingested, 1)
+        self.assertEqual(embeddings.requests, [["bananas"]])
+        self.assertIn("b.txt#0", index)
+        self.assertNotIn("b.txt#1", index)
+
+    async def test_should_retry_failed_files(self):
+        index = VectorIndex(2)
+        metrics = await self.create(MockEmbeddings(fail="carrots"), index).ingest(self.folder.name)
+
+        self.assertEqual(metrics.files_failed, 1)
+        self.assertNotIn("sub/c.md#0", index)
+
+        embeddings = MockEmbeddings()
+        metrics = await self.create(embeddings, index).ingest(self.folder.name)
+
+        self.assertEqual(metrics.files_ingested, 1)
+        self.assertEqual(embeddings.requests, [["carrots are orange"]])
+
+    async def test_should_fail_files_when_embeddings_raise(self):
+        index = VectorIndex(2)
+        embeddings = MockEmbeddings(fail="carrots", error=True)
+        metrics = await self.create(embeddings, index).ingest(self.folder.name)
+
+        self.assertEqual(metrics.files_failed, 1)
+        self.assertEqual(metrics.files_ingested, 2)
+        self.assertEqual(metrics.requests, len(embeddings.requests))
+        self.assertIn("a.md#0", index)
+        self.assertNotIn("sub/c.md#0", index)
+
+    async def test_should_write_through_data_source(self):
+        index = VectorIndex(2)
+        data_source = HybridDataSource(HybridDataSourceOptions(name="docs", index=index))
+        ingestion = self.create(MockEmbeddings(), index)
+        ingestion.options.data_source = data_source
+        await ingestion.ingest(self.folder.name)
+
+        self.assertEqual(
+            [result.id for result in data_source._keywords.query("carrots", 1)], ["sub/c.md#0"]
+        )
+
+        with self.assertRaises(ValueError):
+            VectorIngestion(
+                VectorIngestionOptions(
+                    embeddings=MockEmbeddings(),
+                    index=VectorIndex(2),
+                    tokenizer=GPTTokenizer(),
+                    data_source=data_source,
+                )
+            )
+
+    async def test_should_save_checkpoints(self):
+        with tempfile.TemporaryDirectory() as checkpoint:
+            ingestion = self.create(MockEmbeddings(), VectorIndex(2))
+            ingestion.options.checkpoint_folder = checkpoint
+            await ingestion.ingest(self.folder.name)
+
+            self.assertEqual(len(VectorIndex.load(checkpoint)), len(ingestion.options.index))
+
+    async def test_should_save_checkpoints_in_executor(self):
+        with tempfile.TemporaryDirectory() as checkpoint:
+            index = VectorIndex(2)
+            ingestion = self.create(MockEmbeddings(), index)
+            ingestion.options.checkpoint_folder = checkpoint
+            ingestion.options.checkpoint_interval = 1
+            threads = []
+            save = index.save
+
+            def record_save(folder: str) -> None:
+                threads.append(threading.get_ident())
+                save(folder)
+
+            with mock.patch.object(index, "save", record_save):
+                await ingestion.ingest(self.folder.name)
+
+            # One checkpoint per file and one when ingestion ends
+            self.assertEqual(len(threads), 4)
+            self.assertNotIn(threading.get_ident(), threads)
@@ -3,6 +3,7 @@ Copyright (c) Microsoft Corporation. All rights reserved.
 Licensed under the MIT License.
 """
 
+import asyncio
 from typing import List, Literal, Union
 from unittest import IsolatedAsyncioTestCase, mock
 
@@ -147,3 +148,16 @@ class TestOpenAIEmbeddings(IsolatedAsyncioTestCase):
         self.assertTrue(mock_async_azure_open_ai.called)
         self.assertEqual(section.status, "rate_limited")
         self.assertEqual(section.output, "The embeddings API returned a rate limit error.")
+
+    @mock.patch("openai.AsyncAzureOpenAI", return_value=MockAsyncAzureOpenAI)
+    async def test_batched_embeddings(self, mock_async_azure_open_ai):
+        self.options.batch_window = 0.01
+        self.embeddings = AzureOpenAIEmbeddings(self.options)
+        sections = await asyncio.gather(
+            self.embeddings.create_embeddings("This is"),
+            self.embeddings.create_embeddings("an embedding"),
+        )
+        self.assertTrue(mock_async_azure_open_ai.called)
+        self.assertEqual(sections[0].status, "success")
+        self.assertEqual(sections[0].output, [embedding_2])
+        self.assertEqual(sections[1].output, [embedding_1])
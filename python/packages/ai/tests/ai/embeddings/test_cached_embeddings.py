@@ -0,0 +1,193 @@
+"""
+Copyright (c) Microsoft Corporation. All rights reserved.
+Licensed under the MIT License.
+"""
+
+import os
+import tempfile
+import threading
+from typing import List, Union
+from unittest import IsolatedAsyncioTestCase, mock
+
+from teams.ai.embeddings import (
+    CachedEmbeddings,
+    CachedEmbeddingsOptions,
+    EmbeddingsModel,
+    EmbeddingsResponse,
+    OpenAIEmbeddings,
+    OpenAIEmbeddingsOptions,
+)
+
+
+class MockEmbeddings(EmbeddingsModel):
+    requests: List[Union[str, List[str], List[int], List[List[int]]]]
+    status: str
+
+    def __init__(self, status: str = "success") -> None:
+        self.requests = []
+        self.status = status
+
+    async def create_embeddings(
+        self, inputs: Union[str, List[str], List[int], List[List[int]]]
+    ) -> EmbeddingsResponse:
+        self.requests.append(inputs)
+
+        if self.status == "rate_limited":
+            return EmbeddingsResponse(status="rate_limited", output="rate limited")
+
+        texts = [inputs] if isinstance(inputs, str) else inputs
+        return EmbeddingsResponse(
+            status="success",
+            output=[[float(len(str(text))), 0.5] for text in texts],
+        )
+
+
+class TestCachedEmbeddings(IsolatedAsyncioTestCase):
+    async def test_should_only_send_misses(self):
+        model = MockEmbeddings()
+        cache = CachedEmbeddings(CachedEmbeddingsOptions(embeddings=model, model="test"))
+
+        res = await cache.create_embeddings("a")
+        self.assertEqual(res.output, [[1.0, 0.5]])
+
+        res = await cache.create_embeddings(["a", "bb", "ccc", "bb"])
+        self.assertEqual(res.status, "success")
+        self.assertEqual(res.output, [[1.0, 0.5], [2.0, 0.5], [3.0, 0.5], [2.0, 0.5]])
+        self.assertEqual(model.requests, [["a"], ["bb", "ccc"]])
+        self.assertEqual(cache.hits, 1)
+        self.assertEqual(cache.misses, 3)
+
+        res = await cache.create_embeddings(["ccc", "a"])
+        self.assertEqual(res.output, [[3.0, 0.5], [1.0, 0.5]])
+        self.assertEqual(len(model.requests), 2)
+
+    async def test_should_key_by_model(self):
+        model = MockEmbeddings()
+        first = CachedEmbeddings(CachedEmbeddingsOptions(embeddings=model, model="first"))
+        second = CachedEmbeddings(CachedEmbeddingsOptions(embeddings=model, model="second"))
+        self.assertNotEqual(first._get_key("a"), second._get_key("a"))
+
+    def test_should_read_model_name(self):
+        embeddings = OpenAIEmbeddings(
+            OpenAIEmbeddingsOptions(api_key="empty", model="text-embedding-ada-002")
+        )
+        cache = CachedEmbeddings(CachedEmbeddingsOptions(embeddings=embeddings))
+        self.assertEqual(cache._model, "text-embedding-ada-002")
+
+        with self.assertRaises(ValueError):
+            CachedEmbeddings(CachedEmbeddingsOptions(embeddings=MockEmbeddings()))
+
+    async def test_should_evict_least_recently_used(self):
+        model = MockEmbeddings()
+        cache = CachedEmbeddings(
+            CachedEmbeddingsOptions(embeddings=model, model="test", max_size=2)
+        )
+
+        await cache.create_embeddings(["a", "bb"])
+        await cache.create_embeddings("a")
+        await cache.create_embeddings("ccc")
+        self.assertEqual(cache.size, 2)
+
+        await cache.create_embeddings(["a", "bb"])
+        self.assertEqual(model.requests[-1], ["bb"])
+
+    async def test_should_persist_embeddings(self):
+        with tempfile.TemporaryDirectory() as folder:
+            path = os.path.join(folder, "embeddings.db")
+            cache = CachedEmbeddings(
+                CachedEmbeddingsOptions(embeddings=MockEmbeddings(), model="test", path=path)
+            )
+            await cache.create_embeddings(["a", "bb"])
+            cache.close()
+
+            model = MockEmbeddings()
+            cache = CachedEmbeddings(
+                CachedEmbeddingsOptions(embeddings=model, model="test", path=path)
+            )
+            res = await cache.create_embeddings(["bb", "a", "ccc"])
+            self.assertEqual(res.output, [[2.0, 0.5], [1.0, 0.5], [3.0, 0.5]])
+            self.assertEqual(model.requests, [["ccc"]])
+            self.assertEqual(cache.size, 3)
+
+            cache.clear()
+            await cache.create_embeddings("a")
+            self.assertEqual(model.requests[-1], ["a"])
+            cache.close()
+
+    async def test_should_store_float16(self):
+        with tempfile.TemporaryDirectory() as folder:
+            path = os.path.join(folder, "embeddings.db")
+            model = MockEmbeddings()
+            cache = CachedEmbeddings(
+                CachedEmbeddingsOptions(embeddings=model, model="test", path=path, float16=True)
+            )
+            await cache.create_embeddings("a")
+            self.assertEqual(cache._entries[cache._get_key("a")].dtype.name, "float16")
+            cache.close()
+
+            cache = CachedEmbeddings(
+                CachedEmbeddingsOptions(embeddings=model, model="test", path=path)
+            )
+            res = await cache.create_embeddings("a")
+            self.assertEqual(res.output, [[1.0, 0.5]])
+            self.assertEqual(len(model.requests), 1)
+            cache.close()
+
+    async def test_should_return_stored_float16(self):
+        model = MockEmbeddings()
+        model.create_embeddings = mock.AsyncMock(
+            return_value=EmbeddingsResponse(status="success", output=[[0.1, 0.2]])
+        )
+        cache = CachedEmbeddings(
+            CachedEmbeddingsOptions(embeddings=model, model="test", float16=True)
+        )
+
+        created = await cache.create_embeddings("a")
+        cached = await cache.create_embeddings("a")
+        self.assertEqual(created.output, cached.output)
+        self.assertNotEqual(created.output, [[0.1, 0.2]])
+        self.assertEqual(model.create_embeddings.await_count, 1)
+
+    async def test_should_use_database_from_worker_thread(self):
+        with tempfile.TemporaryDirectory() as folder:
+            path = os.path.join(folder, "embeddings.db")
+            cache = CachedEmbeddings(
+                CachedEmbeddingsOptions(embeddings=MockEmbeddings(), model="test", path=path)
+            )
+            threads = set()
+            read = cache._read
+            write = cache._write
+
+            def record_read(keys):
+                threads.add(threading.get_ident())
+                return read(keys)
+
+            def record_write(rows):
+                threads.add(threading.get_ident())
+                return write(rows)
+
+            with mock.patch.object(cache, "_read", record_read), mock.patch.object(
+                cache, "_write", record_write
+            ):
+                await cache.create_embeddings(["a", "bb"])
+
+            self.assertEqual(len(threads), 1)
+            self.assertNotIn(threading.get_ident(), threads)
+            cache.close()
+
+    async def test_should_return_errors(self):
+        model = MockEmbeddings(status="rate_limited")
+        cache = CachedEmbeddings(CachedEmbeddingsOptions(embeddings=model, model="test"))
+
+        res = await cache.create_embeddings("a")
+        self.assertEqual(res.status, "rate_limited")
+        self.assertEqual(cache.size, 0)
+
+    async def test_should_not_cache_tokens(self):
+        model = MockEmbeddings()
+        cache = CachedEmbeddings(CachedEmbeddingsOptions(embeddings=model, model="test"))
+
+        await cache.create_embeddings([1, 2, 3])
+        await cache.create_embeddings([1, 2, 3])
+        self.assertEqual(model.requests, [[1, 2, 3], [1, 2, 3]])
+        self.assertEqual(cache.size, 0)
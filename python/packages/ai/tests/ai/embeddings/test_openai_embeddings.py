@@ -3,13 +3,19 @@ Copyright (c) Microsoft Corporation. All rights reserved.
 Licensed under the MIT License.
 """
 
-from typing import List, Literal, Union
+import asyncio
+from typing import List, Literal, Union, cast
 from unittest import IsolatedAsyncioTestCase, mock
 
 import httpx
 import openai
 
-from teams.ai.embeddings import OpenAIEmbeddings, OpenAIEmbeddingsOptions
+from teams.ai.embeddings import (
+    EmbeddingsResponse,
+    OpenAIEmbeddings,
+    OpenAIEmbeddingsOptions,
+)
+from teams.ai.tokenizers import GPTTokenizer
 
 embedding_1 = [
     -0.006929283495992422,
@@ -84,6 +90,44 @@ class MockAsyncOpenAIAPIError:
     embeddings = MockAsyncEmbeddingsAPIError()
 
 
+class MockAsyncEmbeddingsBatched:
+    requests: List[List[str]] = []
+
+    async def create(
+        self,
+        input: Union[str, List[str], List[int], List[List[int]]],
+        model: Union[str, Literal["text-embedding-ada-002"]],
+    ) -> openai.types.CreateEmbeddingResponse:
+        # pylint: disable=unused-argument
+        texts = cast(List[str], [input] if isinstance(input, str) else input)
+        self.requests.append(texts)
+
+        if "crash" in texts and len(texts) == 1:
+            raise RuntimeError("crashed")
+
+        if "bad" in texts or "crash" in texts:
+            raise openai.APIError(
+                message="This is a bad request error",
+                request=httpx.Request(method="method", url="url"),
+                body=None,
+            )
+
+        # Each embedding encodes its input so results can be matched to callers
+        return openai.types.CreateEmbeddingResponse(
+            data=[
+                openai.types.Embedding(embedding=[float(len(text))], index=i, object="embedding")
+                for i, text in enumerate(texts)
+            ],
+            model="text-embedding-ada-002",
+            object="list",
+            usage=openai.types.create_embedding_response.Usage(prompt_tokens=5, total_tokens=5),
+        )
+
+
+class MockAsyncOpenAIBatched:
+    embeddings = MockAsyncEmbeddingsBatched()
+
+
 class TestOpenAIEmbeddings(IsolatedAsyncioTestCase):
     options: OpenAIEmbeddingsOptions
     embeddings: OpenAIEmbeddings
@@ -140,3 +184,93 @@ class TestOpenAIEmbeddings(IsolatedAsyncioTestCase):
         self.assertTrue(mock_async_open_ai.called)
         self.assertEqual(section.status, "rate_limited")
         self.assertEqual(section.output, "The embeddings API returned a rate limit error.")
+
+    @mock.patch("openai.AsyncOpenAI", return_value=MockAsyncOpenAIBatched)
+    async def test_batched_embeddings(self, _mock_async_open_ai):
+        MockAsyncOpenAIBatched.embeddings.requests = []
+        self.options.batch_window = 0.01
+        self.embeddings = OpenAIEmbeddings(self.options)
+        sections = await asyncio.gather(
+            self.embeddings.create_embeddings("a"),
+            self.embeddings.create_embeddings(["bb", "ccc"]),
+            self.embeddings.create_embeddings("dddd"),
+        )
+        self.assertEqual(MockAsyncOpenAIBatched.embeddings.requests, [["a", "bb", "ccc", "dddd"]])
+        self.assertEqual([section.status for section in sections], ["success"] * 3)
+        self.assertEqual(sections[0].output, [[1.0]])
+        self.assertEqual(sections[1].output, [[2.0], [3.0]])
+        self.assertEqual(sections[2].output, [[4.0]])
+
+    @mock.patch("openai.AsyncOpenAI", return_value=MockAsyncOpenAIBatched)
+    async def test_batched_embeddings_max_batch_size(self, _mock_async_open_ai):
+        MockAsyncOpenAIBatched.embeddings.requests = []
+        self.options.batch_window = 0.01
+        self.options.max_batch_size = 2
+        self.embeddings = OpenAIEmbeddings(self.options)
+        sections = await asyncio.gather(
+            self.embeddings.create_embeddings("a"),
+            self.embeddings.create_embeddings(["bb", "ccc"]),
+            self.embeddings.create_embeddings("dddd"),
+        )
+        self.assertEqual(
+            MockAsyncOpenAIBatched.embeddings.requests, [["a"], ["bb", "ccc"], ["dddd"]]
+        )
+        self.assertEqual(sections[1].output, [[2.0], [3.0]])
+        self.assertEqual(sections[2].output, [[4.0]])
+
+    @mock.patch("openai.AsyncOpenAI", return_value=MockAsyncOpenAIBatched)
+    async def test_batched_embeddings_error(self, _mock_async_open_ai):
+        MockAsyncOpenAIBatched.embeddings.requests = []
+        self.options.batch_window = 0.01
+        self.embeddings = OpenAIEmbeddings(self.options)
+        sections = await asyncio.gather(
+            self.embeddings.create_embeddings("a"),
+            self.embeddings.create_embeddings("bad"),
+        )
+        self.assertEqual(MockAsyncOpenAIBatched.embeddings.requests, [["a", "bad"], ["a"], ["bad"]])
+        self.assertEqual(sections[0].status, "success")
+        self.assertEqual(sections[0].output, [[1.0]])
+        self.assertEqual(sections[1].status, "error")
+
+    @mock.patch("openai.AsyncOpenAI", return_value=MockAsyncOpenAIBatched)
+    async def test_batched_embeddings_exception(self, _mock_async_open_ai):
+        MockAsyncOpenAIBatched.embeddings.requests = []
+        self.options.batch_window = 0.01
+        self.embeddings = OpenAIEmbeddings(self.options)
+        sections = await asyncio.gather(
+            self.embeddings.create_embeddings("a"),
+            self.embeddings.create_embeddings("crash"),
+            return_exceptions=True,
+        )
+        self.assertEqual(
+            MockAsyncOpenAIBatched.embeddings.requests, [["a", "crash"], ["a"], ["crash"]]
+        )
+        self.assertIsInstance(sections[0], EmbeddingsResponse)
+        self.assertEqual(cast(EmbeddingsResponse, sections[0]).output, [[1.0]])
+        self.assertIsInstance(sections[1], RuntimeError)
+
+    @mock.patch("openai.AsyncOpenAI", return_value=MockAsyncOpenAIBatched)
+    async def test_batched_embeddings_counts_tokens_near_limit(self, _mock_async_open_ai):
+        MockAsyncOpenAIBatched.embeddings.requests = []
+        self.options.batch_window = 0.01
+        self.options.max_batch_tokens = 8
+        with mock.patch.object(GPTTokenizer, "count_tokens", return_value=1) as count_tokens:
+            self.embeddings = OpenAIEmbeddings(self.options)
+            await asyncio.gather(
+                self.embeddings.create_embeddings("a"),
+                self.embeddings.create_embeddings("bb"),
+                self.embeddings.create_embeddings(["cccc", "dddd"]),
+            )
+        self.assertEqual(count_tokens.call_count, 2)
+        self.assertEqual(MockAsyncOpenAIBatched.embeddings.requests, [["a", "bb", "cccc", "dddd"]])
+
+    @mock.patch("openai.AsyncOpenAI", return_value=MockAsyncOpenAIRateLimited)
+    async def test_batched_embeddings_rate_limited(self, _mock_async_open_ai):
+        self.options.batch_window = 0.01
+        self.options.retry_policy = [0]
+        self.embeddings = OpenAIEmbeddings(self.options)
+        sections = await asyncio.gather(
+            self.embeddings.create_embeddings("a"),
+            self.embeddings.create_embeddings("b"),
+        )
+        self.assertEqual([section.status for section in sections], ["rate_limited"] * 2)
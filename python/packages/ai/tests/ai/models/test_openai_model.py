@@ -9,8 +9,9 @@ from unittest import IsolatedAsyncioTestCase, mock
 
 import httpx
 import openai
-from openai.types import chat
+from openai.types import CompletionUsage, chat
 from openai.types.chat import chat_completion_message_tool_call
+from openai.types.completion_usage import PromptTokensDetails
 
 from teams.ai.augmentations.monologue_augmentation import MonologueAugmentation
 from teams.ai.augmentations.tools_augmentation import ToolsAugmentation
@@ -135,6 +136,12 @@ class MockAsyncCompletions:
             created=0,
             model=kwargs["model"],
             object="chat.completion",
+            usage=CompletionUsage(
+                prompt_tokens=10,
+                completion_tokens=1,
+                total_tokens=11,
+                prompt_tokens_details=PromptTokensDetails(cached_tokens=8),
+            ),
         )
 
     async def handle_tool_call(self, **kwargs) -> chat.ChatCompletion:
@@ -286,6 +293,38 @@ class TestOpenAIModel(IsolatedAsyncioTestCase):
         self.assertTrue(mock_async_openai.called)
         self.assertEqual(res.status, "success")
 
+    @mock.patch("openai.AsyncOpenAI", return_value=MockAsyncOpenAI)
+    async def test_should_report_usage(self, mock_async_openai):
+        context = self.create_mock_context()
+        state = TurnState()
+        state.temp = {}
+        await state.load(context)
+
+        model = OpenAIModel(OpenAIModelOptions(api_key="", default_model="model"))
+        res = await model.complete_prompt(
+            context=context,
+            memory=state,
+            functions=cast(PromptFunctions, {}),
+            tokenizer=GPTTokenizer(),
+            template=PromptTemplate(
+                name="default",
+                prompt=Prompt([TextSection(text="this is a test prompt", role="system")]),
+                config=PromptTemplateConfig(
+                    schema=1.0,
+                    type="completion",
+                    description="test",
+                    completion=CompletionConfig(completion_type="chat"),
+                ),
+            ),
+        )
+
+        self.assertTrue(mock_async_openai.called)
+        assert res.usage is not None
+        self.assertEqual(res.usage.prompt_tokens, 10)
+        self.assertEqual(res.usage.completion_tokens, 1)
+        self.assertEqual(res.usage.cached_tokens, 8)
+        self.assertIsNotNone(res.usage.prefix_hash)
+
     @mock.patch("openai.AsyncOpenAI", return_value=MockAsyncOpenAI)
     async def test_o1_model_should_use_user_message_over_system_message(self, mock_async_openai):
         context = self.create_mock_context()
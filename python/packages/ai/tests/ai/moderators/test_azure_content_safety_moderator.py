@@ -3,9 +3,12 @@ Copyright (c) Microsoft Corporation. All rights reserved.
 Licensed under the MIT License.
 """
 
-from typing import Any, cast
+import asyncio
+import threading
+from typing import Any, List, cast
 from unittest import IsolatedAsyncioTestCase, mock
 
+import aiohttp
 from azure.core.exceptions import HttpResponseError
 from botbuilder.core import TurnContext
 
@@ -14,6 +17,7 @@ from teams.ai.actions import ActionTypes
 from teams.ai.moderators import (
     AzureContentSafetyModerator,
     AzureContentSafetyModeratorOptions,
+    ModerationCache,
 )
 from teams.ai.planners import Plan, PredictedDoCommand, PredictedSayCommand
 from teams.ai.prompts.message import Message
@@ -21,12 +25,17 @@ from teams.state import ConversationState, TempState, TurnState, UserState
 
 
 class MockContentSafetyClient:
-    def analyze_text(self, *_args, **_kwargs: Any):
+    closed = False
+
+    async def analyze_text(self, *_args, **_kwargs: Any):
         return {}
 
+    async def close(self):
+        self.closed = True
+
 
 class MockContentSafetyClientWithResults:
-    def analyze_text(self, *_args, **_kwargs: Any):
+    async def analyze_text(self, *_args, **_kwargs: Any):
         return {
             "blocklistsMatch": [
                 {
@@ -45,10 +54,36 @@ class MockContentSafetyClientWithResults:
 
 
 class MockContentSafetyClientWithError:
-    def analyze_text(self, *_args, **_kwargs: Any):
+    async def analyze_text(self, *_args, **_kwargs: Any):
         raise HttpResponseError("test")
 
 
+class MockContentSafetyClientConcurrent:
+    def __init__(self, count: int) -> None:
+        # Requests only complete once all of them are in flight
+        self.barrier = threading.Barrier(count, timeout=5)
+
+    def analyze_text(self, *_args, **kwargs: Any):
+        self.barrier.wait()
+        severity = 4 if "bad" in kwargs["options"].text else 0
+        return {"categoriesAnalysis": [{"category": "Violence", "severity": severity}]}
+
+
+class MockContentSafetyClientInFlight:
+    def __init__(self) -> None:
+        self.texts: List[str] = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def analyze_text(self, *_args, **kwargs: Any):
+        self.texts.append(kwargs["options"].text)
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(0.01)
+        self.in_flight -= 1
+        return {"categoriesAnalysis": [{"category": "Violence", "severity": 0}]}
+
+
 class TestAzureContentSafetyModerator(IsolatedAsyncioTestCase):
     def create_mock_context(
         self, channel_id="channel1", bot_id="bot1", conversation_id="conversation1", user_id="user1"
@@ -67,7 +102,7 @@ class TestAzureContentSafetyModerator(IsolatedAsyncioTestCase):
             )
 
     @mock.patch(
-        "azure.ai.contentsafety.ContentSafetyClient", return_value=MockContentSafetyClient()
+        "azure.ai.contentsafety.aio.ContentSafetyClient", return_value=MockContentSafetyClient()
     )
     async def test_should_not_review_input(self, mock_async_openai):
         moderator = AzureContentSafetyModerator(
@@ -78,7 +113,7 @@ class TestAzureContentSafetyModerator(IsolatedAsyncioTestCase):
         self.assertIsNone(plan)
 
     @mock.patch(
-        "azure.ai.contentsafety.ContentSafetyClient",
+        "azure.ai.contentsafety.aio.ContentSafetyClient",
         return_value=MockContentSafetyClientWithResults(),
     )
     async def test_should_review_input_and_flag(self, mock_async_openai):
@@ -96,7 +131,7 @@ class TestAzureContentSafetyModerator(IsolatedAsyncioTestCase):
         self.assertEqual(plan.commands[0].action, ActionTypes.FLAGGED_INPUT)
 
     @mock.patch(
-        "azure.ai.contentsafety.ContentSafetyClient",
+        "azure.ai.contentsafety.aio.ContentSafetyClient",
         return_value=MockContentSafetyClientWithError(),
     )
     async def test_should_review_input_and_error(self, mock_async_openai):
@@ -114,7 +149,7 @@ class TestAzureContentSafetyModerator(IsolatedAsyncioTestCase):
         self.assertEqual(plan.commands[0].action, ActionTypes.HTTP_ERROR)
 
     @mock.patch(
-        "azure.ai.contentsafety.ContentSafetyClient", return_value=MockContentSafetyClient()
+        "azure.ai.contentsafety.aio.ContentSafetyClient", return_value=MockContentSafetyClient()
     )
     async def test_should_not_review_output(self, mock_async_openai):
         moderator = AzureContentSafetyModerator(
@@ -130,7 +165,7 @@ class TestAzureContentSafetyModerator(IsolatedAsyncioTestCase):
         self.assertEqual(plan, output)
 
     @mock.patch(
-        "azure.ai.contentsafety.ContentSafetyClient",
+        "azure.ai.contentsafety.aio.ContentSafetyClient",
         return_value=MockContentSafetyClientWithResults(),
     )
     async def test_should_review_output_and_flag(self, mock_async_openai):
@@ -151,7 +186,7 @@ class TestAzureContentSafetyModerator(IsolatedAsyncioTestCase):
         self.assertEqual(output.commands[0].action, ActionTypes.FLAGGED_OUTPUT)
 
     @mock.patch(
-        "azure.ai.contentsafety.ContentSafetyClient",
+        "azure.ai.contentsafety.aio.ContentSafetyClient",
         return_value=MockContentSafetyClientWithError(),
     )
     async def test_should_review_output_and_error(self, mock_async_openai):
@@ -170,3 +205,97 @@ class TestAzureContentSafetyModerator(IsolatedAsyncioTestCase):
         self.assertEqual(output.commands[0].type, "DO")
         assert isinstance(output.commands[0], PredictedDoCommand)
         self.assertEqual(output.commands[0].action, ActionTypes.HTTP_ERROR)
+
+    async def test_should_review_output_concurrently_with_thread_pool(self):
+        with mock.patch(
+            "azure.ai.contentsafety.ContentSafetyClient",
+            return_value=MockContentSafetyClientConcurrent(2),
+        ):
+            moderator = AzureContentSafetyModerator(
+                options=AzureContentSafetyModeratorOptions(
+                    api_key="", moderate="output", endpoint="", use_thread_pool=True
+                )
+            )
+        context = self.create_mock_context()
+        state = await TurnState[ConversationState, UserState, TempState].load(context)
+        plan = Plan(
+            commands=[
+                PredictedSayCommand(response=Message[str](role="assistant", content=content))
+                for content in ["test", "bad", "test"]
+            ]
+        )
+        output = await moderator.review_output(context=context, state=state, plan=plan)
+        self.assertEqual(len(output.commands), 1)
+        assert isinstance(output.commands[0], PredictedDoCommand)
+        self.assertEqual(output.commands[0].action, ActionTypes.FLAGGED_OUTPUT)
+        self.assertEqual(
+            output.commands[0].parameters,
+            {"flagged": True, "categories": {"violence": True}, "category_scores": {"violence": 4}},
+        )
+
+    async def test_should_bound_and_deduplicate_output_requests(self):
+        client = MockContentSafetyClientInFlight()
+        with mock.patch("azure.ai.contentsafety.aio.ContentSafetyClient", return_value=client):
+            moderator = AzureContentSafetyModerator(
+                options=AzureContentSafetyModeratorOptions(
+                    api_key="", moderate="output", endpoint="", max_concurrency=2
+                )
+            )
+        context = self.create_mock_context()
+        state = await TurnState[ConversationState, UserState, TempState].load(context)
+        plan = Plan(
+            commands=[
+                PredictedSayCommand(response=Message[str](role="assistant", content=content))
+                for content in ["a", "b", "a", "c", "d", "b"]
+            ]
+        )
+
+        output = await moderator.review_output(context=context, state=state, plan=plan)
+        self.assertEqual(output, plan)
+        self.assertEqual(sorted(client.texts), ["a", "b", "c", "d"])
+        self.assertEqual(client.max_in_flight, 2)
+
+    async def test_should_use_shared_session(self):
+        session = aiohttp.ClientSession()
+        try:
+            with mock.patch(
+                "azure.ai.contentsafety.aio.ContentSafetyClient",
+                return_value=MockContentSafetyClient(),
+            ) as mock_client:
+                moderator = AzureContentSafetyModerator(
+                    options=AzureContentSafetyModeratorOptions(
+                        api_key="", endpoint="", session=session
+                    )
+                )
+            transport = mock_client.call_args.kwargs["transport"]
+            self.assertIs(transport.session, session)
+
+            await moderator.close()
+            self.assertTrue(mock_client.return_value.closed)
+            self.assertFalse(session.closed)
+        finally:
+            await session.close()
+
+    async def test_should_reuse_cached_results(self):
+        client = MockContentSafetyClientWithResults()
+        with mock.patch(
+            "azure.ai.contentsafety.aio.ContentSafetyClient", return_value=client
+        ), mock.patch.object(client, "analyze_text", wraps=client.analyze_text) as analyze_text:
+            moderator = AzureContentSafetyModerator(
+                options=AzureContentSafetyModeratorOptions(
+                    api_key="", endpoint="", cache=ModerationCache(thresholds={"hate": 7})
+                )
+            )
+            context = self.create_mock_context()
+            state = await TurnState[ConversationState, UserState, TempState].load(context)
+            state.temp.input = "test"
+            self.assertIsNone(await moderator.review_input(context=context, state=state))
+
+            plan = Plan(
+                commands=[
+                    PredictedSayCommand(response=Message[str](role="assistant", content="test"))
+                ]
+            )
+            output = await moderator.review_output(context=context, state=state, plan=plan)
+            self.assertEqual(plan, output)
+            self.assertEqual(analyze_text.call_count, 1)
@@ -0,0 +1,63 @@
+"""
+Copyright (c) Microsoft Corporation. All rights reserved.
+Licensed under the MIT License.
+"""
+
+from unittest import TestCase, mock
+
+from teams.ai.moderators import ModerationCache
+
+RESULT = {
+    "flagged": False,
+    "categories": {"hate": False, "violence": False},
+    "category_scores": {"hate": 0.4, "violence": 0.1},
+}
+
+
+class TestModerationCache(TestCase):
+    def test_should_get_cached_result(self):
+        cache = ModerationCache()
+        self.assertIsNone(cache.get("hello world", "model"))
+        self.assertEqual(cache.set("hello world", "model", RESULT), RESULT)
+        self.assertEqual(cache.get(" hello \n world ", "model"), RESULT)
+        self.assertIsNone(cache.get("hello world", "other-model"))
+        self.assertEqual(cache.hits, 1)
+        self.assertEqual(cache.misses, 2)
+
+        cache.clear()
+        self.assertEqual(cache.size, 0)
+        self.assertEqual(cache.hits, 0)
+        self.assertEqual(cache.misses, 0)
+
+    def test_should_expire_results(self):
+        cache = ModerationCache(ttl=10)
+        with mock.patch("time.monotonic", return_value=100):
+            cache.set("hello", "model", RESULT)
+        with mock.patch("time.monotonic", return_value=109):
+            self.assertEqual(cache.get("hello", "model"), RESULT)
+        with mock.patch("time.monotonic", return_value=110):
+            self.assertIsNone(cache.get("hello", "model"))
+        self.assertEqual(cache.size, 0)
+
+    def test_should_evict_least_recently_used(self):
+        cache = ModerationCache(max_size=2)
+        cache.set("a", "model", RESULT)
+        cache.set("b", "model", RESULT)
+        cache.get("a", "model")
+        cache.set("c", "model", RESULT)
+        self.assertEqual(cache.size, 2)
+        self.assertIsNotNone(cache.get("a", "model"))
+        self.assertIsNone(cache.get("b", "model"))
+
+    def test_should_apply_thresholds(self):
+        cache = ModerationCache(thresholds={"hate": 0.3})
+        result = cache.set("hello", "model", RESULT)
+        self.assertTrue(result["flagged"])
+        self.assertEqual(result["categories"], {"hate": True, "violence": False})
+
+        # Cached results are re-evaluated when thresholds change
+        cache.thresholds["hate"] = 0.5
+        cached = cache.get("hello", "model")
+        assert cached is not None
+        self.assertFalse(cached["flagged"])
+        self.assertEqual(cached["categories"], {"hate": False, "violence": False})
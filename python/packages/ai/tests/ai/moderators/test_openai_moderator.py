@@ -11,7 +11,11 @@ import openai
 from botbuilder.core import TurnContext
 
 from teams.ai.actions import ActionTypes
-from teams.ai.moderators import OpenAIModerator, OpenAIModeratorOptions
+from teams.ai.moderators import (
+    ModerationCache,
+    OpenAIModerator,
+    OpenAIModeratorOptions,
+)
 from teams.ai.planners import Plan, PredictedDoCommand, PredictedSayCommand
 from teams.ai.prompts.message import Message
 from teams.state import ConversationState, TempState, TurnState, UserState
@@ -142,6 +146,26 @@ class MockAsyncModerationsRateLimited:
         )
 
 
+class MockAsyncModerationsBatched:
+    inputs: List[Union[str, List[str]]]
+
+    def __init__(self) -> None:
+        self.inputs = []
+
+    async def create(
+        self, *, input: Union[str, List[str]], model: str = "text-moderation-latest"
+    ) -> openai.types.ModerationCreateResponse:
+        # Flags texts containing "bad" with one result per text
+        self.inputs.append(input)
+        flagged = (await MockAsyncModerationsWithResults().create(input="", model=model)).results[0]
+        texts = input if isinstance(input, list) else [input]
+        return openai.types.ModerationCreateResponse(
+            id="",
+            model=model,
+            results=[flagged.model_copy(update={"flagged": "bad" in text}) for text in texts],
+        )
+
+
 class MockAsyncOpenAI:
     moderations = MockAsyncModerations()
 
@@ -241,3 +265,63 @@ class TestOpenAIModerator(IsolatedAsyncioTestCase):
         self.assertEqual(output.commands[0].type, "DO")
         assert isinstance(output.commands[0], PredictedDoCommand)
         self.assertEqual(output.commands[0].action, ActionTypes.HTTP_ERROR)
+
+    async def test_should_review_output_in_batches(self):
+        moderations = MockAsyncModerationsBatched()
+        with mock.patch("openai.AsyncOpenAI") as mock_async_openai:
+            mock_async_openai.return_value.moderations = moderations
+            moderator = OpenAIModerator(
+                options=OpenAIModeratorOptions(api_key="", moderate="output")
+            )
+        context = self.create_mock_context()
+        state = await TurnState[ConversationState, UserState, TempState].load(context)
+        plan = Plan(
+            commands=[
+                PredictedSayCommand(response=Message[str](role="assistant", content=f"test {i}"))
+                for i in range(40)
+            ]
+        )
+
+        output = await moderator.review_output(context=context, state=state, plan=plan)
+        self.assertEqual(plan, output)
+        self.assertEqual(
+            moderations.inputs,
+            [[f"test {i}" for i in range(32)], [f"test {i}" for i in range(32, 40)]],
+        )
+
+        plan.commands[35] = PredictedSayCommand(
+            response=Message[str](role="assistant", content="bad")
+        )
+        output = await moderator.review_output(context=context, state=state, plan=plan)
+        self.assertEqual(len(output.commands), 1)
+        assert isinstance(output.commands[0], PredictedDoCommand)
+        self.assertEqual(output.commands[0].action, ActionTypes.FLAGGED_OUTPUT)
+        self.assertTrue(output.commands[0].parameters["flagged"])
+
+    async def test_should_share_cache_between_input_and_output(self):
+        moderations = MockAsyncModerationsBatched()
+        cache = ModerationCache()
+        with mock.patch("openai.AsyncOpenAI") as mock_async_openai:
+            mock_async_openai.return_value.moderations = moderations
+            moderator = OpenAIModerator(options=OpenAIModeratorOptions(api_key="", cache=cache))
+        context = self.create_mock_context()
+        state = await TurnState[ConversationState, UserState, TempState].load(context)
+        state.temp.input = "bad"
+
+        plan = await moderator.review_input(context=context, state=state)
+        assert plan is not None
+        assert isinstance(plan.commands[0], PredictedDoCommand)
+        self.assertEqual(plan.commands[0].action, ActionTypes.FLAGGED_INPUT)
+
+        plan = Plan(
+            commands=[
+                PredictedSayCommand(response=Message[str](role="assistant", content=content))
+                for content in ["fine", "bad", "fine"]
+            ]
+        )
+        output = await moderator.review_output(context=context, state=state, plan=plan)
+        assert isinstance(output.commands[0], PredictedDoCommand)
+        self.assertEqual(output.commands[0].action, ActionTypes.FLAGGED_OUTPUT)
+        self.assertEqual(moderations.inputs, [["bad"], ["fine"]])
+        self.assertEqual(cache.hits, 1)
+        self.assertEqual(cache.misses, 3)
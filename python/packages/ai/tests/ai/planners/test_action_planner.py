@@ -0,0 +1,246 @@
+"""
+Copyright (c) Microsoft Corporation. All rights reserved.
+Licensed under the MIT License.
+"""
+
+import asyncio
+import json
+from typing import List, Optional
+from unittest import IsolatedAsyncioTestCase, mock
+
+from teams.ai.augmentations import SequenceAugmentation
+from teams.ai.models import (
+    ChatCompletionAction,
+    PromptCompletionModel,
+    PromptCompletionModelEmitter,
+    PromptResponse,
+)
+from teams.ai.planners import (
+    ActionPlanner,
+    ActionPlannerOptions,
+    PredictedDoCommand,
+    PredictedSayCommand,
+    StreamingPlan,
+)
+from teams.ai.prompts import (
+    Citation,
+    CompletionConfig,
+    Message,
+    MessageContext,
+    Prompt,
+    PromptManager,
+    PromptManagerOptions,
+    PromptTemplate,
+    PromptTemplateConfig,
+)
+from teams.ai.tokenizers import GPTTokenizer
+from teams.app_error import ApplicationError
+from teams.state import ConversationState, TempState, TurnState, UserState
+from teams.streaming import PromptChunk
+
+PLAN = {
+    "type": "plan",
+    "commands": [
+        {"type": "DO", "action": "test1", "parameters": {"foo": "bar"}},
+        {"type": "SAY", "response": "hello world"},
+    ],
+}
+
+
+class MockStreamingModel(PromptCompletionModel):
+    chunks: List[str]
+    finish: asyncio.Event
+    error: Optional[str]
+    message_context: Optional[MessageContext]
+
+    def __init__(
+        self,
+        chunks: List[str],
+        error: Optional[str] = None,
+        message_context: Optional[MessageContext] = None,
+    ) -> None:
+        self.events = PromptCompletionModelEmitter()
+        self.chunks = chunks
+        self.finish = asyncio.Event()
+        self.error = error
+        self.message_context = message_context
+
+    async def complete_prompt(self, context, memory, functions, tokenizer, template):
+        assert self.events is not None
+        self.events.emit_before_completion(context, memory, functions, tokenizer, template, True)
+
+        for i, chunk in enumerate(self.chunks):
+            # Hold the rest of the response until the test finishes it
+            if i == len(self.chunks) - 1:
+                await self.finish.wait()
+
+            # Like Azure OpenAI, the citations arrive with the first chunk
+            delta = Message(
+                role="assistant",
+                content=chunk,
+                context=self.message_context if i == 0 else None,
+            )
+            self.events.emit_chunk_received(context, memory, PromptChunk(delta=delta))
+            await asyncio.sleep(0)
+
+        if self.error is not None:
+            return PromptResponse[str](status="error", error=self.error)
+
+        return PromptResponse[str](message=Message(role="assistant", content="".join(self.chunks)))
+
+
+class MockRepairedModel(MockStreamingModel):
+    repair: str
+
+    def __init__(self, chunks: List[str], repair: str) -> None:
+        super().__init__(chunks)
+        self.repair = repair
+        self.finish.set()
+
+    async def complete_prompt(self, context, memory, functions, tokenizer, template):
+        if self.chunks:
+            res = await super().complete_prompt(context, memory, functions, tokenizer, template)
+            self.chunks = []
+            return res
+
+        assert self.events is not None
+        self.events.emit_before_completion(context, memory, functions, tokenizer, template, True)
+        return PromptResponse[str](message=Message(role="assistant", content=self.repair))
+
+
+class TestActionPlanner(IsolatedAsyncioTestCase):
+    def create_planner(self, model: PromptCompletionModel, stream_plans: bool) -> ActionPlanner:
+        actions = [
+            ChatCompletionAction(
+                name="test1",
+                description="test action",
+                parameters={"type": "object", "properties": {"foo": {"type": "string"}}},
+            )
+        ]
+        template = PromptTemplate(
+            name="default",
+            prompt=Prompt([]),
+            config=PromptTemplateConfig(
+                schema=1.1,
+                type="completion",
+                description="test",
+                completion=CompletionConfig(completion_type="chat"),
+            ),
+            actions=actions,
+            augmentation=SequenceAugmentation(actions),
+        )
+        prompts = PromptManager(PromptManagerOptions(prompts_folder=""))
+        prompts.add_prompt(template)
+        return ActionPlanner(
+            ActionPlannerOptions(
+                model=model, prompts=prompts, tokenizer=GPTTokenizer(), stream_plans=stream_plans
+            )
+        )
+
+    def test_default_tokenizer_follows_prompt_model(self):
+        planner = self.create_planner(MockStreamingModel([]), False)
+        planner.options.tokenizer = ActionPlannerOptions(
+            model=planner.options.model, prompts=planner.options.prompts
+        ).tokenizer
+        template = PromptTemplate(
+            name="gpt-4o",
+            prompt=Prompt([]),
+            config=PromptTemplateConfig(
+                schema=1.1,
+                type="completion",
+                description="test",
+                completion=CompletionConfig(completion_type="chat", model="gpt-4o"),
+            ),
+        )
+
+        self.assertIsInstance(planner.options.tokenizer, GPTTokenizer)
+        self.assertIs(planner._get_tokenizer(template), GPTTokenizer.for_model("gpt-4o"))
+
+        tokenizer = GPTTokenizer()
+        planner.options.tokenizer = tokenizer
+        self.assertIs(planner._get_tokenizer(template), tokenizer)
+
+    async def test_continue_task_streams_plan(self):
+        context = mock.MagicMock()
+        state = await TurnState[ConversationState, UserState, TempState].load(context)
+        text = json.dumps(PLAN)
+        split = text.index("{", text.index("{", 1) + 1) + 1
+        model = MockStreamingModel([text[:split], text[split:-3], text[-3:]])
+        planner = self.create_planner(model, True)
+
+        plan = await planner.continue_task(context, state)
+
+        assert isinstance(plan, StreamingPlan)
+        self.assertEqual(
+            plan.commands, [PredictedDoCommand(action="test1", parameters={"foo": "bar"})]
+        )
+        self.assertFalse(plan.ended)
+        self.assertIsNone(state.get("temp.streamer"))
+
+        model.finish.set()
+        self.assertTrue(await plan.wait_for_command(1))
+        self.assertFalse(await plan.wait_for_command(2))
+        assert isinstance(plan.commands[1], PredictedSayCommand)
+        assert plan.commands[1].response is not None
+        self.assertEqual(plan.commands[1].response.content, "hello world")
+
+    async def test_continue_task_streams_say_context(self):
+        context = mock.MagicMock()
+        state = await TurnState[ConversationState, UserState, TempState].load(context)
+        message_context = MessageContext(
+            citations=[Citation(content="content", title="title", url=None, filepath=None)],
+            intent="intent",
+        )
+        text = json.dumps(PLAN)
+        model = MockStreamingModel([text[:-3], text[-3:]], message_context=message_context)
+        model.finish.set()
+        planner = self.create_planner(model, True)
+
+        plan = await planner.continue_task(context, state)
+
+        assert isinstance(plan, StreamingPlan)
+        self.assertTrue(await plan.wait_for_command(1))
+        assert isinstance(plan.commands[1], PredictedSayCommand)
+        assert plan.commands[1].response is not None
+        self.assertIs(plan.commands[1].response.context, message_context)
+
+    async def test_continue_task_ends_plan_with_error(self):
+        context = mock.MagicMock()
+        state = await TurnState[ConversationState, UserState, TempState].load(context)
+        model = MockStreamingModel(
+            [
+                '{"type":"plan","commands":[{"type":"DO","action":"test1",'
+                + '"parameters":{"foo":"bar"}}',
+                "",
+            ],
+            "failed",
+        )
+        planner = self.create_planner(model, True)
+
+        plan = await planner.continue_task(context, state)
+        model.finish.set()
+
+        assert isinstance(plan, StreamingPlan)
+        self.assertTrue(await plan.wait_for_command(0))
+        with self.assertRaisesRegex(ApplicationError, "failed"):
+            await plan.wait_for_command(1)
+
+    async def test_continue_task_ends_plan_when_repair_changes_it(self):
+        context = mock.MagicMock()
+        state = await TurnState[ConversationState, UserState, TempState].load(context)
+        model = MockRepairedModel(
+            [
+                '{"type":"plan","commands":[{"type":"DO","action":"test1",'
+                + '"parameters":{"foo":"bar"}},',
+                '{"type":"DO","action":"unknown"}]}',
+            ],
+            json.dumps({"type": "plan", "commands": [{"type": "SAY", "response": "repaired"}]}),
+        )
+        planner = self.create_planner(model, True)
+
+        plan = await planner.continue_task(context, state)
+
+        assert isinstance(plan, StreamingPlan)
+        self.assertTrue(await plan.wait_for_command(0))
+        with self.assertRaisesRegex(ApplicationError, "streamed plan"):
+            await plan.wait_for_command(1)
@@ -0,0 +1,93 @@
+"""
+Copyright (c) Microsoft Corporation. All rights reserved.
+Licensed under the MIT License.
+"""
+
+import asyncio
+from unittest import IsolatedAsyncioTestCase
+
+from teams.ai.planners import (
+    Plan,
+    PredictedDoCommand,
+    PredictedSayCommand,
+    StreamingPlan,
+)
+from teams.ai.prompts import Message
+
+
+class TestStreamingPlan(IsolatedAsyncioTestCase):
+    async def test_should_wait_for_commands(self):
+        plan = StreamingPlan()
+        waiting = asyncio.ensure_future(plan.wait_for_command(0))
+        await asyncio.sleep(0)
+        self.assertFalse(waiting.done())
+
+        plan.add_command(PredictedDoCommand(action="a"))
+        self.assertTrue(await waiting)
+
+        waiting = asyncio.ensure_future(plan.wait_for_command(1))
+        plan.end()
+        self.assertFalse(await waiting)
+        self.assertTrue(plan.ended)
+
+    async def test_should_raise_error_after_commands(self):
+        plan = StreamingPlan([PredictedDoCommand(action="a")])
+        plan.end(ValueError("failed"))
+
+        self.assertTrue(await plan.wait_for_command(0))
+        with self.assertRaises(ValueError):
+            await plan.wait_for_command(1)
+
+    async def test_should_review_commands_in_batches(self):
+        plan = StreamingPlan()
+        flagged = Plan(commands=[PredictedDoCommand(action="flagged")])
+        reviewed_plans = []
+
+        async def review(p: Plan) -> Plan:
+            reviewed_plans.append(p)
+            if any(isinstance(command, PredictedSayCommand) for command in p.commands):
+                return flagged
+            return p
+
+        reviewed = plan.review(review)
+        plan.add_command(PredictedDoCommand(action="a"))
+        self.assertTrue(await reviewed.wait_for_command(0))
+
+        plan.add_command(PredictedSayCommand(response=Message(role="assistant", content="bad")))
+        plan.add_command(PredictedDoCommand(action="b"))
+        plan.end()
+
+        self.assertTrue(await reviewed.wait_for_command(1))
+        self.assertFalse(await reviewed.wait_for_command(2))
+        self.assertEqual(reviewed.commands, [PredictedDoCommand(action="a"), flagged.commands[0]])
+        self.assertEqual([len(p.commands) for p in reviewed_plans], [1, 2])
+
+    async def test_should_cancel_tasks(self):
+        plan = StreamingPlan()
+        task = asyncio.ensure_future(asyncio.sleep(1))
+        plan.add_task(task)
+        reviewed = plan.review(lambda p: asyncio.sleep(0, p))
+
+        reviewed.cancel()
+        await asyncio.sleep(0)
+
+        self.assertTrue(task.cancelled())
+        self.assertTrue(reviewed.ended)
+        self.assertFalse(await reviewed.wait_for_command(0))
+
+    async def test_should_wait_for_tasks_when_closed(self):
+        plan = StreamingPlan()
+        finished = []
+
+        async def complete():
+            try:
+                await asyncio.sleep(1)
+            finally:
+                finished.append(True)
+
+        plan.add_task(asyncio.ensure_future(complete()))
+        await asyncio.sleep(0)
+        await plan.close()
+
+        self.assertEqual(finished, [True])
+        self.assertTrue(plan.ended)
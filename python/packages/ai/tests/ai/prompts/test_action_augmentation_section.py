@@ -0,0 +1,54 @@
+"""
+Copyright (c) Microsoft Corporation. All rights reserved.
+Licensed under the MIT License.
+"""
+
+from unittest import IsolatedAsyncioTestCase
+from unittest.mock import MagicMock
+
+from botbuilder.core import TurnContext
+
+from teams.ai.models import ChatCompletionAction
+from teams.ai.prompts import PromptFunctions
+from teams.ai.prompts.sections import ActionAugmentationSection
+from teams.ai.tokenizers import GPTTokenizer
+from teams.state import Memory
+
+
+class TestActionAugmentationSection(IsolatedAsyncioTestCase):
+    def setUp(self) -> None:
+        self.memory = MagicMock(spec=Memory)
+        self.prompt_functions = MagicMock(spec=PromptFunctions)
+        self.turn_context = MagicMock(spec=TurnContext)
+        self.section = ActionAugmentationSection(
+            [ChatCompletionAction(name="test", description="test action")], "Use an action."
+        )
+
+    def test_init(self):
+        self.assertEqual(list(self.section.actions.keys()), ["test"])
+        self.assertTrue(self.section.is_static)
+
+    def test_actions_are_not_shared(self):
+        other = ActionAugmentationSection([ChatCompletionAction(name="other")], "")
+        self.assertEqual(list(self.section.actions.keys()), ["test"])
+        self.assertEqual(list(other.actions.keys()), ["other"])
+
+    async def test_render_as_messages(self):
+        tokenizer = GPTTokenizer()
+        rendered = await self.section.render_as_messages(
+            self.turn_context, self.memory, self.prompt_functions, tokenizer, 100
+        )
+        content = rendered.output[0].content
+        self.assertEqual(rendered.output[0].role, "system")
+        assert content is not None
+        self.assertTrue(content.endswith("\n\nUse an action."))
+        self.assertEqual(rendered.length, tokenizer.count_tokens(content))
+        self.assertFalse(rendered.too_long)
+
+    async def test_render_as_messages_too_long(self):
+        rendered = await self.section.render_as_messages(
+            self.turn_context, self.memory, self.prompt_functions, GPTTokenizer(), 2
+        )
+        self.assertEqual(rendered.output[0].content, '{"actions')
+        self.assertEqual(rendered.length, 2)
+        self.assertTrue(rendered.too_long)
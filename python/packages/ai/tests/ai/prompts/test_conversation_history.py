@@ -175,3 +175,71 @@ class TestConversationHistory(IsolatedAsyncioTestCase):
         self.assertEqual(result.output, [])
         self.assertEqual(result.length, 0)
         self.assertFalse(result.too_long)
+
+    async def test_render_as_text_reuses_totals_after_append(self):
+        tokenizer = GPTTokenizer()
+        conversation_history = ConversationHistorySection("conversation.history")
+        await conversation_history.render_as_text(
+            self.turn_context, self.memory, self.prompt_functions, tokenizer, 100
+        )
+
+        history = self.memory.conversation["history"]
+        history.append(Message("user", "Paris"))
+        del history[0]
+        tokenizer.count_tokens = MagicMock(wraps=tokenizer.count_tokens)
+        result = await conversation_history.render_as_text(
+            self.turn_context, self.memory, self.prompt_functions, tokenizer, 100
+        )
+        self.assertEqual(
+            result.output,
+            'assistant: "Hi! How can I help you?"\n'
+            'user: "I\'d like to book a flight"\n'
+            'assistant: "Sure, where would you like to go?"\n'
+            'user: "Paris"',
+        )
+        self.assertEqual(result.length, 42)
+        counted = [call.args[0] for call in tokenizer.count_tokens.call_args_list]
+        self.assertIn('user: "Paris"', counted)
+        self.assertNotIn('assistant: "Hi! How can I help you?"', counted)
+
+    async def test_render_as_messages_selects_newest_window(self):
+        self.memory.conversation["history"] = [
+            Message("user" if i % 2 == 0 else "assistant", f"message {i}") for i in range(200)
+        ]
+        conversation_history = ConversationHistorySection("conversation.history")
+        result = await conversation_history.render_as_messages(
+            self.turn_context, self.memory, self.prompt_functions, GPTTokenizer(), 20
+        )
+        self.assertEqual(
+            result.output,
+            [
+                Message("user", '"message 196"'),
+                Message("assistant", '"message 197"'),
+                Message("user", '"message 198"'),
+                Message("assistant", '"message 199"'),
+            ],
+        )
+        self.assertEqual(result.length, 20)
+        self.assertFalse(result.too_long)
+
+    async def test_render_as_text_keeps_totals_per_memory(self):
+        tokenizer = GPTTokenizer()
+        conversation_history = ConversationHistorySection("conversation.history")
+        other = await TurnState[ConversationState, UserState, TempState].load(self.turn_context)
+        other.conversation["history"] = [Message("user", "Bonjour")]
+
+        for memory in [self.memory, other]:
+            await conversation_history.render_as_text(
+                self.turn_context, memory, self.prompt_functions, tokenizer, 100
+            )
+
+        tokenizer.encode = MagicMock(wraps=tokenizer.encode)
+        result = await conversation_history.render_as_text(
+            self.turn_context, self.memory, self.prompt_functions, tokenizer, 100
+        )
+        self.assertTrue(result.output.startswith('user: "Hello"'))
+        encoded = [call.args[0] for call in tokenizer.encode.call_args_list]
+        self.assertNotIn('user: "Hello"', encoded)
+
+        del memory, other
+        self.assertEqual(len(conversation_history._text_totals._entries), 1)
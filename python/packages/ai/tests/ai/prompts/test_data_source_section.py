@@ -27,6 +27,7 @@ class TestDataSourceSection(IsolatedAsyncioTestCase):
         self.assertTrue(data_source_section.required)
         self.assertEqual(data_source_section.separator, "\n\n")
         self.assertEqual(data_source_section.text_prefix, "")
+        self.assertTrue(data_source_section.is_static)
 
     async def test_render_as_messages(self):
         data_source_section = DataSourceSection(self.data_source, -1)
@@ -8,7 +8,7 @@ from unittest.mock import MagicMock
 
 from botbuilder.core import TurnContext
 
-from teams.ai.prompts import GroupSection, PromptFunctions, TextSection
+from teams.ai.prompts import GroupSection, PromptFunctions, TemplateSection, TextSection
 from teams.ai.tokenizers import GPTTokenizer
 from teams.state import Memory
 
@@ -65,3 +65,11 @@ class TestGroupSection(IsolatedAsyncioTestCase):
         self.assertEqual(rendered.output[0].content, "foo\n\nbar")
         self.assertEqual(rendered.length, 3)
         self.assertTrue(rendered.too_long)
+
+    def test_is_static(self):
+        self.assertTrue(GroupSection([TextSection("Hello", "user")]).is_static)
+        self.assertFalse(
+            GroupSection(
+                [TextSection("Hello", "user"), TemplateSection("{{$a}}", "user")]
+            ).is_static
+        )
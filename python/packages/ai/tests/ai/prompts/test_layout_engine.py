@@ -5,12 +5,18 @@ Licensed under the MIT License.
 
 from typing import cast
 from unittest import IsolatedAsyncioTestCase
+from unittest.mock import MagicMock, patch
 
 from botbuilder.core import TurnContext
 
-from teams.ai.prompts import LayoutEngineSection, PromptFunctions, TextSection
+from teams.ai.prompts import (
+    LayoutEngineSection,
+    PromptFunctions,
+    TemplateSection,
+    TextSection,
+)
 from teams.ai.tokenizers import GPTTokenizer
-from teams.state import TurnState
+from teams.state import Memory, TurnState
 
 
 class TestLayoutEngine(IsolatedAsyncioTestCase):
@@ -92,6 +98,28 @@ class TestLayoutEngine(IsolatedAsyncioTestCase):
         self.assertEqual(result.length, 3)
         self.assertTrue(result.too_long)
 
+    async def test_render_as_text_drop_many_optional_sections_counts_once(self):
+        sections = [TextSection("Hello World!", "user")] + [
+            TextSection(f"Optional {i}", "user", required=False) for i in range(10)
+        ]
+        layout_engine = LayoutEngineSection(cast(list, sections), 1, False, " ")
+        tokenizer = GPTTokenizer()
+        tokenizer.count_tokens = MagicMock(wraps=tokenizer.count_tokens)
+        result = await layout_engine.render_as_text(
+            context=cast(TurnContext, {}),
+            memory=TurnState(),
+            functions=cast(PromptFunctions, {}),
+            tokenizer=tokenizer,
+            max_tokens=11,
+        )
+
+        self.assertEqual(result.output, "Hello World! Optional 0 Optional 1")
+        self.assertEqual(result.length, 9)
+        self.assertFalse(result.too_long)
+        counted = [call.args[0] for call in tokenizer.count_tokens.call_args_list]
+        self.assertEqual(counted.count(result.output), 1)
+        self.assertFalse(any(text.startswith("Hello World! ") for text in counted[:-1]))
+
     async def test_render_as_text_proportional_sections(self):
         section1 = TextSection("Hello World!", "user", tokens=0.5)
         section2 = TextSection("Teams-AI", "user", tokens=0.5)
@@ -172,3 +200,76 @@ class TestLayoutEngine(IsolatedAsyncioTestCase):
         self.assertEqual(result.output[1].content, "Teams-AI")
         self.assertEqual(result.length, 6)
         self.assertFalse(result.too_long)
+
+    async def test_render_reuses_static_sections(self):
+        static = TextSection("Hello World!", "system")
+        dynamic = TemplateSection("{{$temp.input}}", "user")
+        layout_engine = LayoutEngineSection([static, dynamic], 1, False, " ")
+        tokenizer = GPTTokenizer()
+        state = Memory()
+        state.set("temp.input", "Teams-AI")
+
+        with patch.object(static, "render_as_messages", wraps=static.render_as_messages) as render:
+            for _ in range(3):
+                result = await layout_engine.render_as_messages(
+                    context=cast(TurnContext, {}),
+                    memory=state,
+                    functions=cast(PromptFunctions, {}),
+                    tokenizer=tokenizer,
+                    max_tokens=100,
+                )
+                self.assertEqual(result.output[0].content, "Hello World!")
+                self.assertEqual(result.output[1].content, '"Teams-AI"')
+                self.assertEqual(result.length, 8)
+                result.output[0].content = "changed"
+
+            self.assertEqual(render.call_count, 1)
+
+            # Renders again for a different tokenizer or budget
+            await layout_engine.render_as_messages(
+                context=cast(TurnContext, {}),
+                memory=state,
+                functions=cast(PromptFunctions, {}),
+                tokenizer=GPTTokenizer(),
+                max_tokens=100,
+            )
+            await layout_engine.render_as_messages(
+                context=cast(TurnContext, {}),
+                memory=state,
+                functions=cast(PromptFunctions, {}),
+                tokenizer=tokenizer,
+                max_tokens=50,
+            )
+            self.assertEqual(render.call_count, 3)
+
+    async def test_render_as_messages_prefix_hash(self):
+        static = TextSection("Hello World!", "system")
+        dynamic = TemplateSection("{{$temp.input}}", "user")
+        layout_engine = LayoutEngineSection([static, dynamic], 1, False, " ")
+        state = Memory()
+        hashes = []
+
+        for value in ["first", "second"]:
+            state.set("temp.input", value)
+            result = await layout_engine.render_as_messages(
+                context=cast(TurnContext, {}),
+                memory=state,
+                functions=cast(PromptFunctions, {}),
+                tokenizer=GPTTokenizer(),
+                max_tokens=100,
+            )
+            hashes.append(result.prefix_hash)
+
+        self.assertIsNotNone(hashes[0])
+        self.assertEqual(hashes[0], hashes[1])
+
+        # No stable prefix when the first section is volatile
+        layout_engine = LayoutEngineSection([dynamic, static], 1, False, " ")
+        result = await layout_engine.render_as_messages(
+            context=cast(TurnContext, {}),
+            memory=state,
+            functions=cast(PromptFunctions, {}),
+            tokenizer=GPTTokenizer(),
+            max_tokens=100,
+        )
+        self.assertIsNone(result.prefix_hash)
@@ -4,6 +4,8 @@ Licensed under the MIT License.
 """
 
 import os
+import shutil
+import tempfile
 from unittest import IsolatedAsyncioTestCase
 from unittest.mock import MagicMock
 
@@ -126,7 +128,7 @@ class TestPromptManager(IsolatedAsyncioTestCase):
         self.assertEqual(prompt.prompt.sections[0].sections[0].template, "test prompt")
         assert isinstance(prompt.prompt.sections[0].sections[1], DataSourceSection)
         assert isinstance(prompt.prompt.sections[0].sections[2], ActionAugmentationSection)
-        self.assertEqual(len(prompt.prompt.sections[0].sections[2].actions.keys()), 3)
+        self.assertEqual(len(prompt.prompt.sections[0].sections[2].actions.keys()), 2)
         actions = prompt.prompt.sections[0].sections[2].actions
         self.assertEqual(actions.get("createList").name, "createList")  # type: ignore[union-attr]
         self.assertEqual(
@@ -221,3 +223,106 @@ class TestPromptManager(IsolatedAsyncioTestCase):
         self.assertEqual(prompt.config.completion.stop_sequences, [])
         augmentation = prompt.config.augmentation
         self.assertEqual(augmentation.augmentation_type, "tools")  # type: ignore[union-attr]
+
+    async def test_preload(self):
+        with tempfile.TemporaryDirectory() as folder:
+            for name in ["migrate_old_schema", "tools"]:
+                shutil.copytree(os.path.join(TEST_ASSERTS_FOLDER, name), os.path.join(folder, name))
+            os.mkdir(os.path.join(folder, "not_a_prompt"))
+            prompt_manager = PromptManager(PromptManagerOptions(folder))
+
+            names = await prompt_manager.preload()
+
+            self.assertEqual(names, ["migrate_old_schema", "tools"])
+            self.assertEqual(await prompt_manager.preload(), [])
+            prompt = await prompt_manager.get_prompt("tools")
+            self.assertEqual(prompt.name, "tools")
+
+    async def test_preload_invalid_prompt(self):
+        with tempfile.TemporaryDirectory() as folder:
+            shutil.copytree(
+                os.path.join(TEST_ASSERTS_FOLDER, "no_config"), os.path.join(folder, "no_config")
+            )
+            prompt_manager = PromptManager(PromptManagerOptions(folder))
+
+            with self.assertRaises(ApplicationError):
+                await prompt_manager.preload()
+
+    async def test_get_prompt_stable_prefix(self):
+        prompt_manager = PromptManager(
+            PromptManagerOptions(TEST_ASSERTS_FOLDER, stable_prefix=True)
+        )
+        prompt_manager.add_data_source(TextDataSource("teams-ai", "test_text"))
+        prompt = await prompt_manager.get_prompt("happy_path")
+
+        assert isinstance(prompt.prompt, Prompt)
+        sections = prompt.prompt.sections
+        self.assertEqual(len(sections), 3)
+        assert isinstance(sections[0], GroupSection)
+        self.assertTrue(sections[0].is_static)
+        assert isinstance(sections[0].sections[0], TemplateSection)
+        assert isinstance(sections[0].sections[1], DataSourceSection)
+        assert isinstance(sections[0].sections[2], ActionAugmentationSection)
+        assert isinstance(sections[1], ConversationHistorySection)
+        assert isinstance(sections[2], UserMessage)
+
+    async def test_get_prompt_stable_prefix_moves_volatile_sections_last(self):
+        with tempfile.TemporaryDirectory() as folder:
+            shutil.copytree(
+                os.path.join(TEST_ASSERTS_FOLDER, "happy_path"), os.path.join(folder, "prompt")
+            )
+            with open(os.path.join(folder, "prompt", "skprompt.txt"), "w", encoding="utf-8") as f:
+                f.write("Hello {{$temp.name}}")
+
+            prompt_manager = PromptManager(PromptManagerOptions(folder, stable_prefix=True))
+            prompt_manager.add_data_source(TextDataSource("teams-ai", "test_text"))
+            prompt = await prompt_manager.get_prompt("prompt")
+
+            assert isinstance(prompt.prompt, Prompt)
+            sections = prompt.prompt.sections
+            self.assertEqual(len(sections), 4)
+            assert isinstance(sections[0], GroupSection)
+            self.assertTrue(sections[0].is_static)
+            assert isinstance(sections[1], ConversationHistorySection)
+            assert isinstance(sections[2], GroupSection)
+            self.assertEqual(len(sections[2].sections), 1)
+            assert isinstance(sections[2].sections[0], TemplateSection)
+            self.assertEqual(sections[2].sections[0].template, "Hello {{$temp.name}}")
+            assert isinstance(sections[3], UserMessage)
+
+    async def test_get_prompt_hot_reload(self):
+        with tempfile.TemporaryDirectory() as folder:
+            shutil.copytree(
+                os.path.join(TEST_ASSERTS_FOLDER, "migrate_old_schema"),
+                os.path.join(folder, "prompt"),
+            )
+            prompt_manager = PromptManager(PromptManagerOptions(folder, hot_reload_interval=0))
+            prompt = await prompt_manager.get_prompt("prompt")
+            self.assertIs(await prompt_manager.get_prompt("prompt"), prompt)
+
+            prompt_file = os.path.join(folder, "prompt", "skprompt.txt")
+            with open(prompt_file, "w", encoding="utf-8") as file:
+                file.write("updated prompt")
+            stat = os.stat(prompt_file)
+            os.utime(prompt_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+            reloaded = await prompt_manager.get_prompt("prompt")
+            self.assertIsNot(reloaded, prompt)
+            assert isinstance(reloaded.prompt, Prompt)
+            group = reloaded.prompt.sections[0]
+            assert isinstance(group, GroupSection)
+            assert isinstance(group.sections[0], TemplateSection)
+            self.assertEqual(group.sections[0].template, "updated prompt")
+
+    async def test_get_prompt_hot_reload_keeps_prompt_when_invalid(self):
+        with tempfile.TemporaryDirectory() as folder:
+            shutil.copytree(
+                os.path.join(TEST_ASSERTS_FOLDER, "migrate_old_schema"),
+                os.path.join(folder, "prompt"),
+            )
+            prompt_manager = PromptManager(PromptManagerOptions(folder, hot_reload_interval=0))
+            prompt = await prompt_manager.get_prompt("prompt")
+
+            os.remove(os.path.join(folder, "prompt", "config.json"))
+
+            self.assertIs(await prompt_manager.get_prompt("prompt"), prompt)
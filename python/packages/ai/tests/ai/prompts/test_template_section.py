@@ -3,6 +3,7 @@ Copyright (c) Microsoft Corporation. All rights reserved.
 Licensed under the MIT License.
 """
 
+import asyncio
 from unittest import IsolatedAsyncioTestCase
 from unittest.mock import AsyncMock, MagicMock
 
@@ -202,3 +203,66 @@ class TestTemplateSection(IsolatedAsyncioTestCase):
         self.assertEqual(result.output, "Hello ")
         self.assertEqual(result.length, 2)
         self.assertFalse(result.too_long)
+
+    async def test_is_static(self):
+        self.assertTrue(TemplateSection("Hello World", "role").is_static)
+        self.assertFalse(TemplateSection("Hello {{$temp.input}}", "role").is_static)
+        self.assertFalse(TemplateSection("Hello {{test_func}}", "role").is_static)
+
+    async def test_render_static_template_counts_once(self):
+        template_section = TemplateSection("Hello World", "role")
+        self.tokenizer.count_tokens = MagicMock(wraps=self.tokenizer.count_tokens)
+        for _ in range(3):
+            result = await template_section.render_as_messages(
+                self.context, self.memory, self.functions, self.tokenizer, 10
+            )
+            self.assertEqual(result.output[0].content, "Hello World")
+            self.assertEqual(result.length, 2)
+        self.assertEqual(self.tokenizer.count_tokens.call_count, 1)
+
+    async def test_render_functions_concurrently(self):
+        started = 0
+        both_started = asyncio.Event()
+
+        async def invoke_function(name, _context, _memory, _tokenizer, _args):
+            nonlocal started
+            started += 1
+            if started == 2:
+                both_started.set()
+            await asyncio.wait_for(both_started.wait(), 1)
+            return name
+
+        self.functions.invoke_function = invoke_function
+        template_section = TemplateSection(
+            "{{first}} and {{second}}", "role", concurrent_functions=True
+        )
+        result = await template_section.render_as_text(
+            self.context, self.memory, self.functions, self.tokenizer, 100
+        )
+        self.assertEqual(result.output, '"first" and "second"')
+
+    async def test_render_variable_after_function(self):
+        async def invoke_function(_name, _context, memory, _tokenizer, _args):
+            memory.set("temp.input", "updated")
+            return "done"
+
+        self.functions.invoke_function = invoke_function
+        template_section = TemplateSection("{{$temp.input}} {{test_func}} {{$temp.input}}", "role")
+        result = await template_section.render_as_text(
+            self.context, self.memory, self.functions, self.tokenizer, 100
+        )
+        self.assertEqual(result.output, '"temp_input" "done" "updated"')
+
+    async def test_render_functions_in_order(self):
+        async def invoke_function(name, _context, memory, _tokenizer, _args):
+            if name == "first":
+                await asyncio.sleep(0.01)
+                memory.set("temp.input", "first")
+            return memory.get("temp.input")
+
+        self.functions.invoke_function = invoke_function
+        template_section = TemplateSection("{{first}} {{second}}", "role")
+        result = await template_section.render_as_text(
+            self.context, self.memory, self.functions, self.tokenizer, 100
+        )
+        self.assertEqual(result.output, '"first" "first"')
@@ -3,15 +3,22 @@ Copyright (c) Microsoft Corporation. All rights reserved.
 Licensed under the MIT License.
 """
 
+import asyncio
+from typing import List
 from unittest import IsolatedAsyncioTestCase
 from unittest.mock import AsyncMock
 
 from botbuilder.core import TurnContext
 from botbuilder.schema import Activity, ChannelAccount, ConversationAccount
 
+from teams.ai.actions import ActionTypes, TooManyStepsParameters
 from teams.ai.ai import AI, AIOptions, ApplicationError
+from teams.ai.moderators.moderator import Moderator
+from teams.ai.planners.plan import Plan, PredictedDoCommand, PredictedSayCommand
 from teams.ai.planners.planner import Planner
-from teams.state import TurnState
+from teams.ai.planners.streaming_plan import StreamingPlan
+from teams.ai.prompts import Message
+from teams.state import ConversationState, TempState, TurnState, UserState
 from tests.utils import SimpleAdapter
 
 
@@ -92,3 +99,318 @@ class TestAI(IsolatedAsyncioTestCase):
             self.assertEqual(called_context._activity, context.activity)
             self.assertEqual(called_context.adapter, context.adapter)
             self.assertEqual(called_state, state)
+
+    def create_parallel_ai(self, max_concurrent_actions: int) -> AI:
+        planner = AsyncMock(spec=Planner)
+        planner.begin_task.return_value = Plan(
+            commands=[
+                PredictedDoCommand(action="slow", action_id="call_1"),
+                PredictedDoCommand(action="fast", action_id="call_2"),
+                PredictedDoCommand(action="fast", action_id="call_3"),
+            ]
+        )
+        return AI(
+            AIOptions(
+                planner=planner,
+                allow_looping=False,
+                max_concurrent_actions=max_concurrent_actions,
+            )
+        )
+
+    async def test_run_parallel_actions(self):
+        context = self.create_mock_context()
+        state = await TurnState[ConversationState, UserState, TempState].load(context)
+        ai = self.create_parallel_ai(max_concurrent_actions=2)
+        running = 0
+        max_running = 0
+
+        async def track(name: str) -> str:
+            nonlocal running, max_running
+            running += 1
+            max_running = max(max_running, running)
+            await asyncio.sleep(0.02 if name == "slow" else 0)
+            running -= 1
+            return name
+
+        @ai.action("slow")
+        async def slow(_context, _state):
+            return await track("slow")
+
+        @ai.action("fast")
+        async def fast(_context, _state):
+            return await track("fast")
+
+        self.assertTrue(await ai.run(context, state))
+        self.assertEqual(max_running, 2)
+        self.assertEqual(
+            list(state.temp.action_outputs.items()),
+            [("call_1", "slow"), ("call_2", "fast"), ("call_3", "fast")],
+        )
+
+    async def test_run_parallel_actions_stop(self):
+        context = self.create_mock_context()
+        state = await TurnState[ConversationState, UserState, TempState].load(context)
+        ai = self.create_parallel_ai(max_concurrent_actions=3)
+        cancelled = asyncio.Event()
+
+        @ai.action("slow")
+        async def slow(_context, _state):
+            return ActionTypes.STOP
+
+        @ai.action("fast")
+        async def fast(_context, _state):
+            try:
+                await asyncio.sleep(1)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+            return "fast"
+
+        self.assertFalse(await ai.run(context, state))
+        await asyncio.wait_for(cancelled.wait(), 1)
+        self.assertEqual(state.temp.action_outputs, {"call_1": ActionTypes.STOP})
+
+    async def test_run_parallel_actions_error(self):
+        context = self.create_mock_context()
+        state = await TurnState[ConversationState, UserState, TempState].load(context)
+        ai = self.create_parallel_ai(max_concurrent_actions=3)
+        finished: List[str] = []
+
+        @ai.action("slow")
+        async def slow(_context, _state):
+            await asyncio.sleep(0.01)
+            raise ValueError("failed")
+
+        @ai.action("fast")
+        async def fast(_context, _state):
+            try:
+                await asyncio.sleep(1)
+            except asyncio.CancelledError:
+                finished.append("cancelled")
+                raise
+            return "fast"
+
+        with self.assertRaises(ValueError):
+            await ai.run(context, state)
+
+        self.assertEqual(finished, ["cancelled", "cancelled"])
+
+    async def test_run_too_many_steps(self):
+        context = self.create_mock_context()
+        state = await TurnState[ConversationState, UserState, TempState].load(context)
+        planner = AsyncMock(spec=Planner)
+        planner.begin_task.return_value = Plan(commands=[PredictedDoCommand(action="loop")])
+        planner.continue_task.return_value = Plan(commands=[PredictedDoCommand(action="loop")])
+        ai = AI(AIOptions(planner=planner, max_steps=3))
+        ai.action("loop")(AsyncMock(return_value="again"))
+        too_many_steps = AsyncMock(return_value=ActionTypes.STOP)
+        ai.action(ActionTypes.TOO_MANY_STEPS, allow_overrides=True)(too_many_steps)
+
+        self.assertFalse(await ai.run(context, state))
+        self.assertEqual(planner.continue_task.await_count, 3)
+        assert too_many_steps.await_args is not None
+        action_context = too_many_steps.await_args.args[0]
+        assert isinstance(action_context.data, TooManyStepsParameters)
+        self.assertEqual(action_context.data.max_steps, 3)
+        self.assertEqual(action_context.data.step, 4)
+
+    async def test_run_cancels_planner_at_deadline(self):
+        context = self.create_mock_context()
+        state = await TurnState[ConversationState, UserState, TempState].load(context)
+        cancelled = False
+
+        async def begin_task(_context, _state):
+            nonlocal cancelled
+            try:
+                await asyncio.sleep(1)
+            except asyncio.CancelledError:
+                cancelled = True
+                raise
+            return Plan()
+
+        planner = AsyncMock(spec=Planner)
+        planner.begin_task.side_effect = begin_task
+        ai = AI(AIOptions(planner=planner, max_time=0.01))
+        too_many_steps = AsyncMock(return_value=ActionTypes.STOP)
+        ai.action(ActionTypes.TOO_MANY_STEPS, allow_overrides=True)(too_many_steps)
+
+        self.assertFalse(await ai.run(context, state))
+        self.assertTrue(cancelled)
+        too_many_steps.assert_awaited_once()
+
+    async def test_run_has_no_budget_by_default(self):
+        options = AIOptions(planner=AsyncMock(spec=Planner))
+
+        self.assertIsNone(options.max_steps)
+        self.assertIsNone(options.max_time)
+
+    async def test_run_raises_planner_timeout(self):
+        context = self.create_mock_context()
+        state = await TurnState[ConversationState, UserState, TempState].load(context)
+        planner = AsyncMock(spec=Planner)
+        planner.begin_task.side_effect = asyncio.TimeoutError()
+        ai = AI(AIOptions(planner=planner, max_time=10))
+        too_many_steps = AsyncMock(return_value=ActionTypes.STOP)
+        ai.action(ActionTypes.TOO_MANY_STEPS, allow_overrides=True)(too_many_steps)
+
+        with self.assertRaises(asyncio.TimeoutError):
+            await ai.run(context, state)
+
+        too_many_steps.assert_not_awaited()
+
+    def create_speculative_ai(self, flagged: bool, events: List[str]) -> AI:
+        async def review_input(_context, _state):
+            events.append("review started")
+            await asyncio.sleep(0.02)
+            events.append("review finished")
+            if flagged:
+                return Plan(commands=[PredictedDoCommand(action=ActionTypes.FLAGGED_INPUT)])
+            return None
+
+        async def begin_task(context, state):
+            events.append("planning started")
+            state.conversation.history = ["flagged exchange"]
+            await context.send_activity("streamed chunk")
+            events.append("planning finished")
+            return Plan(
+                commands=[PredictedSayCommand(response=Message(role="assistant", content="hi"))]
+            )
+
+        moderator = AsyncMock(spec=Moderator)
+        moderator.review_input.side_effect = review_input
+        moderator.review_output.side_effect = lambda _context, _state, plan: plan
+        planner = AsyncMock(spec=Planner)
+        planner.begin_task.side_effect = begin_task
+        return AI(AIOptions(planner=planner, moderator=moderator, speculative_planning=True))
+
+    async def test_run_speculative_planning(self):
+        context = self.create_mock_context()
+        state = await TurnState[ConversationState, UserState, TempState].load(context)
+        events: List[str] = []
+        ai = self.create_speculative_ai(False, events)
+        sent: List[str] = []
+
+        async def record(_context, activities, next_send):
+            sent.extend(activity.text for activity in activities)
+            return await next_send()
+
+        context.on_send_activities(record)
+
+        self.assertTrue(await ai.run(context, state))
+        self.assertEqual(
+            events,
+            ["review started", "planning started", "review finished", "planning finished"],
+        )
+        self.assertEqual(sent, ["streamed chunk", "hi"])
+        self.assertEqual(state.conversation.history, ["flagged exchange"])
+
+    async def test_run_speculative_planning_flagged_input(self):
+        context = self.create_mock_context()
+        state = await TurnState[ConversationState, UserState, TempState].load(context)
+        events: List[str] = []
+        ai = self.create_speculative_ai(True, events)
+        flagged_input = AsyncMock(return_value=ActionTypes.STOP)
+        ai.action(ActionTypes.FLAGGED_INPUT, allow_overrides=True)(flagged_input)
+        sent: List[str] = []
+
+        async def record(_context, activities, next_send):
+            await next_send()
+            sent.extend(activity.text for activity in activities)
+
+        context.on_send_activities(record)
+
+        self.assertFalse(await ai.run(context, state))
+        flagged_input.assert_awaited_once()
+        self.assertEqual(sent, [])
+        self.assertNotIn("history", state.conversation)
+
+    async def test_run_speculative_streaming_plan_flagged_input(self):
+        context = self.create_mock_context()
+        state = await TurnState[ConversationState, UserState, TempState].load(context)
+        completion_cancelled = asyncio.Event()
+
+        async def complete(state):
+            try:
+                await asyncio.sleep(0.05)
+            except asyncio.CancelledError:
+                completion_cancelled.set()
+                raise
+            state.conversation.history = ["flagged exchange"]
+
+        async def begin_task(_context, state):
+            plan = StreamingPlan([PredictedSayCommand(response=Message("assistant", "hi"))])
+            plan.add_task(asyncio.ensure_future(complete(state)))
+            return plan
+
+        async def review_input(_context, _state):
+            await asyncio.sleep(0.01)
+            return Plan(commands=[PredictedDoCommand(action=ActionTypes.FLAGGED_INPUT)])
+
+        moderator = AsyncMock(spec=Moderator)
+        moderator.review_input.side_effect = review_input
+        moderator.review_output.side_effect = lambda _context, _state, plan: plan
+        planner = AsyncMock(spec=Planner)
+        planner.begin_task.side_effect = begin_task
+        ai = AI(AIOptions(planner=planner, moderator=moderator, speculative_planning=True))
+        ai.action(ActionTypes.FLAGGED_INPUT, allow_overrides=True)(
+            AsyncMock(return_value=ActionTypes.STOP)
+        )
+
+        self.assertFalse(await ai.run(context, state))
+        self.assertTrue(completion_cancelled.is_set())
+        await asyncio.sleep(0.1)
+        self.assertNotIn("history", state.conversation)
+
+    async def test_run_streaming_plan(self):
+        context = self.create_mock_context()
+        state = await TurnState[ConversationState, UserState, TempState].load(context)
+        plan = StreamingPlan()
+        events: List[str] = []
+
+        async def begin_task(_context, _state):
+            plan.add_command(PredictedDoCommand(action="first"))
+            return plan
+
+        async def first(_context, _state):
+            events.append("first")
+            plan.add_command(PredictedDoCommand(action="second"))
+            plan.end()
+            return ""
+
+        async def second(_context, _state):
+            events.append("second")
+            return ""
+
+        async def review_output(_context, _state, reviewed: Plan):
+            events.append(f"reviewed {reviewed.commands[0].type}")
+            return reviewed
+
+        moderator = AsyncMock(spec=Moderator)
+        moderator.review_input.return_value = None
+        moderator.review_output.side_effect = review_output
+        planner = AsyncMock(spec=Planner)
+        planner.begin_task.side_effect = begin_task
+        ai = AI(AIOptions(planner=planner, moderator=moderator))
+        ai.action("first")(first)
+        ai.action("second")(second)
+
+        self.assertTrue(await ai.run(context, state))
+        self.assertEqual(events, ["reviewed DO", "first", "reviewed DO", "second"])
+
+    async def test_run_streaming_plan_deadline(self):
+        context = self.create_mock_context()
+        state = await TurnState[ConversationState, UserState, TempState].load(context)
+        plan = StreamingPlan([PredictedDoCommand(action="first")])
+        completion = asyncio.ensure_future(asyncio.sleep(1))
+        plan.add_task(completion)
+        planner = AsyncMock(spec=Planner)
+        planner.begin_task.return_value = plan
+        ai = AI(AIOptions(planner=planner, max_time=0.05))
+        ai.action("first")(AsyncMock(return_value=""))
+        too_many_steps = AsyncMock(return_value=ActionTypes.STOP)
+        ai.action(ActionTypes.TOO_MANY_STEPS, allow_overrides=True)(too_many_steps)
+
+        self.assertFalse(await ai.run(context, state))
+        too_many_steps.assert_awaited_once()
+        await asyncio.sleep(0)
+        self.assertTrue(completion.cancelled())
@@ -5,7 +5,7 @@ Licensed under the MIT License.
 
 import unittest
 
-from teams.ai.tokenizers import GPTTokenizer
+from teams.ai.tokenizers import GPTTokenizer, encoding_for_model
 
 
 class TestGPTTokenizer(unittest.TestCase):
@@ -27,3 +27,54 @@ class TestGPTTokenizer(unittest.TestCase):
         self.assertEqual(
             result, expected_result, "Expected result does not match the decoded result"
         )
+
+    def test_encode_batch(self):
+        result = self.tokenizer.encode_batch(["tiktoken is great!", "hello world"])
+        self.assertEqual(
+            result, [[83, 1609, 5963, 374, 2294, 0], self.tokenizer.encode("hello world")]
+        )
+
+    def test_default_encoding(self):
+        self.assertEqual(self.tokenizer.encoding_name, "cl100k_base")
+
+    def test_model_encoding(self):
+        self.assertEqual(GPTTokenizer(model="gpt-4o").encoding_name, "o200k_base")
+        self.assertEqual(GPTTokenizer(model="gpt-35-turbo").encoding_name, "cl100k_base")
+        self.assertEqual(GPTTokenizer(encoding="o200k_base").encoding_name, "o200k_base")
+
+    def test_for_model_shares_tokenizer_per_encoding(self):
+        tokenizer = GPTTokenizer.for_model("gpt-4o")
+        self.assertIs(tokenizer, GPTTokenizer.for_model("gpt-4o-mini"))
+        self.assertIsNot(tokenizer, GPTTokenizer.for_model("gpt-4"))
+        self.assertEqual(tokenizer.encoding_name, "o200k_base")
+
+    def test_count_tokens(self):
+        self.assertEqual(self.tokenizer.count_tokens("tiktoken is great!"), 6)
+        self.assertEqual(self.tokenizer.count_tokens(""), 0)
+
+    def test_count_tokens_caches_short_strings(self):
+        tokenizer = GPTTokenizer(cache_size=2)
+        tokenizer.count_tokens("\n\n")
+        tokenizer.count_tokens("\n\n")
+        info = tokenizer._cached_count.cache_info()  # type: ignore[attr-defined]
+        self.assertEqual((info.hits, info.misses, info.maxsize), (1, 1, 2))
+
+    def test_truncate(self):
+        self.assertEqual(self.tokenizer.truncate("tiktoken is great!", 3), "tiktoken")
+        self.assertEqual(self.tokenizer.truncate("tiktoken is great!", 6), "tiktoken is great!")
+        self.assertEqual(self.tokenizer.truncate("tiktoken is great!", 0), "")
+        self.assertEqual(self.tokenizer.truncate("hi", 2), "hi")
+
+
+class TestEncodingForModel(unittest.TestCase):
+    def test_o200k_models(self):
+        for model in ["gpt-4o", "gpt-4o-mini", "my-gpt-4o-deployment", "o1-preview", "o3-mini"]:
+            self.assertEqual(encoding_for_model(model), "o200k_base", model)
+
+    def test_cl100k_models(self):
+        for model in ["gpt-4", "gpt-4-turbo", "gpt-35-turbo", "gpt-3.5-turbo"]:
+            self.assertEqual(encoding_for_model(model), "cl100k_base", model)
+
+    def test_unknown_model(self):
+        self.assertEqual(encoding_for_model("my-deployment"), "cl100k_base")
+        self.assertEqual(encoding_for_model(None), "cl100k_base")
@@ -4,9 +4,10 @@ Licensed under the MIT License.
 """
 
 from typing import cast
-from unittest import IsolatedAsyncioTestCase
+from unittest import IsolatedAsyncioTestCase, mock
 
 from botbuilder.core import TurnContext
+from jsonschema.validators import validator_for
 
 from teams.ai.models import ChatCompletionAction, PromptResponse
 from teams.ai.prompts import FunctionCall, Message
@@ -170,3 +171,38 @@ class TestActionResponseValidator(IsolatedAsyncioTestCase):
             res.value,
             ValidatedChatCompletionAction(name="test", parameters={"name": "test", "age": 10}),
         )
+
+    async def test_should_compile_action_schemas_once(self):
+        actions = [
+            ChatCompletionAction(
+                name="test",
+                parameters={"type": "object", "properties": {"name": {"type": "string"}}},
+            )
+        ]
+
+        with mock.patch(
+            "teams.ai.validators.json_response_validator.validator_for", wraps=validator_for
+        ) as mock_validator_for:
+            validator = ActionResponseValidator(actions=actions)
+            other = ActionResponseValidator(actions=[ChatCompletionAction(name="other")])
+            self.assertEqual(mock_validator_for.call_count, 1)
+
+            for _ in range(3):
+                res = await validator.validate_response(
+                    context=cast(TurnContext, {}),
+                    memory=TurnState(),
+                    tokenizer=GPTTokenizer(),
+                    response=PromptResponse(
+                        message=Message(
+                            role="assistant",
+                            function_call=FunctionCall(name="test", arguments='{"name": "a"}'),
+                        )
+                    ),
+                    remaining_attempts=3,
+                )
+                self.assertTrue(res.valid)
+
+            self.assertEqual(mock_validator_for.call_count, 1)
+
+        self.assertEqual([action.name for action in validator.actions], ["test"])
+        self.assertEqual([action.name for action in other.actions], ["other"])
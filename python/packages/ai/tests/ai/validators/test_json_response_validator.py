@@ -7,6 +7,7 @@ from typing import cast
 from unittest import IsolatedAsyncioTestCase
 
 from botbuilder.core import TurnContext
+from jsonschema.exceptions import SchemaError
 
 from teams.ai.models import PromptResponse
 from teams.ai.prompts import Message
@@ -16,6 +17,19 @@ from teams.state import TurnState
 
 
 class TestJSONResponseValidator(IsolatedAsyncioTestCase):
+    async def test_should_check_invalid_schema_when_validating(self):
+        validator = JSONResponseValidator(schema={"type": "unknown"})
+        response = PromptResponse(message=Message(role="assistant", content='{"foo": "bar"}'))
+
+        with self.assertRaises(SchemaError):
+            await validator.validate_response(
+                context=cast(TurnContext, {}),
+                memory=TurnState(),
+                tokenizer=GPTTokenizer(),
+                response=response,
+                remaining_attempts=3,
+            )
+
     async def test_should_be_invalid_when_no_message(self):
         validator = JSONResponseValidator()
         res = await validator.validate_response(
@@ -5,5 +5,6 @@ Licensed under the MIT License.
 
 from .activity import *
 from .adapter import *
+from .embeddings import *
 from .test_snippet import *
 from .test_to_string import *
@@ -0,0 +1,25 @@
+"""
+Copyright (c) Microsoft Corporation. All rights reserved.
+Licensed under the MIT License.
+"""
+
+from typing import List, Union
+
+from teams.ai.embeddings import EmbeddingsModel, EmbeddingsResponse
+
+
+class MockEmbeddings(EmbeddingsModel):
+    status: str
+    calls: int
+
+    def __init__(self, status: str = "success") -> None:
+        self.status = status
+        self.calls = 0
+
+    async def create_embeddings(
+        self, inputs: Union[str, List[str], List[int], List[List[int]]]
+    ) -> EmbeddingsResponse:
+        self.calls += 1
+        if self.status != "success":
+            return EmbeddingsResponse(status="error", output="failed")
+        return EmbeddingsResponse(status="success", output=[[1.0, 0.0]])
@@ -0,0 +1,62 @@
+"""
+Copyright (c) Microsoft Corporation. All rights reserved.
+Licensed under the MIT License.
+"""
+
+import json
+from typing import Any, Dict, List
+from unittest import TestCase
+
+from teams.utils.json import JSONStreamParser
+
+
+def feed_chunks(parser: JSONStreamParser, text: str, size: int) -> List[Dict[str, Any]]:
+    objects: List[Dict[str, Any]] = []
+    for i in range(0, len(text), size):
+        objects.extend(parser.feed(text[i : i + size]))
+    return objects
+
+
+class TestJSONStreamParser(TestCase):
+    def test_should_return_array_items_as_they_complete(self):
+        parser = JSONStreamParser(["commands", None])
+
+        self.assertEqual(parser.feed('{"type":"plan","commands":[{"type":"DO","act'), [])
+        self.assertEqual(
+            parser.feed('ion":"a","parameters":{"x":[1]}},{"type":"SAY",'),
+            [{"type": "DO", "action": "a", "parameters": {"x": [1]}}],
+        )
+        self.assertEqual(parser.feed('"response":"hi"}]}'), [{"type": "SAY", "response": "hi"}])
+
+    def test_should_return_object_members(self):
+        parser = JSONStreamParser(["action"])
+        text = 'Sure! {"thoughts":{"action":{"no":1}},"action":{"name":"SAY"}} done {"action":{}}'
+
+        self.assertEqual(feed_chunks(parser, text, 1), [{"name": "SAY"}, {}])
+
+    def test_should_ignore_structural_chars_in_strings(self):
+        plan = {
+            "commands": [
+                {"type": "SAY", "response": 'a "quoted" {brace} [bracket] \\ "commands": [{}'},
+                {"type": "SAY", "response": "é\U0001f600"},
+            ]
+        }
+        text = json.dumps(plan)
+
+        for size in (1, 2, 3, 7, len(text)):
+            parser = JSONStreamParser(["commands", None])
+            self.assertEqual(feed_chunks(parser, text, size), plan["commands"], size)
+
+    def test_should_repair_placeholders(self):
+        parser = JSONStreamParser(["action"])
+
+        self.assertEqual(
+            parser.feed('{"action":{"name":<name>,"parameters":{}}}'),
+            [{"name": "<name>", "parameters": {}}],
+        )
+
+    def test_should_raise_for_invalid_objects(self):
+        parser = JSONStreamParser(["commands", None])
+
+        with self.assertRaises(ValueError):
+            parser.feed('{"commands":[{"type":"DO",,}]}')
@@ -0,0 +1,171 @@
+"""
+Copyright (c) Microsoft Corporation. All rights reserved.
+Licensed under the MIT License.
+"""
+
+import json
+import random
+from typing import Any, List, Optional
+from unittest import TestCase
+
+from teams.utils.json import ParsedObject, parse, parse_object, parse_objects
+
+
+# pylint: disable=too-many-branches
+def legacy_parse_object(text: str) -> Optional[Any]:
+    # The character by character implementation `parse_object` used to have
+    start_brace = text.find("{")
+    if start_brace == -1:
+        return None
+
+    obj = text[start_brace:]
+    nesting = ["}"]
+    cleaned = "{"
+    in_string = False
+    i = 1
+
+    while i < len(obj) and len(nesting) > 0:
+        char = obj[i]
+        if in_string:
+            cleaned += char
+            if char == "\\":
+                while char == "\\":
+                    i += 1
+                    if i == len(obj):
+                        # Used to raise an IndexError
+                        return None
+                    char = obj[i]
+                if i < len(obj):
+                    cleaned += obj[i]
+                else:
+                    return None
+            elif char == '"':
+                in_string = False
+        else:
+            if char == '"':
+                in_string = True
+            elif char == "{":
+                nesting.append("}")
+            elif char == "[":
+                nesting.append("]")
+            elif char in ("}", "]"):
+                if nesting.pop() != char:
+                    return None
+            cleaned += f'"{char}' if char == "<" else f'{char}"' if char == ">" else char
+        i += 1
+
+    nesting.reverse()
+    cleaned += "".join(nesting)
+
+    try:
+        return json.loads(cleaned)
+    except ValueError:
+        return None
+
+
+# pylint: enable=too-many-branches
+
+
+def legacy_parse(text: str) -> List[Any]:
+    # The line by line implementation `parse` used to have
+    objects: List[Any] = []
+    for line in text.split("\n"):
+        obj = legacy_parse_object(line)
+        if obj is not None and len(obj) > 0:
+            objects.append(obj)
+
+    if len(objects) == 0:
+        obj = legacy_parse_object(text)
+        if obj is not None:
+            objects.append(obj)
+
+    return objects
+
+
+WORDS = ["hello", "plan", "the", "SAY", "DO", "{braces}", "[list]", "x: 1", "end."]
+
+
+def random_prose(rng: random.Random) -> str:
+    return " ".join(rng.choice(WORDS[:5]) for _ in range(rng.randint(0, 6)))
+
+
+def random_value(rng: random.Random, depth: int = 0) -> Any:
+    kind = rng.randint(0, 6 if depth < 2 else 3)
+    if kind == 0:
+        return rng.randint(-100, 100)
+    if kind == 1:
+        return rng.choice([True, False, None, 1.5])
+    if kind in (2, 3):
+        return "".join(rng.choice('ab {}[]<>":,\n\té\U0001f600') for _ in range(5))
+    if kind in (4, 5):
+        return {f"k{i}": random_value(rng, depth + 1) for i in range(rng.randint(0, 3))}
+    return [random_value(rng, depth + 1) for _ in range(rng.randint(0, 3))]
+
+
+def random_object(rng: random.Random) -> str:
+    obj = {f"key{i}": random_value(rng) for i in range(rng.randint(1, 4))}
+    text = json.dumps(obj, ensure_ascii=rng.random() < 0.5)
+    if rng.random() < 0.3:
+        # Unquoted placeholder value
+        text = text[:-1] + ', "name": <name of the action>}'
+    return text
+
+
+class TestParse(TestCase):
+    def test_should_return_objects_with_offsets(self):
+        text = 'Here you go: {"a": 1} and {"b": [1, 2]}\nthanks'
+        self.assertEqual(
+            parse_objects(text),
+            [
+                ParsedObject(value={"a": 1}, start=13, end=21),
+                ParsedObject(value={"b": [1, 2]}, start=26, end=39),
+            ],
+        )
+
+    def test_should_parse_multi_line_objects(self):
+        plan = {"type": "plan", "commands": [{"type": "SAY", "response": "hi"}]}
+        text = f"Thinking...\n{json.dumps(plan, indent=2)}\nDone"
+        self.assertEqual(parse(text), [plan])
+
+    def test_should_repair_objects(self):
+        self.assertEqual(
+            parse('{"action": <name>, "items": [1, 2'), [{"action": "<name>", "items": [1, 2]}]
+        )
+        self.assertEqual(
+            parse('{\n  "type": "DO",\n  "action": <name>\n}'), [{"type": "DO", "action": "<name>"}]
+        )
+        self.assertEqual(parse('{"a": 1\nthanks'), [{"a": 1}])
+        self.assertIsNone(parse_object('{"a": 1]'))
+        self.assertEqual(parse("no objects {here}"), [])
+
+    def test_should_return_empty_object_when_alone(self):
+        self.assertEqual(parse("{}"), [{}])
+        self.assertEqual(parse('{}\n{"a": 1}'), [{"a": 1}])
+
+    def test_should_match_legacy_parse(self):
+        rng = random.Random(1234)
+
+        for _ in range(2000):
+            lines: List[str] = []
+            for _ in range(rng.randint(0, 5)):
+                if rng.random() < 0.5:
+                    lines.append(random_prose(rng))
+                else:
+                    lines.append(f"{random_prose(rng)} {random_object(rng)} {random_prose(rng)}")
+
+            if rng.random() < 0.3:
+                # Truncated object at the end of a streamed response
+                obj = random_object(rng)
+                lines.append(obj[: rng.randint(1, len(obj))])
+
+            text = "\n".join(lines)
+            self.assertEqual(parse(text), legacy_parse(text), text)
+            self.assertEqual(parse_object(text), legacy_parse_object(text), text)
+
+    def test_should_match_legacy_parse_for_pretty_printed_objects(self):
+        rng = random.Random(5678)
+
+        for _ in range(500):
+            obj = {f"key{i}": random_value(rng) for i in range(rng.randint(1, 4))}
+            text = f"{random_prose(rng)}\n{json.dumps(obj, indent=2)}\n{random_prose(rng)}"
+            self.assertEqual(parse(text), legacy_parse(text), text)
@@ -10,7 +10,7 @@ from unittest import TestCase
 import yaml
 
 from teams.ai.tokenizers.gpt_tokenizer import GPTTokenizer
-from teams.utils import to_string
+from teams.utils import get_to_string_serializer, set_to_string_serializer, to_string
 
 
 class TestToString(TestCase):
@@ -31,6 +31,13 @@ class TestToString(TestCase):
         self.assertEqual(to_string(self.tokenizer, current_time), current_time.isoformat())
 
     def test_to_string_with_object(self):
+        obj = {"key": "value", "key2": [1, 2, 3]}
+        yaml_str = yaml.dump(obj)
+        json_str = json.dumps(obj)
+        expected = yaml_str if len(yaml_str) < len(json_str) else json_str
+        self.assertEqual(to_string(self.tokenizer, obj), expected)
+
+    def test_to_string_with_object_by_tokens(self):
         obj = {"key": "value", "key2": [1, 2, 3]}
         yaml_str = yaml.dump(obj)
         json_str = json.dumps(obj)
@@ -39,7 +46,42 @@ class TestToString(TestCase):
             if len(self.tokenizer.encode(yaml_str)) < len(self.tokenizer.encode(json_str))
             else json_str
         )
-        self.assertEqual(to_string(self.tokenizer, obj), expected)
+        self.assertEqual(to_string(self.tokenizer, obj, serializer="tokens"), expected)
+
+    def test_to_string_with_object_as_yaml(self):
+        obj = {"key": "value", "key2": [1, 2, 3]}
+        self.assertEqual(to_string(self.tokenizer, obj, serializer="yaml"), yaml.dump(obj))
+
+    def test_to_string_with_escaped_string(self):
+        self.assertEqual(to_string(self.tokenizer, 'say "a" "b"'), 'say "a" "b"\n...\n')
+
+    def test_to_string_with_variable_serializer(self):
+        obj = {"key": "value", "key2": [1, 2, 3]}
+        set_to_string_serializer("json", "conversation.obj")
+        try:
+            self.assertEqual(
+                to_string(self.tokenizer, obj, variable="conversation.obj"), json.dumps(obj)
+            )
+            self.assertEqual(
+                to_string(self.tokenizer, obj, variable="conversation.other"), yaml.dump(obj)
+            )
+        finally:
+            set_to_string_serializer("auto", "conversation.obj")
+
+    def test_to_string_with_global_serializer(self):
+        obj = {"key": "value", "key2": [1, 2, 3]}
+        set_to_string_serializer("json")
+        try:
+            self.assertEqual(get_to_string_serializer(), "json")
+            self.assertEqual(to_string(self.tokenizer, obj), json.dumps(obj))
+        finally:
+            set_to_string_serializer("auto")
+
+    def test_to_string_with_mutated_object(self):
+        obj = {"key": "value"}
+        self.assertEqual(to_string(self.tokenizer, obj, serializer="json"), '{"key": "value"}')
+        obj["key"] = "changed"
+        self.assertEqual(to_string(self.tokenizer, obj, serializer="json"), '{"key": "changed"}')
 
     def test_to_string_with_object_as_json(self):
         obj = {"key": "value", "key2": [1, 2, 3]}